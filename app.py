@@ -92,6 +92,7 @@ with st.sidebar:
     # Clear conversation button
     if st.button("🔄 Clear Conversation", use_container_width=True):
         st.session_state.messages = []
+        st.session_state.agent_runner.close()
         st.session_state.agent_runner = AgentRunner()
         st.session_state.conversation_stage = "initial"
         st.session_state.customer_verified = False
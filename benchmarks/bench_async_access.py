@@ -0,0 +1,87 @@
+"""Benchmark - async data access over a pooled, file-backed SQLite store
+
+Loads a synthetic ledger into a temporary SQLite file, then issues many
+concurrent fetch_customer_context() calls for several pool sizes. Results
+are checked against the synchronous accessors before timings are shown.
+
+Usage:
+    python benchmarks/bench_async_access.py --customers 2000 --requests 5000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from knowledge_base import (
+    AsyncDataAccess,
+    CUSTOMER_DB,
+    SQLiteTransactionStore,
+    customer_store,
+    get_customer,
+    get_suspicious_transactions,
+    get_transactions,
+    set_transaction_store
+)
+from bench_transaction_store import build_ledger
+
+
+def register_customers(count: int):
+    """Add synthetic customers matching build_ledger's customer IDs"""
+    for c in range(count):
+        customer_store.add({
+            "customer_id": f"CUST{c:08d}",
+            "name": f"Customer {c}",
+            "mobile": f"8{c:09d}",
+            "last_4": f"{c % 10000:04d}"
+        })
+
+
+async def run_requests(access: AsyncDataAccess, customers: int, requests: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        access.fetch_customer_context(f"8{i % customers:09d}", f"{i % customers % 10000:04d}")
+        for i in range(requests)
+    ])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--customers", type=int, default=2000)
+    parser.add_argument("--per-customer", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    register_customers(args.customers)
+    ledger = build_ledger(args.customers, args.per_customer)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "transactions.db")
+        loader = SQLiteTransactionStore(path)
+        loader.load(ledger)
+        loader.close()
+
+        print(f"{args.requests:,} concurrent fetch_customer_context calls, "
+              f"{args.customers * args.per_customer:,} transactions on disk\n")
+        for pool_size in args.pool_sizes:
+            store = SQLiteTransactionStore(path, pool_size=pool_size)
+            set_transaction_store(store)
+            access = AsyncDataAccess()
+
+            sample = asyncio.run(access.fetch_customer_context("8000000001", "0001"))
+            assert sample["customer"] == get_customer("8000000001", "0001")
+            assert sample["transactions"] == get_transactions("CUST00000001")
+            assert sample["suspicious"] == get_suspicious_transactions("CUST00000001")
+
+            elapsed = asyncio.run(run_requests(access, args.customers, args.requests))
+            print(f"pool size {pool_size:>2}: {elapsed:6.2f} s  ({args.requests / elapsed:8,.0f} contexts/s)")
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
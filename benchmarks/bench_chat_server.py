@@ -0,0 +1,197 @@
+"""Benchmark - load test of chat_server.py (sessions per core)
+
+Starts chat_server.py in a subprocess per concurrency level, checks that
+the scripted conversations from bench_stage_dispatch.py give the same
+replies over HTTP as a local replay, then runs `concurrency` simulated
+users that each play scripted conversations back to back (a fresh session
+per conversation) for --duration seconds, over HTTP or WebSocket.
+
+Reports completed turns and conversations per second, turn latency
+percentiles, refused (busy) and timed-out turns, and conversations per
+server CPU-second - the sessions one core sustains. The client runs on the
+same machine, so wall-clock rates understate a dedicated server; the
+per-CPU-second figure does not.
+
+Usage:
+    python benchmarks/bench_chat_server.py
+    python benchmarks/bench_chat_server.py --concurrency 10,100,1000 --transport ws --duration 20
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+from bench_stage_dispatch import CONVERSATIONS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, args) -> subprocess.Popen:
+    command = [sys.executable, os.path.join(ROOT, "chat_server.py"), "--host", "127.0.0.1", "--port", str(port),
+               "--max-pending", str(args.max_pending), "--turn-timeout", str(args.turn_timeout)]
+    return subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def stop_server(process: subprocess.Popen):
+    process.terminate()
+    process.wait()
+
+
+async def server_health(base: str) -> dict:
+    async with aiohttp.ClientSession() as http:
+        async with http.get(f"{base}/health") as response:
+            return await response.json()
+
+
+async def wait_ready(base: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as http:
+        while True:
+            try:
+                async with http.get(f"{base}/health") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientConnectionError:
+                if time.monotonic() > deadline:
+                    raise
+            await asyncio.sleep(0.2)
+
+
+class Conversation:
+    """One simulated user's connection (HTTP requests or one WebSocket per session)"""
+
+    def __init__(self, http: aiohttp.ClientSession, base: str, transport: str, session_id: str):
+        self.http = http
+        self.base = base
+        self.transport = transport
+        self.session_id = session_id
+        self.ws = None
+
+    async def __aenter__(self):
+        if self.transport == "ws":
+            self.ws = await self.http.ws_connect(f"{self.base}/sessions/{self.session_id}/ws")
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def turn(self, user_input: str) -> dict:
+        if self.ws is not None:
+            await self.ws.send_str(user_input)
+            return await self.ws.receive_json()
+        async with self.http.post(f"{self.base}/sessions/{self.session_id}/turns",
+                                  json={"input": user_input}) as response:
+            return await response.json()
+
+
+def local_replay() -> list:
+    """(stage, action, response) per scripted turn, run in this process"""
+    import graph_runner
+    turns = []
+    for conversation in CONVERSATIONS:
+        runner = graph_runner.AgentRunner()
+        for user_input in conversation:
+            response, trace = runner.process_input(user_input)
+            turns.append((runner.current_stage, trace["action"], response))
+    return turns
+
+
+async def check_replies(base: str, transport: str, expected: list):
+    """Scripted conversations over the server match a local replay"""
+    got = []
+    async with aiohttp.ClientSession() as http:
+        for n, conversation in enumerate(CONVERSATIONS):
+            async with Conversation(http, base, transport, f"check-{n}") as chat:
+                for user_input in conversation:
+                    result = await chat.turn(user_input)
+                    got.append((result["stage"], result["action"], result["response"]))
+    assert got == expected, "server replies differ from a local replay"
+
+
+async def user(http, base: str, transport: str, user_id: int, deadline: float, results: dict):
+    """Play scripted conversations until the deadline"""
+    for n in itertools.count():
+        conversation = CONVERSATIONS[(user_id + n) % len(CONVERSATIONS)]
+        async with Conversation(http, base, transport, f"load-{user_id}-{n}") as chat:
+            for user_input in conversation:
+                while True:
+                    if time.monotonic() >= deadline:
+                        return
+                    start = time.perf_counter()
+                    result = await chat.turn(user_input)
+                    if "error" not in result:
+                        results["latency"].append(time.perf_counter() - start)
+                        break
+                    results[result["error"]] += 1
+                    if result["error"] == "internal":
+                        break
+                    # Refused or timed out: back off and send the same input again
+                    await asyncio.sleep(0.05)
+        results["conversations"] += 1
+
+
+async def load(base: str, transport: str, concurrency: int, duration: float) -> dict:
+    results = {"latency": [], "conversations": 0, "busy": 0, "timeout": 0, "internal": 0}
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=None)) as http:
+        deadline = time.monotonic() + duration
+        await asyncio.gather(*(user(http, base, transport, i, deadline, results) for i in range(concurrency)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", default="10,100,1000", help="comma-separated concurrent users")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--transport", choices=("http", "ws"), default="http")
+    parser.add_argument("--max-pending", type=int, default=256)
+    parser.add_argument("--turn-timeout", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"transport={args.transport} duration={args.duration:.0f}s max_pending={args.max_pending} "
+          f"turn_timeout={args.turn_timeout:.0f}s")
+    print(f"{'users':>6}{'turns/s':>9}{'convs/s':>9}{'p50 ms':>8}{'p99 ms':>8}{'busy':>7}{'timeout':>8}"
+          f"{'server cpu s':>13}{'convs/cpu-s':>12}")
+    expected = local_replay()
+    checked = False
+    for concurrency in [int(c) for c in args.concurrency.split(",")]:
+        port = free_port()
+        base = f"http://127.0.0.1:{port}"
+        server = start_server(port, args)
+        try:
+            asyncio.run(wait_ready(base))
+            if not checked:
+                asyncio.run(check_replies(base, args.transport, expected))
+                checked = True
+            cpu_before = asyncio.run(server_health(base))["cpu_seconds"]
+            results = asyncio.run(load(base, args.transport, concurrency, args.duration))
+            cpu_seconds = asyncio.run(server_health(base))["cpu_seconds"] - cpu_before
+        finally:
+            stop_server(server)
+        latency = sorted(results["latency"])
+        p50 = latency[len(latency) // 2] * 1000 if latency else float("nan")
+        p99 = latency[int(len(latency) * 0.99)] * 1000 if latency else float("nan")
+        print(f"{concurrency:>6}{len(latency) / args.duration:>9.0f}{results['conversations'] / args.duration:>9.1f}"
+              f"{p50:>8.1f}{p99:>8.1f}{results['busy']:>7}{results['timeout']:>8}"
+              f"{cpu_seconds:>13.1f}{results['conversations'] / cpu_seconds:>12.1f}")
+        if results["internal"]:
+            print(f"{'':>6}{results['internal']} turns failed on the server")
+    print("Replies over the server matched a local replay")
+
+
+if __name__ == "__main__":
+    main()
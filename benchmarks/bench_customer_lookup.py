@@ -0,0 +1,77 @@
+"""Benchmark - mobile number lookup latency vs. customer count
+
+Compares the indexed CustomerStore.find_by_mobile lookup against the old
+full scan over CUSTOMER_DB for growing portfolio sizes.
+
+Usage:
+    python benchmarks/bench_customer_lookup.py
+    python benchmarks/bench_customer_lookup.py --sizes 3 1000000 10000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from knowledge_base.customers import CustomerStore
+
+
+def build_customers(count: int) -> dict:
+    """Build a minimal customer dict keyed like CUSTOMER_DB"""
+    customers = {}
+    for i in range(count):
+        mobile = f"9{i:09d}"
+        last_4 = f"{i % 10000:04d}"
+        customers[f"{mobile}_{last_4}"] = {
+            "customer_id": f"CUST{i:08d}",
+            "mobile": mobile,
+            "last_4": last_4,
+        }
+    return customers
+
+
+def scan_by_mobile(customers: dict, mobile_number: str):
+    """Old verify_mobile behaviour: linear scan over every customer"""
+    for customer in customers.values():
+        if customer["mobile"] == mobile_number:
+            return customer
+    return None
+
+
+def time_per_call(fn, repeat: int) -> float:
+    """Average microseconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3, 1000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=10000)
+    parser.add_argument("--skip-scan-above", type=int, default=1000000,
+                        help="Skip the linear scan for portfolios larger than this")
+    args = parser.parse_args()
+
+    print(f"{'customers':>12} {'index hit (us)':>15} {'index miss (us)':>16} {'scan miss (us)':>15}")
+    for size in args.sizes:
+        customers = build_customers(size)
+        store = CustomerStore(customers)
+        known = f"9{size // 2:09d}"
+        unknown = "0000000000"
+
+        hit = time_per_call(lambda: store.find_by_mobile(known), args.repeat)
+        miss = time_per_call(lambda: store.find_by_mobile(unknown), args.repeat)
+        if size <= args.skip_scan_above:
+            scan_repeat = max(1, min(args.repeat, 10000000 // max(size, 1)))
+            scan = f"{time_per_call(lambda: scan_by_mobile(customers, unknown), scan_repeat):15.2f}"
+        else:
+            scan = f"{'skipped':>15}"
+        print(f"{size:>12,} {hit:15.3f} {miss:16.3f} {scan}")
+
+
+if __name__ == "__main__":
+    main()
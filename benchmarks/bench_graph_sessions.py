@@ -0,0 +1,99 @@
+"""Benchmark - session creation and per-turn cost of the shared conversation graph
+
+Compares AgentRunner creation (a state dict on the shared graph) with the
+AgentRunner at a git revision (--against, e.g. the last commit before the
+LangGraph graph), then replays the scripted conversations from
+bench_stage_dispatch.py across many concurrent sessions with each session
+store and LangGraph checkpointer and reports turn latency and heap held
+per session.
+
+Usage:
+    python benchmarks/bench_graph_sessions.py --against <rev>
+    python benchmarks/bench_graph_sessions.py --sessions 2000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from bench_stage_dispatch import CONVERSATIONS, load_revision, replay
+
+import graph_runner
+from knowledge_base.session_store import create_session_store
+
+
+def time_creation(module, count: int) -> float:
+    """Mean microseconds per AgentRunner()"""
+    start = time.perf_counter()
+    for _ in range(count):
+        module.AgentRunner()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def persistence(kind: str, path: str) -> tuple:
+    """Graph and session store for a "store:<backend>" or "checkpointer:<kind>" run"""
+    mode, backend = kind.split(":")
+    if mode == "store":
+        return graph_runner.build_graph(), create_session_store(backend, path)
+    return graph_runner.build_graph(graph_runner.make_checkpointer(backend, path)), None
+
+
+def run_sessions(kind: str, path: str, sessions: int, trace_memory: bool = False) -> tuple:
+    """
+    Interleave turns of `sessions` concurrent conversations on one graph
+
+    Returns:
+        (turn latencies in microseconds, heap MB held afterwards when trace_memory)
+    """
+    if trace_memory:
+        tracemalloc.start()
+    graph, store = persistence(kind, path)
+    runners = [graph_runner.AgentRunner(graph=graph, store=store) for _ in range(sessions)]
+    scripts = [CONVERSATIONS[i % len(CONVERSATIONS)] for i in range(sessions)]
+    samples = []
+    for turn in range(max(len(script) for script in scripts)):
+        for runner, script in zip(runners, scripts):
+            if turn < len(script):
+                start = time.perf_counter()
+                runner.process_input(script[turn], runner.current_stage)
+                samples.append((time.perf_counter() - start) * 1e6)
+    if not trace_memory:
+        return samples, None
+    heap_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    return samples, heap_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--against", default="HEAD", help="git revision to compare session creation with")
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--create", type=int, default=20000, help="sessions to create for the creation timing")
+    args = parser.parse_args()
+
+    assert replay(load_revision(args.against)) == replay(graph_runner), f"responses differ from {args.against}"
+    print(f"Scripted conversations identical to {args.against}")
+
+    before = load_revision(args.against)
+    old_us = time_creation(before, args.create)
+    new_us = time_creation(graph_runner, args.create)
+    print(f"AgentRunner()  {args.against}: {old_us:.2f}us   working tree: {new_us:.2f}us")
+
+    print(f"{args.sessions} concurrent sessions")
+    print(f"{'persistence':<20}{'turns':>8}{'p50 us':>10}{'p99 us':>10}{'KB/session':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind in ("store:memory", "store:sqlite", "checkpointer:memory", "checkpointer:sqlite"):
+            samples, _ = run_sessions(kind, os.path.join(tmp, "latency.db"), args.sessions)
+            # Heap is measured on a separate run; tracemalloc slows every turn
+            _, heap_mb = run_sessions(kind, os.path.join(tmp, "heap.db"), args.sessions, trace_memory=True)
+            samples.sort()
+            print(f"{kind:<20}{len(samples):>8}{statistics.median(samples):>10.0f}"
+                  f"{samples[int(len(samples) * 0.99)]:>10.0f}{heap_mb * 1000 / args.sessions:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark - general-enquiry intent routing, keyword cascades vs. src.intent_router
+
+Times the two keyword cascades the CLI agent and the graph runner used
+before src.intent_router (each re-scanning the query once per keyword),
+and the router's single compiled regex, over a set of labelled queries.
+Checks that the router gives the labelled intent for every query and
+counts the queries on which the old cascades disagreed.
+
+Usage:
+    python benchmarks/bench_intent_router.py
+    python benchmarks/bench_intent_router.py --repeat 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.intent_router import route_intent
+
+# (query, expected intent)
+QUERIES = [
+    ("what are my reward points", "reward_points"),
+    ("how much cashback do I have", "reward_points"),
+    ("credit limit", "credit_limit"),
+    ("what is my available credit", "credit_limit"),
+    ("is my statement limit reached", "credit_limit"),
+    ("send me my statement", "statement"),
+    ("I have a question about my last bill", "statement"),
+    ("when is my payment due", "payment_due"),
+    ("due payment", "payment_due"),
+    ("what is my card type", "card_details"),
+    ("card expiry date", "card_details"),
+    ("show my transaction history", "transaction_history"),
+    ("recent transactions please", "transaction_history"),
+    ("what interest rates do you charge", "interest_rates"),
+    ("what is the APR", "interest_rates"),
+    ("I want an unlimited plan", None),
+    ("I was charged twice in April", None),
+    ("hi", None),
+    ("can you help me with something else entirely, it is a long question", None),
+]
+
+_CLI_KEYWORDS = (
+    ("reward_points", ['reward', 'points', 'cashback']),
+    ("statement", ['statement', 'bill', 'due date', 'payment']),
+    ("credit_limit", ['credit limit', 'limit', 'available credit']),
+    ("card_details", ['card details', 'card type', 'expiry', 'validity']),
+    ("transaction_history", ['transaction', 'history', 'recent']),
+    ("interest_rates", ['interest', 'rate', 'apr', 'charges'])
+)
+
+_GRAPH_KEYWORDS = (
+    ("reward_points", ["reward", "point"]),
+    ("credit_limit", ["credit limit", "limit"]),
+    ("statement", ["statement", "bill"]),
+    ("payment_due", ["due", "payment"]),
+    ("transaction_history", ["transaction", "history"])
+)
+
+
+def cli_cascade(query: str) -> str:
+    """UnifiedCustomerSupportAgent.process_general_query's original routing"""
+    query_lower = query.lower()
+    for intent, words in _CLI_KEYWORDS:
+        if any(word in query_lower for word in words):
+            return intent
+    return None
+
+
+def graph_cascade(query: str) -> str:
+    """graph_runner's original general_enquiry routing"""
+    user_lower = query.lower()
+    for intent, words in _GRAPH_KEYWORDS:
+        if any(word in user_lower for word in words):
+            return intent
+    return None
+
+
+def time_router(route, queries: list, repeat: int) -> float:
+    """Mean microseconds per query"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            route(query)
+    return (time.perf_counter() - start) / (repeat * len(queries)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    for query, expected in QUERIES:
+        assert route_intent(query) == expected, f"{query!r}: {route_intent(query)!r}, expected {expected!r}"
+    disagreements = sum(cli_cascade(query) != graph_cascade(query) for query, _ in QUERIES)
+    print(f"{len(QUERIES)} labelled queries routed correctly; "
+          f"the old CLI and graph cascades disagreed on {disagreements}")
+
+    queries = [query for query, _ in QUERIES]
+    for name, route in (("CLI cascade", cli_cascade), ("graph cascade", graph_cascade),
+                        ("intent router", route_intent)):
+        print(f"{name:<15}{time_router(route, queries, args.repeat):8.2f}us/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark - bytes per transaction, plain dict vs. TransactionRecord
+
+Builds transactions the way a loader sees them (parsed from JSON, so every
+string is a separate object), then measures traced memory per transaction
+for plain dicts and for TransactionRecord.
+
+Usage:
+    python benchmarks/bench_record_memory.py --rows 10000000
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from knowledge_base.records import TransactionRecord
+
+MERCHANTS = ["Amazon", "Starbucks", "Walmart", "Unknown Merchant XYZ", "GlobalTech Solutions Ltd", "Target"]
+CATEGORIES = ["E-commerce", "Food & Beverage", "Retail", "Electronics", "Unknown"]
+LOCATIONS = ["Online", "Mumbai, India", "New York, NY", "Singapore (International)"]
+
+
+def json_lines(rows: int, seed: int = 7):
+    """Yield JSON lines shaped like TRANSACTIONS_DB entries"""
+    rng = random.Random(seed)
+    for i in range(rows):
+        txn = {
+            "transaction_id": f"TXN{i:09d}",
+            "date": f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            "amount": round(rng.uniform(10, 20000), 2),
+            "merchant": rng.choice(MERCHANTS),
+            "merchant_category": rng.choice(CATEGORIES),
+            "status": rng.choice(["completed", "pending"]),
+            "location": rng.choice(LOCATIONS),
+            "card_last_4": f"{i % 10000:04d}"
+        }
+        if i % 10 == 0:
+            txn["fraud_score"] = round(rng.random(), 2)
+        if i % 50 == 0:
+            txn["transaction_time"] = "Late night"
+            txn["merchant_status"] = "Newly added"
+        yield json.dumps(txn)
+
+
+def measure(rows: int, convert) -> float:
+    """Traced bytes per transaction for a list of converted records"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [convert(json.loads(line)) for line in json_lines(rows)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return (after - before) / rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+
+    as_dict = measure(args.rows, lambda d: d)
+    as_record = measure(args.rows, TransactionRecord)
+    print(f"Rows: {args.rows:,}")
+    print(f"dict              : {as_dict:8.1f} bytes/transaction  ({as_dict * args.rows / 2**20:10,.1f} MiB)")
+    print(f"TransactionRecord : {as_record:8.1f} bytes/transaction  ({as_record * args.rows / 2**20:10,.1f} MiB)")
+    print(f"saving            : {1 - as_record / as_dict:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Benchmark - retrieval latency, memory and recall for every retriever
+
+Runs the labelled queries in benchmarks/retrieval_queries.json (covering
+every policy family) against each retriever over the real policy corpus
+scaled with synthetic distractor passages (1x, 10x, 100x, 1000x):
+
+  sections  KnowledgeBaseRAG.retrieve()      recall of labelled sections
+  bm25      retrieve_top_k(), BM25            recall@k of labelled passages
+  vector    retrieve_top_k(), chromadb        recall@k of labelled passages
+
+It reports corpus size (passages, or indexed terms for sections), p50/p99
+latency, Python heap used by the built retriever and recall, then compares
+against a baseline file and exits non-zero when recall drops or p99
+latency grows past the thresholds. Latency baselines
+are machine-specific - regenerate them with --save-baseline on the machine
+that runs the check.
+
+Usage:
+    python benchmarks/bench_retrieval.py
+    python benchmarks/bench_retrieval.py --scales 1,10 --retrievers bm25 --save-baseline
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Measure uncached retrieval and never re-check policy files mid-run
+os.environ["RAG_CACHE_SIZE"] = "0"
+os.environ["POLICY_REFRESH_SECONDS"] = "1e9"
+
+from knowledge_base.rag_retriever import KnowledgeBaseRAG, SECTION_TERMS
+from knowledge_base.retrieval import tokenize
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+QUERIES_PATH = os.path.join(BENCH_DIR, "retrieval_queries.json")
+BASELINE_PATH = os.path.join(BENCH_DIR, "retrieval_baseline.json")
+RECALL_KS = (1, 3, 5)
+PASSAGES_PER_DOC = 100
+
+
+def synthetic_passages(base: dict, count: int, seed: int = 5) -> dict:
+    """
+    Distractor passages drawn from the real corpus vocabulary
+
+    Returns a nested section ({"d0": {"p0": text, ...}, ...}) so it can be
+    added with KnowledgeBaseRAG.add_section in one call.
+    """
+    rng = random.Random(seed)
+    vocabulary = sorted({token for text in base.values() for token in tokenize(text)})
+    lengths = [len(tokenize(text)) for text in base.values()]
+    docs = {}
+    for i in range(count):
+        words = rng.choices(vocabulary, k=rng.choice(lengths))
+        docs.setdefault(f"d{i // PASSAGES_PER_DOC}", {})[f"p{i % PASSAGES_PER_DOC}"] = " ".join(words)
+    return docs
+
+
+def build(retriever: str, scale: int, index_dir: str) -> KnowledgeBaseRAG:
+    """Build a retriever over the corpus scaled `scale` times"""
+    rag = KnowledgeBaseRAG(retriever="vector" if retriever == "vector" else "bm25",
+                           vector_index_path=index_dir)
+    if retriever == "sections":
+        # Extra sections with terms no query uses
+        for i in range(len(SECTION_TERMS) * (scale - 1)):
+            rag.index.add(f"synthetic_{i}", [f"zq{i}t{j}" for j in range(5)])
+    elif scale > 1:
+        rag.add_section("synthetic", synthetic_passages(rag.passages, len(rag.passages) * (scale - 1)), [])
+    if retriever == "vector":
+        rag.vector_index
+    return rag
+
+
+def recall(expected: list, got: list) -> float:
+    return len(set(expected) & set(got)) / len(expected) if expected else 1.0
+
+
+def evaluate(rag: KnowledgeBaseRAG, retriever: str, queries: list, repeat: int) -> dict:
+    """Latency percentiles and recall for one built retriever"""
+    max_k = max(RECALL_KS)
+    if retriever == "sections":
+        run = rag.retrieve
+    else:
+        run = lambda query: rag.retrieve_top_k(query, max_k)
+    for item in queries:
+        run(item["query"])
+    samples = []
+    for _ in range(repeat):
+        for item in queries:
+            start = time.perf_counter_ns()
+            run(item["query"])
+            samples.append(time.perf_counter_ns() - start)
+    samples.sort()
+    result = {
+        "p50_us": samples[len(samples) // 2] / 1000,
+        "p99_us": samples[min(len(samples) - 1, int(len(samples) * 0.99))] / 1000
+    }
+    if retriever == "sections":
+        result["recall"] = statistics.mean(recall(q["sections"], list(run(q["query"]))) for q in queries)
+    else:
+        ranked = {q["query"]: [path for path, _, _ in run(q["query"])] for q in queries}
+        for k in RECALL_KS:
+            result[f"recall@{k}"] = statistics.mean(recall(q["passages"], ranked[q["query"]][:k]) for q in queries)
+    return result
+
+
+def check_regressions(results: dict, baseline: dict, recall_key: str,
+                      max_recall_drop: float, max_latency_ratio: float) -> list:
+    """Messages for every result worse than its baseline"""
+    failures = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        key = "recall" if name.startswith("sections") else recall_key
+        if key in previous and current[key] < previous[key] - max_recall_drop:
+            failures.append(f"{name}: {key} {current[key]:.3f} < baseline {previous[key]:.3f}")
+        if max_latency_ratio and current["p99_us"] > previous["p99_us"] * max_latency_ratio:
+            failures.append(f"{name}: p99 {current['p99_us']:.0f}us > {max_latency_ratio}x "
+                            f"baseline {previous['p99_us']:.0f}us")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1,10,100,1000")
+    parser.add_argument("--retrievers", default="sections,bm25,vector")
+    parser.add_argument("--vector-max-scale", type=int, default=100,
+                        help="Skip the vector retriever above this scale (embedding 100k passages is slow)")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--k", type=int, default=3, choices=RECALL_KS, help="recall@k checked against the baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--max-recall-drop", type=float, default=0.02)
+    parser.add_argument("--max-latency-ratio", type=float, default=2.0, help="0 disables the latency check")
+    args = parser.parse_args()
+
+    with open(QUERIES_PATH, encoding="utf-8") as f:
+        queries = json.load(f)
+    scales = [int(s) for s in args.scales.split(",")]
+    retrievers = args.retrievers.split(",")
+    if "vector" in retrievers:
+        # Keep the one-off import out of the heap measurement
+        import chromadb  # noqa: F401
+
+    results = {}
+    print(f"{len(queries)} labelled queries x {args.repeat} repeats")
+    print(f"{'retriever':<10}{'scale':>7}{'size':>10}{'p50 us':>10}{'p99 us':>10}{'heap MB':>9}"
+          + "".join(f"{f'recall@{k}':>10}" for k in RECALL_KS) + f"{'recall':>8}")
+    for retriever in retrievers:
+        for scale in scales:
+            if retriever == "vector" and scale > args.vector_max_scale:
+                continue
+            with tempfile.TemporaryDirectory() as index_dir:
+                tracemalloc.start()
+                rag = build(retriever, scale, index_dir)
+                heap_mb = tracemalloc.get_traced_memory()[0] / 1e6
+                tracemalloc.stop()
+                result = evaluate(rag, retriever, queries, args.repeat)
+                result["heap_mb"] = heap_mb
+                result["size"] = len(rag.index) if retriever == "sections" else len(rag.passages)
+                del rag
+            results[f"{retriever}@{scale}x"] = result
+            print(f"{retriever:<10}{scale:>6}x{result['size']:>10}{result['p50_us']:>10.1f}{result['p99_us']:>10.1f}"
+                  f"{heap_mb:>9.1f}"
+                  + "".join(f"{result[f'recall@{k}']:>10.3f}" if f"recall@{k}" in result else f"{'-':>10}"
+                            for k in RECALL_KS)
+                  + (f"{result['recall']:>8.3f}" if "recall" in result else f"{'-':>8}"))
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found - run with --save-baseline to create one")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    failures = check_regressions(results, baseline, f"recall@{args.k}",
+                                 args.max_recall_drop, args.max_latency_ratio)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if failures:
+        sys.exit(1)
+    print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark - batch retrieval (retrieve_many) vs. per-query retrieve()
+
+Generates a labelled-style query set from policy vocabulary and filler
+words, checks that retrieve_many() returns exactly what retrieve() returns
+for every query, then times the per-query loop, the serial batch path and
+the process-pool batch path.
+
+Usage:
+    python benchmarks/bench_retrieve_many.py --queries 200000 --processes 4
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from knowledge_base.rag_retriever import KnowledgeBaseRAG, SECTION_TERMS
+
+FILLER = ["my", "the", "please", "why", "is", "was", "what", "about", "help", "card", "money",
+          "account", "yesterday", "charged", "twice", "abroad", "online", "refund", "urgent"]
+
+
+def build_queries(count: int, distinct: int, seed: int = 11) -> list:
+    """Build `count` queries drawn from `distinct` generated phrasings"""
+    rng = random.Random(seed)
+    vocabulary = [term for terms in SECTION_TERMS.values() for term in terms]
+    phrasings = [
+        " ".join(rng.sample(vocabulary, rng.randint(1, 2)) + rng.sample(FILLER, rng.randint(2, 6)))
+        for _ in range(distinct)
+    ]
+    return [rng.choice(phrasings) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=200000)
+    parser.add_argument("--distinct", type=int, default=50000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    queries = build_queries(args.queries, args.distinct)
+    rag = KnowledgeBaseRAG(markdown_dir=None)
+
+    start = time.perf_counter()
+    expected = [rag.retrieve(query) for query in queries]
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    serial = rag.retrieve_many(queries)
+    serial_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = rag.retrieve_many(queries, processes=args.processes, chunk_size=10000)
+    parallel_seconds = time.perf_counter() - start
+
+    assert serial == expected, "retrieve_many() differs from retrieve()"
+    assert parallel == expected, "retrieve_many(processes=...) differs from retrieve()"
+
+    print(f"{len(queries):,} queries ({args.distinct:,} distinct phrasings) - results identical")
+    print(f"{'retrieve() loop':<32}{loop_seconds:>8.3f} s")
+    print(f"{'retrieve_many()':<32}{serial_seconds:>8.3f} s")
+    print(f"{f'retrieve_many(processes={args.processes})':<32}{parallel_seconds:>8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Benchmark - session state encoding and cross-worker session handoff
+
+1. Encodes every session state reached by the scripted conversations with
+   encode_session (positional msgpack), JSON and pickle, and reports the
+   average record size and encode/decode time.
+2. Times a get + put round trip for each SessionStore backend.
+3. Replays the conversations with every turn sent to the next of
+   --workers processes sharing one SQLite session store, and checks the
+   responses match a single-process replay.
+
+Usage:
+    python benchmarks/bench_session_state.py
+    python benchmarks/bench_session_state.py --workers 4 --repeat 20000
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import pickle
+import tempfile
+import time
+
+from bench_stage_dispatch import CONVERSATIONS
+
+import graph_runner
+from knowledge_base.session_store import (
+    SESSION_FIELDS,
+    encode_session,
+    decode_session,
+    create_session_store,
+    set_session_store
+)
+
+
+def reached_states() -> list:
+    """Persistent fields of the session after every scripted turn"""
+    states = []
+    for conversation in CONVERSATIONS:
+        runner = graph_runner.AgentRunner(store=create_session_store("memory"))
+        for user_input in conversation:
+            runner.process_input(user_input, runner.current_stage)
+            states.append({field: runner.state[field] for field in SESSION_FIELDS})
+    return states
+
+
+def time_codec(states: list, encode, decode, repeat: int) -> tuple:
+    """(mean bytes, encode us, decode us) per state"""
+    encoded = [encode(state) for state in states]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for state in states:
+            encode(state)
+    encode_us = (time.perf_counter() - start) / (repeat * len(states)) * 1e6
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for data in encoded:
+            decode(data)
+    decode_us = (time.perf_counter() - start) / (repeat * len(states)) * 1e6
+    return sum(len(data) for data in encoded) / len(encoded), encode_us, decode_us
+
+
+def time_store(store, states: list, repeat: int) -> float:
+    """Mean microseconds per get + put"""
+    start = time.perf_counter()
+    for i in range(repeat):
+        session_id = f"s{i % 1000}"
+        store.get(session_id)
+        store.put(session_id, states[i % len(states)])
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def _worker_init(path: str):
+    set_session_store(create_session_store("sqlite", path))
+
+
+def _worker_turn(args: tuple) -> tuple:
+    session_id, user_input, stage = args
+    runner = graph_runner.AgentRunner(session_id)
+    response, trace = runner.process_input(user_input, stage)
+    return runner.current_stage, trace["action"], response
+
+
+def handoff(workers: int, path: str) -> list:
+    """Replay the conversations with consecutive turns on different workers"""
+    # Spawned, not forked: the parent already runs LangGraph's executor threads
+    context = multiprocessing.get_context("spawn")
+    pools = [context.Pool(1, _worker_init, (path,)) for _ in range(workers)]
+    turns = []
+    try:
+        for n, conversation in enumerate(CONVERSATIONS):
+            session_id = f"handoff-{n}"
+            stage = "initial"
+            for i, user_input in enumerate(conversation):
+                result = pools[i % workers].apply(_worker_turn, ((session_id, user_input, stage),))
+                stage = result[0]
+                turns.append(result)
+    finally:
+        for pool in pools:
+            pool.terminate()
+    return turns
+
+
+def local_replay() -> list:
+    turns = []
+    for conversation in CONVERSATIONS:
+        runner = graph_runner.AgentRunner(store=create_session_store("memory"))
+        for user_input in conversation:
+            response, trace = runner.process_input(user_input, runner.current_stage)
+            turns.append((runner.current_stage, trace["action"], response))
+    return turns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    states = reached_states()
+    print(f"{len(states)} session states")
+    print(f"{'encoding':<18}{'bytes':>8}{'encode us':>11}{'decode us':>11}")
+    codecs = [
+        ("msgpack (schema)", encode_session, decode_session),
+        ("json", lambda s: json.dumps(s).encode(), json.loads),
+        ("pickle", lambda s: pickle.dumps(s, pickle.HIGHEST_PROTOCOL), pickle.loads)
+    ]
+    for name, encode, decode in codecs:
+        size, encode_us, decode_us = time_codec(states, encode, decode, max(1, args.repeat // 50))
+        print(f"{name:<18}{size:>8.0f}{encode_us:>11.2f}{decode_us:>11.2f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in ("memory", "sqlite"):
+            store = create_session_store(backend, os.path.join(tmp, "store.db"))
+            print(f"{backend:<8} store get + put {time_store(store, states, args.repeat):8.1f}us")
+
+        turns = handoff(args.workers, os.path.join(tmp, "handoff.db"))
+    assert turns == local_replay(), "responses differ when turns move between workers"
+    print(f"{len(turns)} turns spread over {args.workers} worker processes match a single-process replay")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark - bulk SMS rendering, precompiled templates vs. str.format
+
+Renders "card_blocked" and "transaction_alert" messages for a synthetic
+recipient list, once through the original per-message path (look up
+SMS_FORMATS, then str.format) and once through knowledge_base.sms.render_bulk,
+checks that every message is identical, and reports messages per second.
+
+Usage:
+    python benchmarks/bench_sms_render.py --messages 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from knowledge_base.policies import SMS_FORMATS
+from knowledge_base.sms import render_bulk
+
+
+def recipients(count: int):
+    """Yield field dicts for both templates"""
+    for i in range(count):
+        yield {
+            "last4": f"{i % 10000:04d}",
+            "ticket_id": f"FRD{i % 1000000:06d}",
+            "amount": 100 + i % 9900,
+            "merchant": "Compromised Merchant Ltd",
+            "date": "21-Jan-2026",
+            "support_number": "1800-XXX-XXXX"
+        }
+
+
+def format_loop(sms_type: str, rows):
+    """The pre-existing path: dict lookups + str.format per message"""
+    for row in rows:
+        yield SMS_FORMATS.get(sms_type, {}).get("template", "").format(**row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=1000000)
+    args = parser.parse_args()
+
+    rows = list(recipients(args.messages))
+    print(f"{args.messages:,} messages per template")
+    for sms_type in ("card_blocked", "transaction_alert"):
+        start = time.perf_counter()
+        expected = list(format_loop(sms_type, rows))
+        format_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rendered = list(render_bulk(sms_type, rows))
+        bulk_seconds = time.perf_counter() - start
+
+        assert rendered == expected, f"render_bulk output differs for {sms_type}"
+        print(f"{sms_type:<20}str.format {format_seconds:6.2f} s ({args.messages / format_seconds:>10,.0f}/s)"
+              f"   render_bulk {bulk_seconds:6.2f} s ({args.messages / bulk_seconds:>10,.0f}/s)"
+              f"   {format_seconds / bulk_seconds:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
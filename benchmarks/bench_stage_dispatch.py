@@ -0,0 +1,158 @@
+"""Benchmark - AgentRunner.process_input per-turn overhead, stage table vs. a git revision
+
+Loads graph_runner.py as it was at --against (e.g. the commit before the
+stage table replaced the if/elif chain) next to the working tree version,
+then:
+
+  1. replays scripted conversations through both and checks that every
+     turn gives the same stage, trace action and response text, and that
+     every transition is declared in graph_runner.STAGES (responses are
+     normalized first for the intended changes listed in MASKS, so older
+     revisions still compare)
+  2. times "dispatch-bound" turns (invalid inputs and terminations, where
+     the handler does almost nothing) and full conversations
+
+Usage:
+    python benchmarks/bench_stage_dispatch.py --against <rev>
+    python benchmarks/bench_stage_dispatch.py --turns 200000
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import graph_runner
+
+# Scripted conversations covering every stage, both menu options,
+# verification failures, terminations and the proactive fraud alert
+CONVERSATIONS = [
+    ["1", "9876543210", "1234", "what are my reward points", "no", "yes"],
+    ["1", "9876543210", "1234", "reward points", "yes", "statement", "thanks"],
+    ["1", "9998887776", "5678", "credit limit", "statement", "due payment", "history", "blah", "1", "9998887776", "5678", "exit"],
+    ["2", "9876543210", "1234", "3", "no", "yes", "1"],
+    ["2", "9123456789", "9012", "8900.00", "2", "yes"],
+    ["2", "9123456789", "9012", "amazon", "starbucks", "18900.0", "no", "no", "2"],
+    ["2", "0000", "1111", "2222", "1", "9876543210", "9999", "9999", "9999"],
+    ["x", "1", "9123456789", "9012", "points", "yes", "payment", "thank you"],
+    ["1", "9123456789", "9012", "hi", "maybe", "no", "maybe", "yes"],
+    ["2", "9998887776", "5678", "no thanks", "1", "exit", "2", "that's all"],
+]
+
+# (stage, input) turns whose cost is almost entirely dispatch
+DISPATCH_TURNS = [
+    ("initial", "x"),
+    ("general_enquiry", "thanks"),
+    ("general_enquiry", "no"),
+    ("fraud_confirmation", "maybe"),
+    ("fraud_action", "maybe"),
+    ("completed", "hello"),
+    ("completed", "exit"),
+]
+
+# (pattern, replacement) applied to every response before comparing:
+#   - ticket IDs: derived from hash() before ticket_number() switched to crc32
+#   - clarification menu: card details and interest rates were added when
+#     general enquiries moved to src.intent_router
+MASKS = [
+    (re.compile(r"\b(BLK|CCB)\d{6}\b"), r"\1######"),
+    (re.compile(r"- Card details\n- Interest rates and charges\n"), ""),
+]
+
+
+def load_revision(rev: str) -> types.ModuleType:
+    """graph_runner.py at a git revision, as a separate module"""
+    source = subprocess.run(["git", "-C", ROOT, "show", f"{rev}:graph_runner.py"],
+                            check=True, capture_output=True, text=True).stdout
+    module = types.ModuleType(f"graph_runner_{rev}")
+    module.__file__ = os.path.join(ROOT, "graph_runner.py")
+    exec(compile(source, f"{rev}:graph_runner.py", "exec"), module.__dict__)
+    return module
+
+
+def replay(module: types.ModuleType) -> list:
+    """(input, stage, action, response) for every turn of every conversation, MASKS applied"""
+    turns = []
+    for conversation in CONVERSATIONS:
+        runner = module.AgentRunner()
+        for user_input in conversation:
+            response, trace = runner.process_input(user_input, runner.current_stage)
+            for pattern, replacement in MASKS:
+                response = pattern.sub(replacement, response)
+            turns.append((user_input, runner.current_stage, trace.get("action"), response))
+    return turns
+
+
+def check_transitions():
+    """Every stage change seen in the conversations is declared in STAGES"""
+    for conversation in CONVERSATIONS:
+        runner = graph_runner.AgentRunner()
+        for user_input in conversation:
+            before = runner.current_stage
+            _, trace = runner.process_input(user_input, before)
+            after = runner.current_stage
+            if trace["action"] == "conversation_terminated":
+                continue
+            assert after in graph_runner.STAGES[before].next_stages, \
+                f"undeclared transition {before} -> {after} on {user_input!r}"
+
+
+def time_dispatch(module: types.ModuleType, turns: int) -> float:
+    """Mean microseconds per dispatch-bound turn"""
+    runner = module.AgentRunner()
+    rounds = max(1, turns // len(DISPATCH_TURNS))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for stage, user_input in DISPATCH_TURNS:
+            runner.process_input(user_input, stage)
+    return (time.perf_counter() - start) / (rounds * len(DISPATCH_TURNS)) * 1e6
+
+
+def time_conversations(module: types.ModuleType, repeat: int) -> float:
+    """Mean microseconds per turn over the scripted conversations"""
+    elapsed = 0.0
+    count = 0
+    for _ in range(repeat):
+        for conversation in CONVERSATIONS:
+            runner = module.AgentRunner()
+            for user_input in conversation:
+                start = time.perf_counter()
+                runner.process_input(user_input, runner.current_stage)
+                elapsed += time.perf_counter() - start
+                count += 1
+    return elapsed / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--against", default="HEAD", help="git revision to compare with (default HEAD)")
+    parser.add_argument("--turns", type=int, default=200000, help="dispatch-bound turns to time")
+    parser.add_argument("--repeat", type=int, default=50, help="times to replay the conversations")
+    args = parser.parse_args()
+
+    before = load_revision(args.against)
+    expected = replay(before)
+    got = replay(graph_runner)
+    for i, (old, new) in enumerate(zip(expected, got)):
+        assert old == new, f"turn {i} differs:\n{args.against}: {old!r}\nworking tree: {new!r}"
+    assert len(expected) == len(got)
+    check_transitions()
+    print(f"{len(got)} turns identical to {args.against}; all transitions declared in STAGES")
+
+    print(f"{'':<22}{args.against:>14}{'working tree':>14}{'speedup':>9}")
+    old_us = time_dispatch(before, args.turns)
+    new_us = time_dispatch(graph_runner, args.turns)
+    print(f"{'dispatch-bound turn':<22}{old_us:>12.2f}us{new_us:>12.2f}us{old_us / new_us:>8.2f}x")
+    old_us = time_conversations(before, args.repeat)
+    new_us = time_conversations(graph_runner, args.repeat)
+    print(f"{'conversation turn':<22}{old_us:>12.2f}us{new_us:>12.2f}us{old_us / new_us:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Benchmark - transaction store lookups by ID, pages, time windows and amount
+
+Loads a synthetic ledger into each TransactionStore backend and times
+get(transaction_id), list_for_customer(customer_id, limit, after),
+list_for_customer(customer_id, since=..., until=...) and
+find_by_amount(customer_id, amount, tolerance) against the old scans.
+
+Usage:
+    python benchmarks/bench_transaction_store.py --customers 10000 --per-customer 50
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from knowledge_base.transaction_store import InMemoryTransactionStore, SQLiteTransactionStore
+
+
+def build_ledger(customers: int, per_customer: int) -> dict:
+    """Build a synthetic {customer_id: [transaction, ...]} ledger"""
+    ledger = {}
+    for c in range(customers):
+        customer_id = f"CUST{c:08d}"
+        ledger[customer_id] = [
+            {
+                "transaction_id": f"TXN{c:08d}{t:04d}",
+                "date": f"2026-{1 + t % 12:02d}-{1 + t % 28:02d}",
+                "amount": float(100 + (c * 31 + t * 17) % 20000),
+                "merchant": f"Merchant {t % 500}",
+                "merchant_category": "Retail",
+                "status": "completed",
+                "location": "Mumbai, India",
+                "card_last_4": f"{c % 10000:04d}",
+            }
+            for t in range(per_customer)
+        ]
+    return ledger
+
+
+def scan_by_id(ledger: dict, transaction_id: str):
+    """Old get_transaction_by_id behaviour: nested scan"""
+    for customer_transactions in ledger.values():
+        for transaction in customer_transactions:
+            if transaction["transaction_id"] == transaction_id:
+                return transaction
+    return None
+
+
+def scan_by_amount(transactions: list, amount: str):
+    """Old fraud-flow behaviour: string compare over the listed transactions"""
+    for txn in transactions:
+        if str(txn['amount']) == amount or str(int(float(amount))) == str(int(txn['amount'])):
+            return txn
+    return None
+
+
+def time_per_call(fn, repeat: int) -> float:
+    """Average microseconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--customers", type=int, default=10000)
+    parser.add_argument("--per-customer", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    ledger = build_ledger(args.customers, args.per_customer)
+    total = args.customers * args.per_customer
+    customer_id = f"CUST{args.customers // 2:08d}"
+    transaction_id = f"TXN{args.customers - 1:08d}{args.per_customer - 1:04d}"
+    print(f"Ledger: {args.customers:,} customers, {total:,} transactions\n")
+
+    history = ledger[customer_id]
+    amount = history[-1]["amount"]
+    scan = time_per_call(lambda: scan_by_id(ledger, transaction_id), max(1, args.repeat // 100))
+    # Worst case for the scan: the reported amount is the oldest transaction
+    amount_scan = time_per_call(lambda: scan_by_amount(history, str(amount)), args.repeat)
+    print(f"{'old scans':<10} get by id: {scan:12.2f} us   "
+          f"amount match over full history: {amount_scan:8.2f} us")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stores = {
+            "memory": InMemoryTransactionStore(),
+            "sqlite": SQLiteTransactionStore(os.path.join(tmp, "transactions.db")),
+        }
+        for name, store in stores.items():
+            start = time.perf_counter()
+            store.load(ledger)
+            load_s = time.perf_counter() - start
+
+            by_id = time_per_call(lambda: store.get(transaction_id), args.repeat)
+            first_page = store.list_for_customer(customer_id, 10)
+            cursor = first_page[-1]["transaction_id"]
+            page = time_per_call(lambda: store.list_for_customer(customer_id, 10), args.repeat)
+            next_page = time_per_call(lambda: store.list_for_customer(customer_id, 10, after=cursor), args.repeat)
+            by_amount = time_per_call(lambda: store.find_by_amount(customer_id, amount, 1.0), args.repeat)
+            window = time_per_call(
+                lambda: store.list_for_customer(customer_id, None, since="2026-03-01", until="2026-03-08"),
+                args.repeat
+            )
+            print(f"{name:<10} get by id: {by_id:12.2f} us   page: {page:8.2f} us   "
+                  f"next page: {next_page:8.2f} us   amount: {by_amount:8.2f} us   "
+                  f"7-day window: {window:8.2f} us   load: {load_s:6.2f} s")
+            if name == "sqlite":
+                store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Check - batch risk scoring vs. the original detect_unusual_activity loop, on edge rows
+
+Runs a verbatim copy of UnifiedCustomerSupportAgent.detect_unusual_activity
+as it was before the risk rules moved to knowledge_base.risk (string
+operations on each dict) and knowledge_base.batch_risk over every
+combination of boundary values, and asserts that both flag the same
+transactions as unusual:
+
+  - fraud_score just below, at and above the 0.7 threshold, and missing
+  - pending/completed amounts around 5000, status case
+  - merchant_status absent, empty, "Newly added" and other values
+  - location and merchant case ("INTERNATIONAL", "unknown")
+  - times around the late-night window (22:59-23:00, 04:59-06:00, 12 AM)
+    in both 24h and AM/PM dates, and date-only rows with free-text
+    transaction_time labels
+
+Time-bearing rows carry the transaction_time label their clock implies.
+The original loop only read the label; since dates carry a time, the
+clock decides (see risk.is_late_night), so a label contradicting the clock
+is an intended difference and is not generated here.
+
+Usage:
+    python benchmarks/check_batch_risk.py
+"""
+
+import itertools
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from knowledge_base.batch_risk import score_transactions, unusual_mask
+from knowledge_base.records import normalize_transaction
+
+FRAUD_SCORES = [None, 0, 0.69, 0.7, 0.7000001, 0.71, 1.0]
+LOCATIONS = ["Mumbai, India", "International", "Singapore (INTERNATIONAL)", None]
+# (date, transaction_time); None leaves the field out
+TIMES = [
+    ("2026-02-05", None),
+    ("2026-02-05", ""),
+    ("2026-02-05", "Late night"),
+    ("2026-02-05", "LATE evening"),
+    ("2026-02-05", "Morning"),
+    ("2026-02-05 22:59", "Evening"),
+    ("2026-02-05 23:00", "Late night"),
+    ("2026-02-05 11:00 PM", "Late night"),
+    ("2026-02-05 12:00 AM", "Late night"),
+    ("2026-02-05 04:59", "Late night"),
+    ("2026-02-05 05:00", "Early morning"),
+    ("2026-02-05 05:59:59", "Early morning"),
+    ("2026-02-05T06:00:00", "Morning"),
+]
+MERCHANT_STATUSES = [None, "", "Newly added", "newly added", "Verified"]
+# (status, amount)
+PAYMENTS = [
+    ("pending", 4999.99), ("pending", 5000), ("pending", 5000.01), ("pending", 18900.0),
+    ("Pending", 18900.0), ("completed", 18900.0), ("declined", 5000.01), ("pending", None),
+]
+MERCHANTS = ["Amazon", "Unknown Merchant XYZ", "UNKNOWN", None]
+
+
+def baseline_detect_unusual_activity(transactions: list) -> list:
+    """detect_unusual_activity as it was before knowledge_base.risk (verbatim)"""
+    suspicious = []
+
+    for txn in transactions:
+        risk_factors = []
+
+        if txn.get('fraud_score', 0) > 0.7:
+            risk_factors.append("high_fraud_score")
+
+        if 'international' in txn.get('location', '').lower():
+            risk_factors.append("international")
+
+        if txn.get('transaction_time') and 'late' in txn.get('transaction_time', '').lower():
+            risk_factors.append("late_night")
+
+        if txn.get('merchant_status') == 'Newly added':
+            risk_factors.append("new_merchant")
+
+        if txn.get('status') == 'pending' and txn.get('amount', 0) > 5000:
+            risk_factors.append("high_value_pending")
+
+        if 'unknown' in txn.get('merchant', '').lower():
+            risk_factors.append("unknown_merchant")
+
+        if len(risk_factors) >= 2:
+            suspicious.append(txn)
+
+    return suspicious
+
+
+def build_edge_rows() -> list:
+    """One transaction per combination of the boundary values above"""
+    rows = []
+    combinations = itertools.product(FRAUD_SCORES, LOCATIONS, TIMES, MERCHANT_STATUSES, PAYMENTS, MERCHANTS)
+    for i, (score, location, (date, label), merchant_status, (status, amount), merchant) in enumerate(combinations):
+        txn = {
+            "transaction_id": f"EDGE{i:06d}",
+            "date": date,
+            "merchant_category": "Retail",
+            "status": status,
+            "card_last_4": "1234"
+        }
+        # Absent fields stay absent, as in the customer data files
+        for field, value in (("fraud_score", score), ("location", location), ("transaction_time", label),
+                             ("merchant_status", merchant_status), ("amount", amount), ("merchant", merchant)):
+            if value is not None:
+                txn[field] = value
+        rows.append(txn)
+    return rows
+
+
+def main():
+    rows = build_edge_rows()
+    expected = {txn["transaction_id"] for txn in baseline_detect_unusual_activity(rows)}
+    # Stores parse dates once on load; score what they hold
+    transaction_ids, bitmasks = score_transactions(normalize_transaction(txn) for txn in rows)
+    got = {transaction_ids[i] for i in unusual_mask(bitmasks).nonzero()[0]}
+    missing = sorted(expected - got)
+    extra = sorted(got - expected)
+    assert not missing and not extra, f"batch misses {missing[:5]} and adds {extra[:5]} (of {len(rows)} rows)"
+    print(f"{len(rows):,} edge rows ({len(got):,} unusual) - batch matches the original loop on every row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""Chat Server - Headless asyncio HTTP/WebSocket front-end for the conversation graph"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web, WSMsgType
+from dotenv import load_dotenv
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from graph_runner import AgentRunner
+
+# Load environment variables
+load_dotenv()
+
+
+class Busy(Exception):
+    """Raised when a turn is refused because max_pending turns are already queued"""
+
+
+class ChatServer:
+    """
+    Multiplexes many chat sessions over one event loop
+
+    Each turn runs AgentRunner.process_input on a small thread pool, so the
+    event loop keeps accepting connections while turns execute. Session
+    state lives in the session store (see graph_runner.AgentRunner), so any
+    server process sharing the store can take any turn.
+
+    Backpressure: at most max_pending turns may be queued or running; further
+    turns are refused at once (HTTP 503 with Retry-After, or a "busy" error
+    frame on a WebSocket) instead of queueing without bound. A WebSocket
+    connection reads its next message only after answering the previous one.
+
+    Timeouts: a turn that takes longer than turn_timeout seconds is answered
+    with HTTP 504 / a "timeout" error frame. Its worker thread still finishes
+    the turn in the background (and saves the session), and the turn counts
+    against max_pending until it does.
+
+    Turns of the same session are serialized within a process. A turn that
+    fails is answered with HTTP 500 / an "internal" error frame.
+
+    Endpoints:
+        POST   /sessions                 {} -> {"session_id", "stage"}
+        POST   /sessions/{id}/turns      {"input": "..."} -> turn result
+        GET    /sessions/{id}            session state
+        DELETE /sessions/{id}            end the session
+        GET    /sessions/{id}/ws         WebSocket; each text frame is one turn
+        GET    /health                   counters and process CPU seconds
+    """
+
+    def __init__(self, max_pending: int = None, turn_timeout: float = None, workers: int = None):
+        """
+        Args:
+            max_pending: Turns queued or running before new ones are refused
+                (CHAT_MAX_PENDING env var, then 256)
+            turn_timeout: Seconds (including waiting for an earlier turn of the
+                same session) before a turn is answered with a timeout
+                (CHAT_TURN_TIMEOUT env var, then 10)
+            workers: Threads running turns (CHAT_WORKERS env var, then 4)
+        """
+        self.max_pending = max_pending or int(os.getenv("CHAT_MAX_PENDING", "256"))
+        self.turn_timeout = turn_timeout or float(os.getenv("CHAT_TURN_TIMEOUT", "10"))
+        self.executor = ThreadPoolExecutor(max_workers=workers or int(os.getenv("CHAT_WORKERS", "4")),
+                                           thread_name_prefix="chat-turn")
+        # session_id -> [lock, turns holding or waiting for it]
+        self._session_locks = {}
+        self.pending = 0
+        self.stats = {"turns": 0, "rejected": 0, "timeouts": 0, "errors": 0}
+
+    @staticmethod
+    def _turn(session_id: str, user_input: str) -> dict:
+        runner = AgentRunner(session_id)
+        response, trace = runner.process_input(user_input)
+        return {
+            "session_id": session_id,
+            "response": response,
+            "stage": runner.current_stage,
+            "action": trace.get("action"),
+            "trace": trace
+        }
+
+    async def run_turn(self, session_id: str, user_input: str) -> dict:
+        """
+        Run one turn of a session
+
+        Raises:
+            Busy: If max_pending turns are already queued or running
+            asyncio.TimeoutError: If the turn takes longer than turn_timeout
+        """
+        if self.pending >= self.max_pending:
+            self.stats["rejected"] += 1
+            raise Busy()
+        self.pending += 1
+        task = asyncio.ensure_future(self._locked_turn(session_id, user_input))
+        # A timed-out turn keeps counting until its worker finishes
+        task.add_done_callback(self._turn_done)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(task), self.turn_timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        self.stats["turns"] += 1
+        return result
+
+    def _turn_done(self, task: asyncio.Task):
+        self.pending -= 1
+        if not task.cancelled():
+            # Retrieve it, so an error after a timeout is not reported as unhandled
+            task.exception()
+
+    async def _locked_turn(self, session_id: str, user_input: str) -> dict:
+        entry = self._session_locks.get(session_id)
+        if entry is None:
+            entry = self._session_locks[session_id] = [asyncio.Lock(), 0]
+        lock = entry[0]
+        entry[1] += 1
+        try:
+            await lock.acquire()
+        except BaseException:
+            self._unref_lock(session_id)
+            raise
+        future = asyncio.get_running_loop().run_in_executor(self.executor, self._turn, session_id, user_input)
+        # Released when the turn really ends
+        future.add_done_callback(lambda _: self._release_lock(session_id, lock))
+        return await future
+
+    def _release_lock(self, session_id: str, lock: asyncio.Lock):
+        lock.release()
+        self._unref_lock(session_id)
+
+    def _unref_lock(self, session_id: str):
+        entry = self._session_locks[session_id]
+        entry[1] -= 1
+        if not entry[1]:
+            del self._session_locks[session_id]
+
+    async def _in_executor(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def create_session(self, request: web.Request) -> web.Response:
+        runner = AgentRunner()
+        return web.json_response({"session_id": runner.session_id, "stage": runner.current_stage})
+
+    async def post_turn(self, request: web.Request) -> web.Response:
+        try:
+            body = await request.json()
+            user_input = body["input"]
+        except (ValueError, KeyError, TypeError):
+            return web.json_response({"error": 'Expected a JSON body {"input": "..."}'}, status=400)
+        try:
+            result = await self.run_turn(request.match_info["session_id"], str(user_input))
+        except Busy:
+            return web.json_response({"error": "busy"}, status=503, headers={"Retry-After": "1"})
+        except asyncio.TimeoutError:
+            return web.json_response({"error": "timeout"}, status=504)
+        except Exception as e:
+            return web.json_response({"error": "internal", "detail": type(e).__name__}, status=500)
+        return web.json_response(result)
+
+    async def get_session(self, request: web.Request) -> web.Response:
+        runner = await self._in_executor(AgentRunner, request.match_info["session_id"])
+        return web.json_response(dict(runner.get_state(), session_id=runner.session_id))
+
+    async def delete_session(self, request: web.Request) -> web.Response:
+        runner = await self._in_executor(AgentRunner, request.match_info["session_id"])
+        await self._in_executor(runner.close)
+        return web.Response(status=204)
+
+    async def websocket(self, request: web.Request) -> web.WebSocketResponse:
+        session_id = request.match_info["session_id"]
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                continue
+            try:
+                result = await self.run_turn(session_id, message.data)
+            except Busy:
+                result = {"session_id": session_id, "error": "busy"}
+            except asyncio.TimeoutError:
+                result = {"session_id": session_id, "error": "timeout"}
+            except Exception as e:
+                result = {"session_id": session_id, "error": "internal", "detail": type(e).__name__}
+            await ws.send_json(result)
+        return ws
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response(dict(self.stats, pending=self.pending, max_pending=self.max_pending,
+                                      sessions_locked=len(self._session_locks),
+                                      cpu_seconds=time.process_time()))
+
+    async def _shutdown(self, app: web.Application):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def make_app(self) -> web.Application:
+        """Build the aiohttp application"""
+        app = web.Application()
+        app.add_routes([
+            web.post("/sessions", self.create_session),
+            web.post("/sessions/{session_id}/turns", self.post_turn),
+            web.get("/sessions/{session_id}", self.get_session),
+            web.delete("/sessions/{session_id}", self.delete_session),
+            web.get("/sessions/{session_id}/ws", self.websocket),
+            web.get("/health", self.health)
+        ])
+        app.on_cleanup.append(self._shutdown)
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the support agent over HTTP and WebSocket")
+    parser.add_argument("--host", default=os.getenv("CHAT_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("CHAT_PORT", "8080")))
+    parser.add_argument("--max-pending", type=int, default=None)
+    parser.add_argument("--turn-timeout", type=float, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    server = ChatServer(args.max_pending, args.turn_timeout, args.workers)
+    web.run_app(server.make_app(), host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
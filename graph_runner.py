@@ -1,72 +1,45 @@
-"""Graph Runner - Wrapper to invoke the agent cleanly from Streamlit UI"""
+"""Graph Runner - Conversation flow as a shared LangGraph graph, driven per session from the UI"""
 
 import sys
 import os
+import secrets
+import sqlite3
+import zlib
 from io import StringIO
 from contextlib import redirect_stdout
 from dotenv import load_dotenv
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph, START, END
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.unified_agent import UnifiedCustomerSupportAgent
-from knowledge_base import get_customer, get_transactions
+from src.tools import parse_amount
+from src.intent_router import route_intent
+from knowledge_base import (
+    get_customer,
+    get_transactions,
+    find_by_mobile,
+    find_transactions_by_amount,
+    SessionState,
+    NEW_SESSION,
+    SessionStore,
+    get_session_store
+)
 
 # Load environment variables
 load_dotenv()
 
-class AgentRunner:
-    """
-    Wrapper class to run the UnifiedCustomerSupportAgent in a stateful manner
-    suitable for Streamlit's interactive UI
-    """
-    
-    def __init__(self):
-        self.agent = UnifiedCustomerSupportAgent()
-        self.current_stage = "initial"
-        self.selected_option = None
-        self.verification_attempts = 0
-        self.max_verification_attempts = 3
-        self.pending_transaction = None
-        self.general_query = None
-        
-    def get_state(self):
-        """Get current agent state"""
-        return {
-            "customer_id": self.agent.customer_id,
-            "customer_name": self.agent.customer_name,
-            "last_4": self.agent.last_4,
-            "stage": self.current_stage,
-            "verified": self.agent.customer_id is not None
-        }
-    
-    def process_input(self, user_input: str, current_stage: str):
-        """
-        Process user input based on current conversation stage
-        
-        Args:
-            user_input: User's text input
-            current_stage: Current conversation stage
-            
-        Returns:
-            tuple: (response_text, execution_trace)
-        """
-        user_input = user_input.strip()
-        trace = {"action": "process_input", "stage": current_stage, "input": user_input}
-        
-        # Check for termination keywords at any stage (except initial and critical confirmation stages)
-        user_lower = user_input.lower()
-        termination_keywords = ["no thanks", "thanks", "thank you", "no thank you", "that's all", "thats all", "exit", "0"]
-        
-        # Check if user wants to terminate (but not during fraud confirmation where "no" has specific meaning)
-        if current_stage not in ["initial", "fraud_confirmation", "fraud_action"]:
-            if user_lower in termination_keywords or (user_lower == "no" and current_stage not in ["verify_mobile", "verify_card", "fraud_details"]):
-                self.current_stage = "initial"
-                self.selected_option = None
-                self.pending_transaction = None
-                self.general_query = None
-                
-                response = """Thank you for contacting us! 
+# Inputs that end the conversation and return to the main menu
+TERMINATION_KEYWORDS = frozenset({"no thanks", "thanks", "thank you", "no thank you", "that's all", "thats all", "exit", "0"})
+
+# Where "no" is not an answer to a question it also ends the conversation
+TERMINATION_KEYWORDS_WITH_NO = TERMINATION_KEYWORDS | {"no"}
+
+# Main menu options, accepted at the initial stage and to start over
+MENU_OPTIONS = frozenset({"1", "2"})
+
+MAIN_MENU_RESPONSE = """Thank you for contacting us! 
 
 How can I help you today?
 
@@ -75,106 +48,161 @@ Please select an option:
 2. Fraud Transaction (Report suspicious transaction)
 
 Type **1** or **2** to continue."""
-                trace["action"] = "conversation_terminated"
-                return response, trace
+
+MAX_VERIFICATION_ATTEMPTS = 3
+
+
+def ticket_number(key: str) -> int:
+    """Six-digit simulated ticket number, the same in every worker process (unlike hash())"""
+    return zlib.crc32(key.encode()) % 1000000
+
+
+class Stage:
+    """
+    One conversation stage in the transition table
+    
+    Attributes:
+        name: Stage name (AgentRunner.current_stage)
+        handler: Callable (session, user_input, trace) -> (response, trace)
+        inputs: Description of the input the stage expects
+        next_stages: Stages the handler may move to
+        exit_inputs: Lowercased inputs that terminate the conversation instead
+    """
+    
+    def __init__(self, name: str, handler, inputs: str, next_stages: frozenset, exit_inputs: frozenset):
+        self.name = name
+        self.handler = handler
+        self.inputs = inputs
+        self.next_stages = next_stages
+        self.exit_inputs = exit_inputs
+
+
+# Stage registry, filled by @stage on the handlers below
+STAGES = {}
+
+def stage(name: str, inputs: str, next_stages: tuple, exit_inputs: frozenset = TERMINATION_KEYWORDS):
+    """
+    Register a function as the handler for a stage
+    
+    Handlers update the session dict in place (including session["stage"])
+    and return (response, trace); a None response hands the same input on
+    to the initial stage.
+    
+    Args:
+        name: Stage name
+        inputs: Description of the input the stage expects
+        next_stages: Stages the handler may move to
+        exit_inputs: Inputs that terminate the conversation at this stage
+            ("no" is an answer during verification and fraud confirmation)
+    """
+    def register(handler):
+        STAGES[name] = Stage(name, handler, inputs, frozenset(next_stages), frozenset(exit_inputs))
+        return handler
+    return register
+
+
+# Stage: Select option
+@stage("initial",
+       inputs='"1" (general enquiry) or "2" (fraud transaction)',
+       next_stages=("initial", "verify_mobile"),
+       exit_inputs=frozenset())
+def _initial(session: dict, user_input: str, trace: dict):
+    if user_input in MENU_OPTIONS:
+        session["selected_option"] = user_input
+        session["stage"] = "verify_mobile"
         
-        # Stage: Initial - Select option
-        if current_stage == "initial":
-            if user_input in ["1", "2"]:
-                self.selected_option = user_input
-                self.current_stage = "verify_mobile"
-                
-                if user_input == "1":
-                    response = """Sure! I'd be happy to help you with your general enquiry.
+        if user_input == "1":
+            response = """Sure! I'd be happy to help you with your general enquiry.
 
 For security purposes, I need to verify your identity.
 
 Please provide your registered mobile number:"""
-                    trace["action"] = "option_selected"
-                    trace["option"] = "general_enquiry"
-                else:
-                    response = """I understand you received a suspicious transaction SMS. Let me help you with that.
+            trace["action"] = "option_selected"
+            trace["option"] = "general_enquiry"
+        else:
+            response = """I understand you received a suspicious transaction SMS. Let me help you with that.
 
 For security purposes, I need to verify your identity.
 
 Please provide your registered mobile number:"""
-                    trace["action"] = "option_selected"
-                    trace["option"] = "fraud_transaction"
-                
-                return response, trace
-            else:
-                response = "Please select a valid option: Type **1** for General Enquiry or **2** for Fraud Transaction."
-                trace["action"] = "invalid_option"
-                return response, trace
+            trace["action"] = "option_selected"
+            trace["option"] = "fraud_transaction"
         
-        # Stage: Verify Mobile Number
-        elif current_stage == "verify_mobile":
-            mobile_number = user_input.strip()
-            
-            # Check if mobile number exists in database
-            from knowledge_base import CUSTOMER_DB
-            
-            customer_found = None
-            for customer in CUSTOMER_DB.values():
-                if customer["mobile"] == mobile_number:
-                    customer_found = customer
-                    break
-            
-            if customer_found:
-                # Store mobile number temporarily and ask for last 4 digits
-                self.agent.mobile_number = mobile_number
-                self.current_stage = "verify_card"
-                self.verification_attempts = 0
-                
-                response = f"""Thank you! Mobile number verified. ✓
+        return response, trace
+    else:
+        response = "Please select a valid option: Type **1** for General Enquiry or **2** for Fraud Transaction."
+        trace["action"] = "invalid_option"
+        return response, trace
+
+
+# Stage: Verify Mobile Number
+@stage("verify_mobile",
+       inputs="Registered mobile number",
+       next_stages=("verify_mobile", "verify_card", "initial"))
+def _verify_mobile(session: dict, user_input: str, trace: dict):
+    mobile_number = user_input.strip()
+    
+    # Check if mobile number exists in database (indexed lookup)
+    customer_found = find_by_mobile(mobile_number)
+    
+    if customer_found:
+        # Store mobile number temporarily and ask for last 4 digits
+        session["mobile_number"] = mobile_number
+        session["stage"] = "verify_card"
+        session["verification_attempts"] = 0
+        
+        response = f"""Thank you! Mobile number verified. ✓
 
 Now, please provide the last 4 digits of your card:"""
-                trace["action"] = "mobile_verified"
-                trace["mobile_number"] = mobile_number
-                return response, trace
-            else:
-                self.verification_attempts += 1
-                if self.verification_attempts >= self.max_verification_attempts:
-                    response = """Mobile number verification failed. Please contact customer support or try again later.
+        trace["action"] = "mobile_verified"
+        trace["mobile_number"] = mobile_number
+        return response, trace
+    else:
+        session["verification_attempts"] += 1
+        if session["verification_attempts"] >= MAX_VERIFICATION_ATTEMPTS:
+            response = """Mobile number verification failed. Please contact customer support or try again later.
 
 Please select an option:
 1. General Enquiry (Reward points, Statement, Credit limit, etc.)
 2. Fraud Transaction (Report suspicious transaction)
 
 Type **1** or **2** to continue."""
-                    self.current_stage = "initial"
-                    self.verification_attempts = 0
-                    trace["action"] = "mobile_verification_failed_max_attempts"
-                    return response, trace
-                
-                response = f"""Sorry, I couldn't find this mobile number in our records.
+            session["stage"] = "initial"
+            session["verification_attempts"] = 0
+            trace["action"] = "mobile_verification_failed_max_attempts"
+            return response, trace
+        
+        response = f"""Sorry, I couldn't find this mobile number in our records.
 
 Please check and try again.
 
-Attempts remaining: {self.max_verification_attempts - self.verification_attempts}"""
-                trace["action"] = "mobile_not_found"
-                return response, trace
+Attempts remaining: {MAX_VERIFICATION_ATTEMPTS - session['verification_attempts']}"""
+        trace["action"] = "mobile_not_found"
+        return response, trace
+
+
+# Stage: Verify Card Last 4 Digits
+@stage("verify_card",
+       inputs="Last 4 digits of the card",
+       next_stages=("verify_card", "general_enquiry", "fraud_details", "initial"))
+def _verify_card(session: dict, user_input: str, trace: dict):
+    last_4 = user_input.strip()
+    
+    # Verify customer with mobile number and last 4 digits (plain synchronous
+    # reads: this path is sync, so the async accessors would only add an
+    # event loop and thread hops)
+    customer = get_customer(session["mobile_number"], last_4)
+    
+    if customer:
+        session["customer_id"] = customer["customer_id"]
+        session["customer_name"] = customer["name"]
+        session["last_4"] = last_4
+        session["verification_attempts"] = 0
         
-        # Stage: Verify Card Last 4 Digits
-        elif current_stage == "verify_card":
-            last_4 = user_input.strip()
-            
-            # Verify customer with mobile number and last 4 digits
-            customer = get_customer(self.agent.mobile_number, last_4)
-            
-            if customer:
-                self.agent.customer_id = customer["customer_id"]
-                self.agent.customer_name = customer["name"]
-                self.agent.last_4 = last_4
-                self.verification_attempts = 0
-                
-                # Get recent transactions
-                transactions = get_transactions(customer["customer_id"])
-                
-                if self.selected_option == "1":
-                    # General enquiry flow
-                    self.current_stage = "general_enquiry"
-                    response = f"""Thank you, {customer['name']}. Your identity has been verified. ✓
+        if session["selected_option"] == "1":
+            # General enquiry flow
+            session["stage"] = "general_enquiry"
+            response = f"""Thank you, {customer['name']}. Your identity has been verified. ✓
 
 How can I assist you today? You can ask about:
 - Reward points balance
@@ -183,92 +211,98 @@ How can I assist you today? You can ask about:
 - Statement details
 
 Please type your question."""
-                    trace["action"] = "verification_success"
-                    trace["customer_id"] = customer["customer_id"]
-                else:
-                    # Fraud transaction flow
-                    self.current_stage = "fraud_details"
-                    
-                    # Show recent transactions
-                    trans_list = "\n".join([
-                        f"{i+1}. {t['date']} - ${t['amount']:.2f} at {t['merchant']} ({t['status']})"
-                        for i, t in enumerate(transactions[:5])
-                    ])
-                    
-                    response = f"""Thank you, {customer['name']}. Your identity has been verified. ✓
+            trace["action"] = "verification_success"
+            trace["customer_id"] = customer["customer_id"]
+        else:
+            # Fraud transaction flow
+            session["stage"] = "fraud_details"
+            
+            # Show recent transactions
+            transactions = get_transactions(session["customer_id"])
+            trans_list = "\n".join([
+                f"{i+1}. {t['date']} - ${t['amount']:.2f} at {t['merchant']} ({t['status']})"
+                for i, t in enumerate(transactions[:5])
+            ])
+            
+            response = f"""Thank you, {customer['name']}. Your identity has been verified. ✓
 
 Here are your recent transactions:
 {trans_list}
 
 Which transaction would you like to report as suspicious?
 Please provide the transaction number (1-{len(transactions[:5])}) or describe the transaction."""
-                    trace["action"] = "verification_success_fraud"
-                    trace["customer_id"] = customer["customer_id"]
-                    trace["transactions_shown"] = len(transactions[:5])
-                
-                return response, trace
-            else:
-                self.verification_attempts += 1
-                if self.verification_attempts >= self.max_verification_attempts:
-                    response = """Card verification failed. Please contact customer support or try again later.
+            trace["action"] = "verification_success_fraud"
+            trace["customer_id"] = customer["customer_id"]
+            trace["transactions_shown"] = len(transactions[:5])
+        
+        return response, trace
+    else:
+        session["verification_attempts"] += 1
+        if session["verification_attempts"] >= MAX_VERIFICATION_ATTEMPTS:
+            response = """Card verification failed. Please contact customer support or try again later.
 
 Please select an option:
 1. General Enquiry (Reward points, Statement, Credit limit, etc.)
 2. Fraud Transaction (Report suspicious transaction)
 
 Type **1** or **2** to continue."""
-                    self.current_stage = "initial"
-                    self.verification_attempts = 0
-                    self.agent.mobile_number = None
-                    trace["action"] = "card_verification_failed_max_attempts"
-                    return response, trace
-                
-                response = f"""Sorry, the last 4 digits don't match our records for this mobile number.
+            session["stage"] = "initial"
+            session["verification_attempts"] = 0
+            session["mobile_number"] = None
+            trace["action"] = "card_verification_failed_max_attempts"
+            return response, trace
+        
+        response = f"""Sorry, the last 4 digits don't match our records for this mobile number.
 
 Please try again.
 
-Attempts remaining: {self.max_verification_attempts - self.verification_attempts}"""
-                trace["action"] = "card_verification_failed"
-                return response, trace
+Attempts remaining: {MAX_VERIFICATION_ATTEMPTS - session['verification_attempts']}"""
+        trace["action"] = "card_verification_failed"
+        return response, trace
+
+
+# Stage: General Enquiry
+@stage("general_enquiry",
+       inputs='Free-text question, or "1"/"2" to start over',
+       next_stages=("general_enquiry", "fraud_confirmation", "verify_mobile", "initial"),
+       exit_inputs=TERMINATION_KEYWORDS_WITH_NO)
+def _general_enquiry(session: dict, user_input: str, trace: dict):
+    # Check if user wants to start a new query with option 1 or 2
+    if user_input in MENU_OPTIONS:
+        # Reset and start new conversation
+        session["stage"] = "initial"
+        session["selected_option"] = None
+        session["pending_transaction"] = None
+        session["general_query"] = None
+        session["fraud_check_done"] = False
+        # Don't reset customer verification
         
-        # Stage: General Enquiry
-        elif current_stage == "general_enquiry":
-            # Check if user wants to start a new query with option 1 or 2
-            if user_input in ["1", "2"]:
-                # Reset and start new conversation
-                self.current_stage = "initial"
-                self.selected_option = None
-                self.pending_transaction = None
-                self.general_query = None
-                if hasattr(self, 'fraud_check_done'):
-                    delattr(self, 'fraud_check_done')
-                # Don't reset customer verification
-                
-                return self.process_input(user_input, "initial")
-            
-            # PROACTIVE FRAUD DETECTION - Check for suspicious transactions first
-            from knowledge_base.transactions import get_suspicious_transactions
-            
-            suspicious_txns = get_suspicious_transactions(self.agent.customer_id)
-            
-            if suspicious_txns and not hasattr(self, 'fraud_check_done'):
-                # Found suspicious transaction - proactively alert customer
-                self.fraud_check_done = True
-                high_risk_txn = suspicious_txns[0]
-                self.pending_transaction = high_risk_txn
-                self.general_query = user_input  # Store original query
-                self.current_stage = "fraud_confirmation"
-                
-                # Calm, specific alert
-                location_info = ""
-                if "international" in high_risk_txn.get('location', '').lower():
-                    location_info = f" at an overseas merchant ({high_risk_txn.get('location', '')})"
-                
-                time_info = ""
-                if high_risk_txn.get('transaction_time'):
-                    time_info = f" during {high_risk_txn['transaction_time']}"
-                
-                response = f"""Before I help you with that, I'd like to quickly confirm a recent transaction for your safety.
+        # The graph hands the input on to the initial stage
+        return None, trace
+    
+    # PROACTIVE FRAUD DETECTION - Check for suspicious transactions first
+    from knowledge_base.transactions import get_suspicious_transactions
+    
+    suspicious_txns = get_suspicious_transactions(session["customer_id"])
+    
+    if suspicious_txns and not session["fraud_check_done"]:
+        # Found suspicious transaction - proactively alert customer
+        session["fraud_check_done"] = True
+        high_risk_txn = suspicious_txns[0]
+        session["pending_transaction"] = dict(high_risk_txn)
+        session["general_query"] = user_input  # Store original query
+        session["stage"] = "fraud_confirmation"
+        
+        # Calm, specific alert
+        location_info = ""
+        if "international" in high_risk_txn.get('location', '').lower():
+            location_info = f" at an overseas merchant ({high_risk_txn.get('location', '')})"
+        
+        time_info = ""
+        if high_risk_txn.get('transaction_time'):
+            time_info = f" during {high_risk_txn['transaction_time']}"
+        
+        response = f"""Before I help you with that, I'd like to quickly confirm a recent transaction for your safety.
 
 **Transaction Alert:**
 - Amount: ₹{high_risk_txn['amount']:.2f}
@@ -280,22 +314,22 @@ Attempts remaining: {self.max_verification_attempts - self.verification_attempts
 Was this transaction authorized by you?
 - Type **YES** if you authorized it
 - Type **NO** if you did not authorize it"""
-                trace["action"] = "proactive_fraud_alert"
-                trace["transaction_amount"] = high_risk_txn['amount']
-                return response, trace
-            
-            # No suspicious transactions or already checked - process general query
-            self.general_query = user_input
-            
-            # Simple keyword-based responses (can be enhanced with LLM)
-            user_lower = user_input.lower()
-            
-            if "reward" in user_lower or "point" in user_lower:
-                # Get actual customer data
-                customer = get_customer(self.agent.mobile_number, self.agent.last_4)
-                if customer and "reward_points" in customer:
-                    rewards = customer["reward_points"]
-                    response = f"""Your current reward points balance is: **{rewards['total_points']:,} points**
+        trace["action"] = "proactive_fraud_alert"
+        trace["transaction_amount"] = high_risk_txn['amount']
+        return response, trace
+    
+    # No suspicious transactions or already checked - process general query
+    session["general_query"] = user_input
+    
+    # Keyword intent routing (can be enhanced with LLM)
+    intent = route_intent(user_input)
+    
+    if intent == "reward_points":
+        # Get actual customer data
+        customer = get_customer(session["mobile_number"], session["last_4"])
+        if customer and "reward_points" in customer:
+            rewards = customer["reward_points"]
+            response = f"""Your current reward points balance is: **{rewards['total_points']:,} points**
 
 **Reward Details:**
 - Cashback Value: ₹{rewards['cashback_value']:.2f}
@@ -306,8 +340,8 @@ Was this transaction authorized by you?
 
 Is there anything else I can help you with?
 Type **1** or **2** to start a new query, or **thanks/0/exit** to go to main menu."""
-                else:
-                    response = f"""Your current reward points balance is: **5,240 points**
+        else:
+            response = f"""Your current reward points balance is: **5,240 points**
 
 You can redeem these points for:
 - Shopping vouchers
@@ -317,10 +351,10 @@ You can redeem these points for:
 
 Is there anything else I can help you with?
 Type **1** or **2** to start a new query, or **thanks/0/exit** to go to main menu."""
-                trace["action"] = "reward_points_query"
-            
-            elif "credit limit" in user_lower or "limit" in user_lower:
-                response = f"""Your credit card details:
+        trace["action"] = "reward_points_query"
+    
+    elif intent == "credit_limit":
+        response = f"""Your credit card details:
 - **Credit Limit**: $10,000
 - **Available Credit**: $7,350
 - **Used Credit**: $2,650
@@ -329,15 +363,15 @@ Your credit utilization is at 26.5%, which is healthy!
 
 Is there anything else I can help you with?
 Type **1** or **2** to start a new query, or **thanks/0/exit** to go to main menu."""
-                trace["action"] = "credit_limit_query"
-            
-            elif "statement" in user_lower or "bill" in user_lower:
-                transactions = get_transactions(self.agent.customer_id)
-                trans_list = "\n".join([
-                    f"- {t['date']} - ${t['amount']:.2f} at {t['merchant']} ({t['status']})"
-                    for t in transactions[:10]
-                ])
-                response = f"""**Statement Summary:**
+        trace["action"] = "credit_limit_query"
+    
+    elif intent == "statement":
+        transactions = get_transactions(session["customer_id"])
+        trans_list = "\n".join([
+            f"- {t['date']} - ${t['amount']:.2f} at {t['merchant']} ({t['status']})"
+            for t in transactions[:10]
+        ])
+        response = f"""**Statement Summary:**
 - Statement Date: February 5, 2026
 - Statement Period: January 6, 2026 - February 5, 2026
 - Total Amount Due: $2,650.00
@@ -350,10 +384,10 @@ Type **1** or **2** to start a new query, or **thanks/0/exit** to go to main men
 
 Is there anything else I can help you with?
 Type **1** or **2** to start a new query, or **thanks/0/exit** to go to main menu."""
-                trace["action"] = "statement_query"
-            
-            elif "due" in user_lower or "payment" in user_lower:
-                response = f"""**Payment Information:**
+        trace["action"] = "statement_query"
+    
+    elif intent == "payment_due":
+        response = f"""**Payment Information:**
 - Payment Due Date: March 15, 2026
 - Total Amount Due: $2,650.00
 - Minimum Amount Due: $132.50
@@ -368,24 +402,48 @@ Type **1** or **2** to start a new query, or **thanks/0/exit** to go to main men
 
 Is there anything else I can help you with?
 Type **1** or **2** to start a new query, or **thanks/0/exit** to go to main menu."""
-                trace["action"] = "payment_due_query"
-            
-            elif "transaction" in user_lower or "history" in user_lower:
-                transactions = get_transactions(self.agent.customer_id)
-                trans_list = "\n".join([
-                    f"- {t['date']} - ${t['amount']:.2f} at {t['merchant']}"
-                    for t in transactions[:5]
-                ])
-                response = f"""Here are your recent transactions:
+        trace["action"] = "payment_due_query"
+    
+    elif intent == "card_details":
+        response = f"""Your card details:
+- **Card Type**: Platinum Credit Card
+- **Card Number**: XXXX XXXX XXXX {session['last_4']}
+- **Expiry Date**: 12/2028
+- **Card Status**: Active
+- **Annual Fee**: $250 (waived for this year)
+
+Is there anything else I can help you with?
+Type **1** or **2** to start a new query, or **thanks/0/exit** to go to main menu."""
+        trace["action"] = "card_details_query"
+    
+    elif intent == "transaction_history":
+        transactions = get_transactions(session["customer_id"])
+        trans_list = "\n".join([
+            f"- {t['date']} - ${t['amount']:.2f} at {t['merchant']}"
+            for t in transactions[:5]
+        ])
+        response = f"""Here are your recent transactions:
 
 {trans_list}
 
 Is there anything else I can help you with?
 Type **1** or **2** to start a new query, or **thanks/0/exit** to go to main menu."""
-                trace["action"] = "transaction_query"
-            
-            else:
-                response = f"""I understand you're asking about: "{user_input}"
+        trace["action"] = "transaction_query"
+    
+    elif intent == "interest_rates":
+        response = """**Interest Rates and Charges:**
+- Purchase APR: 3.5% per month (42% annually)
+- Cash Advance APR: 3.75% per month
+- Late Payment Fee: $50
+- Over Limit Fee: $50
+- Foreign Transaction Fee: 3.5% of transaction amount
+
+Is there anything else I can help you with?
+Type **1** or **2** to start a new query, or **thanks/0/exit** to go to main menu."""
+        trace["action"] = "interest_rate_query"
+    
+    else:
+        response = f"""I understand you're asking about: "{user_input}"
 
 I'm here to help! Could you please be more specific? You can ask about:
 - Reward points
@@ -393,32 +451,38 @@ I'm here to help! Could you please be more specific? You can ask about:
 - Recent transactions
 - Statement details
 - Payment due dates
+- Card details
+- Interest rates and charges
 
 Or feel free to rephrase your question.
 
 Is there anything else I can help you with?
 Type **1** or **2** to start a new query, or **thanks/0/exit** to go to main menu."""
-                trace["action"] = "general_query_clarification"
-            
-            return response, trace
-        
-        # Stage: Fraud Details
-        elif current_stage == "fraud_details":
-            # Parse transaction selection
-            user_lower = user_input.lower()
-            
-            # Get transactions
-            transactions = get_transactions(self.agent.customer_id)
+        trace["action"] = "general_query_clarification"
+    
+    return response, trace
+
+
+# Stage: Fraud Details
+@stage("fraud_details",
+       inputs="Transaction number (1-5), merchant name or amount",
+       next_stages=("fraud_details", "fraud_confirmation"))
+def _fraud_details(session: dict, user_input: str, trace: dict):
+    # Parse transaction selection
+    user_lower = user_input.lower()
+    
+    # Get transactions
+    transactions = get_transactions(session["customer_id"])
+    
+    # Try to parse transaction number
+    try:
+        trans_num = int(user_input.strip()) - 1
+        if 0 <= trans_num < len(transactions[:5]):
+            session["pending_transaction"] = dict(transactions[trans_num])
+            session["stage"] = "fraud_confirmation"
             
-            # Try to parse transaction number
-            try:
-                trans_num = int(user_input.strip()) - 1
-                if 0 <= trans_num < len(transactions[:5]):
-                    self.pending_transaction = transactions[trans_num]
-                    self.current_stage = "fraud_confirmation"
-                    
-                    trans = self.pending_transaction
-                    response = f"""You've selected:
+            trans = session["pending_transaction"]
+            response = f"""You've selected:
 **Transaction Details:**
 - Date: {trans['date']}
 - Amount: ${trans['amount']:.2f}
@@ -428,26 +492,33 @@ Type **1** or **2** to start a new query, or **thanks/0/exit** to go to main men
 Did you authorize this transaction?
 - Type **YES** if you authorized it
 - Type **NO** if you did not authorize it"""
-                    trace["action"] = "transaction_selected"
-                    trace["transaction_id"] = trans.get("transaction_id", "unknown")
-                    return response, trace
-                else:
-                    response = f"Please select a valid transaction number (1-{len(transactions[:5])})."
-                    trace["action"] = "invalid_transaction_number"
-                    return response, trace
-            except ValueError:
-                # Try keyword matching
-                matching_trans = None
-                for trans in transactions[:5]:
-                    if user_lower in trans['merchant'].lower() or str(trans['amount']) in user_input:
-                        matching_trans = trans
-                        break
-                
-                if matching_trans:
-                    self.pending_transaction = matching_trans
-                    self.current_stage = "fraud_confirmation"
-                    
-                    response = f"""You've selected:
+            trace["action"] = "transaction_selected"
+            trace["transaction_id"] = trans.get("transaction_id", "unknown")
+            return response, trace
+        else:
+            response = f"Please select a valid transaction number (1-{len(transactions[:5])})."
+            trace["action"] = "invalid_transaction_number"
+            return response, trace
+    except ValueError:
+        # Try merchant keyword matching on the listed transactions
+        matching_trans = None
+        for trans in transactions[:5]:
+            if user_lower in trans['merchant'].lower():
+                matching_trans = trans
+                break
+        
+        # Fall back to the amount index over the full history
+        if not matching_trans:
+            amount = parse_amount(user_input)
+            if amount is not None:
+                matches = find_transactions_by_amount(session["customer_id"], amount)
+                matching_trans = matches[0] if matches else None
+        
+        if matching_trans:
+            session["pending_transaction"] = dict(matching_trans)
+            session["stage"] = "fraud_confirmation"
+            
+            response = f"""You've selected:
 **Transaction Details:**
 - Date: {matching_trans['date']}
 - Amount: ${matching_trans['amount']:.2f}
@@ -457,24 +528,29 @@ Did you authorize this transaction?
 Did you authorize this transaction?
 - Type **YES** if you authorized it
 - Type **NO** if you did not authorize it"""
-                    trace["action"] = "transaction_matched"
-                    trace["transaction_id"] = matching_trans.get("transaction_id", "unknown")
-                    return response, trace
-                else:
-                    response = "I couldn't identify the transaction. Please provide the transaction number (1-5) from the list above."
-                    trace["action"] = "transaction_not_found"
-                    return response, trace
+            trace["action"] = "transaction_matched"
+            trace["transaction_id"] = matching_trans.get("transaction_id", "unknown")
+            return response, trace
+        else:
+            response = "I couldn't identify the transaction. Please provide the transaction number (1-5) from the list above."
+            trace["action"] = "transaction_not_found"
+            return response, trace
+
+
+# Stage: Fraud Confirmation
+@stage("fraud_confirmation",
+       inputs="YES (authorized) or NO (not authorized)",
+       next_stages=("fraud_confirmation", "fraud_action", "general_enquiry", "completed"),
+       exit_inputs=frozenset())
+def _fraud_confirmation(session: dict, user_input: str, trace: dict):
+    user_lower = user_input.lower()
+    
+    if "no" in user_lower:
+        # Unauthorized transaction - block card and raise dispute
+        session["stage"] = "fraud_action"
         
-        # Stage: Fraud Confirmation
-        elif current_stage == "fraud_confirmation":
-            user_lower = user_input.lower()
-            
-            if "no" in user_lower:
-                # Unauthorized transaction - block card and raise dispute
-                self.current_stage = "fraud_action"
-                
-                trans = self.pending_transaction
-                response = f"""I understand this is concerning. For your security, I will:
+        trans = session["pending_transaction"]
+        response = f"""I understand this is concerning. For your security, I will:
 
 1. **Block your card** immediately to prevent further unauthorized transactions
 2. **Raise a dispute** for the transaction of ₹{trans['amount']:.2f}
@@ -484,32 +560,30 @@ A new card will be issued and sent to your registered address within 5-7 busines
 Should I proceed with these actions?
 - Type **YES** to proceed
 - Type **NO** to cancel"""
-                trace["action"] = "fraud_confirmed"
-                trace["transaction_amount"] = trans['amount']
-                return response, trace
+        trace["action"] = "fraud_confirmed"
+        trace["transaction_amount"] = trans['amount']
+        return response, trace
+    
+    elif "yes" in user_lower:
+        # Authorized transaction - return to general enquiry if that's where we came from
+        if session["general_query"]:
+            # Process the original general query now
+            original_query = session["general_query"]
+            session["general_query"] = None
+            session["pending_transaction"] = None
+            session["stage"] = "general_enquiry"
             
-            elif "yes" in user_lower:
-                # Authorized transaction - return to general enquiry if that's where we came from
-                if hasattr(self, 'general_query') and self.general_query:
-                    # Process the original general query now
-                    original_query = self.general_query
-                    self.general_query = None
-                    self.pending_transaction = None
-                    self.current_stage = "general_enquiry"
-                    
-                    response = f"""Thank you for confirming. Your transaction is legitimate.
+            response = f"""Thank you for confirming. Your transaction is legitimate.
 
 Now, regarding your query about "{original_query}"...
 
 """
-                    # Add the answer to the original query
-                    query_lower = original_query.lower()
-                    
-                    if "reward" in query_lower or "point" in query_lower:
-                        customer = get_customer(self.agent.mobile_number, self.agent.last_4)
-                        if customer and "reward_points" in customer:
-                            rewards = customer["reward_points"]
-                            response += f"""Your current reward points balance is: **{rewards['total_points']:,} points**
+            # Add the answer to the original query
+            if route_intent(original_query) == "reward_points":
+                customer = get_customer(session["mobile_number"], session["last_4"])
+                if customer and "reward_points" in customer:
+                    rewards = customer["reward_points"]
+                    response += f"""Your current reward points balance is: **{rewards['total_points']:,} points**
 
 **Reward Details:**
 - Cashback Value: ₹{rewards['cashback_value']:.2f}
@@ -520,8 +594,8 @@ Now, regarding your query about "{original_query}"...
 
 Is there anything else I can help you with?
 Type **1** or **2** to start a new query, or **thanks/0/exit** to go to main menu."""
-                        else:
-                            response += f"""Your current reward points balance is: **5,240 points**
+                else:
+                    response += f"""Your current reward points balance is: **5,240 points**
 
 You can redeem these points for:
 - Shopping vouchers
@@ -531,47 +605,52 @@ You can redeem these points for:
 
 Is there anything else I can help you with?
 Type **1** or **2** to start a new query, or **thanks/0/exit** to go to main menu."""
-                    else:
-                        response += """How else can I assist you today?
+            else:
+                response += """How else can I assist you today?
 Type **1** or **2** to start a new query, or **thanks/0/exit** to go to main menu."""
-                    
-                    trace["action"] = "transaction_authorized_return_to_query"
-                    return response, trace
-                else:
-                    # Direct fraud flow - no action needed
-                    self.current_stage = "completed"
-                    response = f"""Thank you for confirming. Since you authorized this transaction, no action is needed.
+            
+            trace["action"] = "transaction_authorized_return_to_query"
+            return response, trace
+        else:
+            # Direct fraud flow - no action needed
+            session["stage"] = "completed"
+            response = f"""Thank you for confirming. Since you authorized this transaction, no action is needed.
 
 If you have any other concerns, please let me know!
 
 Type **1** or **2** to start a new query."""
-                    trace["action"] = "transaction_authorized"
-                    return response, trace
-            else:
-                response = "Please respond with **YES** or **NO**."
-                trace["action"] = "invalid_confirmation"
-                return response, trace
+            trace["action"] = "transaction_authorized"
+            return response, trace
+    else:
+        response = "Please respond with **YES** or **NO**."
+        trace["action"] = "invalid_confirmation"
+        return response, trace
+
+
+# Stage: Fraud Action
+@stage("fraud_action",
+       inputs="YES (block card and raise dispute) or NO (cancel)",
+       next_stages=("fraud_action", "completed"),
+       exit_inputs=frozenset())
+def _fraud_action(session: dict, user_input: str, trace: dict):
+    user_lower = user_input.lower()
+    
+    if "yes" in user_lower:
+        # Execute fraud actions
+        trans = session["pending_transaction"]
         
-        # Stage: Fraud Action
-        elif current_stage == "fraud_action":
-            user_lower = user_input.lower()
-            
-            if "yes" in user_lower:
-                # Execute fraud actions
-                trans = self.pending_transaction
-                
-                # Simulate blocking card
-                block_ticket = f"BLK{hash(self.agent.customer_id) % 1000000:06d}"
-                
-                # Simulate raising dispute
-                dispute_ticket = f"CCB{hash(trans.get('transaction_id', 'unknown')) % 1000000:06d}"
-                
-                self.current_stage = "completed"
-                response = f"""✓ Actions completed successfully!
+        # Simulate blocking card
+        block_ticket = f"BLK{ticket_number(session['customer_id']):06d}"
+        
+        # Simulate raising dispute
+        dispute_ticket = f"CCB{ticket_number(trans.get('transaction_id', 'unknown')):06d}"
+        
+        session["stage"] = "completed"
+        response = f"""✓ Actions completed successfully!
 
 **Card Blocked:**
 - Ticket ID: {block_ticket}
-- Your card ending in {self.agent.last_4} has been blocked
+- Your card ending in {session['last_4']} has been blocked
 
 **Dispute Raised:**
 - Ticket ID: {dispute_ticket}
@@ -585,44 +664,250 @@ Type **1** or **2** to start a new query."""
 
 Is there anything else I can help you with?
 Type **1** or **2** to start a new query, or **thanks/0/exit** to go to main menu."""
-                trace["action"] = "fraud_actions_completed"
-                trace["block_ticket"] = block_ticket
-                trace["dispute_ticket"] = dispute_ticket
-                return response, trace
-            
-            elif "no" in user_lower:
-                self.current_stage = "completed"
-                response = f"""Understood. No action has been taken.
+        trace["action"] = "fraud_actions_completed"
+        trace["block_ticket"] = block_ticket
+        trace["dispute_ticket"] = dispute_ticket
+        return response, trace
+    
+    elif "no" in user_lower:
+        session["stage"] = "completed"
+        response = f"""Understood. No action has been taken.
 
 If you change your mind or need assistance, please let me know!
 
 Type **1** or **2** to start a new query."""
-                trace["action"] = "fraud_actions_cancelled"
-                return response, trace
-            else:
-                response = "Please respond with **YES** or **NO**."
-                trace["action"] = "invalid_action_confirmation"
-                return response, trace
+        trace["action"] = "fraud_actions_cancelled"
+        return response, trace
+    else:
+        response = "Please respond with **YES** or **NO**."
+        trace["action"] = "invalid_action_confirmation"
+        return response, trace
+
+
+# Stage: Completed
+@stage("completed",
+       inputs='"1" or "2" to start a new query',
+       next_stages=("completed", "verify_mobile", "initial"),
+       exit_inputs=TERMINATION_KEYWORDS_WITH_NO)
+def _completed(session: dict, user_input: str, trace: dict):
+    if user_input in MENU_OPTIONS:
+        # Reset and start new conversation
+        session["stage"] = "initial"
+        session["selected_option"] = None
+        session["pending_transaction"] = None
+        session["general_query"] = None
+        # Don't reset customer verification
         
-        # Stage: Completed
-        elif current_stage == "completed":
-            if user_input in ["1", "2"]:
-                # Reset and start new conversation
-                self.current_stage = "initial"
-                self.selected_option = None
-                self.pending_transaction = None
-                self.general_query = None
-                # Don't reset customer verification
-                
-                return self.process_input(user_input, "initial")
-            else:
-                response = "Please type **1** for General Enquiry or **2** for Fraud Transaction to start a new query."
-                trace["action"] = "awaiting_new_query"
-                return response, trace
+        # The graph hands the input on to the initial stage
+        return None, trace
+    else:
+        response = "Please type **1** for General Enquiry or **2** for Fraud Transaction to start a new query."
+        trace["action"] = "awaiting_new_query"
+        return response, trace
+
+
+def _terminate(session: dict, user_input: str, trace: dict):
+    """Reset the conversation and show the main menu"""
+    session["stage"] = "initial"
+    session["selected_option"] = None
+    session["pending_transaction"] = None
+    session["general_query"] = None
+    trace["action"] = "conversation_terminated"
+    return MAIN_MENU_RESPONSE, trace
+
+
+def _unknown_stage(session: dict, user_input: str, trace: dict):
+    """Default fallback for a stage with no handler"""
+    response = "I'm sorry, something went wrong. Please start over by typing **1** or **2**."
+    session["stage"] = "initial"
+    trace["action"] = "error_fallback"
+    return response, trace
+
+
+def _node(handler):
+    """Wrap a stage handler as a graph node: session state in, state update out"""
+    def run(state: SessionState) -> dict:
+        session = dict(NEW_SESSION, **state)
+        user_input = session["user_input"]
+        trace = {"action": "process_input", "stage": session["stage"], "input": user_input}
+        session["response"], session["trace"] = handler(session, user_input, trace)
+        # Write back only what changed; every written key is a channel update
+        return {key: value for key, value in session.items() if key not in state or state[key] is not value}
+    return run
+
+
+def route_turn(state: SessionState) -> str:
+    """Pick the node for this turn: the stage handler, or terminate on an exit input"""
+    stage_name = state.get("stage", "initial")
+    spec = STAGES.get(stage_name)
+    exit_inputs = spec.exit_inputs if spec else TERMINATION_KEYWORDS_WITH_NO
+    if state["user_input"].lower() in exit_inputs:
+        return "terminate"
+    return stage_name if spec else "unknown_stage"
+
+
+def _after_stage(state: SessionState) -> str:
+    return END if state["response"] is not None else "initial"
+
+
+def build_graph(checkpointer=None):
+    """
+    Compile the conversation flow
+    
+    One invocation is one turn: START routes on the session's stage to
+    that stage's node, which answers and records the next stage. A stage
+    that hands the input on (starting over with "1"/"2") continues to the
+    initial node in the same turn.
+    
+    Args:
+        checkpointer: Optional LangGraph checkpointer holding per-session
+            state (thread_id = session id); without one, AgentRunner passes
+            the state in and out through a SessionStore
+    
+    Returns:
+        Compiled graph
+    """
+    graph = StateGraph(SessionState)
+    for name, spec in STAGES.items():
+        graph.add_node(name, _node(spec.handler))
+        graph.add_conditional_edges(name, _after_stage, ["initial", END])
+    graph.add_node("terminate", _node(_terminate))
+    graph.add_node("unknown_stage", _node(_unknown_stage))
+    graph.add_conditional_edges(START, route_turn, [*STAGES, "terminate", "unknown_stage"])
+    graph.add_edge("terminate", END)
+    graph.add_edge("unknown_stage", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def make_checkpointer(kind: str = None, path: str = None):
+    """
+    Create a LangGraph checkpointer for sessions (instead of a SessionStore)
+    
+    Args:
+        kind: "memory" or "sqlite"; SESSION_CHECKPOINTER env var if not given
+        path: SQLite database file; SESSION_DB_PATH env var, then "sessions.db"
+    
+    Returns:
+        MemorySaver or SqliteSaver
+    """
+    kind = kind or os.getenv("SESSION_CHECKPOINTER", "memory")
+    if kind == "memory":
+        return MemorySaver()
+    if kind == "sqlite":
+        from langgraph.checkpoint.sqlite import SqliteSaver
+        path = path or os.getenv("SESSION_DB_PATH", "sessions.db")
+        return SqliteSaver(sqlite3.connect(path, check_same_thread=False))
+    raise ValueError(f"Unknown checkpointer: {kind!r} (expected 'memory' or 'sqlite')")
+
+
+# Conversation graph, compiled once per process and shared by every session.
+# Session state lives in the session store unless SESSION_CHECKPOINTER
+# selects a LangGraph checkpointer.
+conversation_graph = build_graph(make_checkpointer() if os.getenv("SESSION_CHECKPOINTER") else None)
+
+
+class SessionAgent:
+    """Read-only view of the customer fields in a session's state"""
+    
+    def __init__(self, state: dict):
+        self._state = state
+    
+    @property
+    def customer_id(self):
+        return self._state["customer_id"]
+    
+    @property
+    def customer_name(self):
+        return self._state["customer_name"]
+    
+    @property
+    def last_4(self):
+        return self._state["last_4"]
+    
+    @property
+    def mobile_number(self):
+        return self._state["mobile_number"]
+
+
+class AgentRunner:
+    """
+    Handle on one conversation session in the shared conversation graph
+    suitable for Streamlit's interactive UI
+    
+    Creating a runner only allocates the session's state dict. The state
+    itself lives in a SessionStore (or the graph's checkpointer) under
+    session_id and is re-read every turn, so any runner - in any worker
+    sharing the store - can take the next turn of a session.
+    """
+    
+    def __init__(self, session_id: str = None, graph=None, store: SessionStore = None):
+        """
+        Args:
+            session_id: Existing session to resume; a new one when omitted
+            graph: Compiled conversation graph (defaults to conversation_graph)
+            store: Session store (defaults to get_session_store()); unused when
+                the graph has a checkpointer
+        """
+        self.graph = graph or conversation_graph
+        self.store = store or get_session_store()
+        self.session_id = session_id or secrets.token_hex(16)
+        self.config = {"configurable": {"thread_id": self.session_id}}
+        self.state = dict(NEW_SESSION)
+        if session_id is not None:
+            self.state.update(self._load() or {})
+    
+    def _load(self) -> dict:
+        if self.graph.checkpointer:
+            return self.graph.get_state(self.config).values
+        return self.store.get(self.session_id)
+    
+    @property
+    def current_stage(self) -> str:
+        return self.state["stage"]
+    
+    @property
+    def agent(self) -> SessionAgent:
+        """Verified customer fields (customer_id is None until verified)"""
+        return SessionAgent(self.state)
+    
+    def get_state(self):
+        """Get current agent state"""
+        return {
+            "customer_id": self.state["customer_id"],
+            "customer_name": self.state["customer_name"],
+            "last_4": self.state["last_4"],
+            "stage": self.state["stage"],
+            "verified": self.state["customer_id"] is not None
+        }
+    
+    def process_input(self, user_input: str, current_stage: str = None):
+        """
+        Process user input based on current conversation stage
+        
+        Runs one turn of the conversation graph for this session.
         
-        # Default fallback
+        Args:
+            user_input: User's text input
+            current_stage: Current conversation stage (defaults to the session's stored stage)
+            
+        Returns:
+            tuple: (response_text, execution_trace)
+        """
+        turn = {"user_input": user_input.strip()}
+        if current_stage is not None:
+            turn["stage"] = current_stage
+        if self.graph.checkpointer:
+            self.state = self.graph.invoke(turn, self.config, durability="exit")
         else:
-            response = "I'm sorry, something went wrong. Please start over by typing **1** or **2**."
-            self.current_stage = "initial"
-            trace["action"] = "error_fallback"
-            return response, trace
+            state = self.store.get(self.session_id) or dict(NEW_SESSION)
+            state.update(turn)
+            self.state = self.graph.invoke(state)
+            self.store.put(self.session_id, self.state)
+        return self.state["response"], self.state["trace"]
+    
+    def close(self):
+        """Delete this session's state"""
+        if self.graph.checkpointer:
+            self.graph.checkpointer.delete_thread(self.session_id)
+        else:
+            self.store.delete(self.session_id)
@@ -1,7 +1,25 @@
 """Knowledge Base - Customer and Transaction Data with RAG"""
 
-from .customers import CUSTOMER_DB, get_customer, list_all_customers
-from .transactions import TRANSACTIONS_DB, get_transactions, get_transaction_by_id, get_suspicious_transactions
+from .customers import CUSTOMER_DB, CustomerStore, customer_store, get_customer, find_by_mobile, list_all_customers
+from .transactions import (
+    TRANSACTIONS_DB,
+    get_transactions,
+    get_transaction_by_id,
+    get_suspicious_transactions,
+    get_unusual_transactions,
+    find_transactions_by_amount,
+    add_transaction,
+    update_fraud_score,
+    subscribe_suspicious,
+    suspicious_view,
+    create_transaction_store,
+    get_transaction_store,
+    set_transaction_store
+)
+from .transaction_store import TransactionStore, InMemoryTransactionStore, SQLiteTransactionStore
+from .suspicious_view import SuspiciousView
+from .records import TransactionRecord
+from .risk import RISK_FACTORS, risk_factors, is_suspicious, is_unusual, FLAG_SUSPICIOUS, FLAG_UNUSUAL, risk_flags
 from .policies import (
     TRANSACTION_LIFECYCLE,
     FRAUD_POLICIES,
@@ -11,20 +29,79 @@ from .policies import (
     SMS_FORMATS,
     FRAUD_SLA,
     ESCALATION_RULES,
-    get_policy
+    POLICY_SECTIONS,
+    POLICY_TYPES,
+    get_policy,
+    flatten_policies
+)
+from .policy_store import PolicySnapshot, PolicyStore, policy_store, current_policies, reload_policies
+from .rag_retriever import KnowledgeBaseRAG, SECTION_TERMS, rag
+from .retrieval import TermIndex, BM25Index, tokenize, analyze, query_terms
+from .vector_index import VectorIndex, HashingEmbedding
+from .corpus import MarkdownCorpus, chunk_markdown
+from .context_packer import ContextPacker, PackedContext, estimate_tokens
+from .sms import SMSTemplate, SMS_TEMPLATES, compile_sms_templates, get_sms_template, render_bulk
+from .cache import TTLCache, customer_cache, transaction_cache, invalidate_customer, cache_stats
+from .connection_pool import ConnectionPool, PoolTimeout
+from .session_store import (
+    SessionState,
+    NEW_SESSION,
+    SESSION_FIELDS,
+    encode_session,
+    decode_session,
+    SessionStore,
+    InMemorySessionStore,
+    SQLiteSessionStore,
+    create_session_store,
+    get_session_store,
+    set_session_store
+)
+from .async_access import (
+    AsyncDataAccess,
+    async_data,
+    run_sync,
+    aget_customer,
+    aget_transactions,
+    aget_transaction_by_id,
+    aget_suspicious_transactions,
+    fetch_customer_context
 )
-from .rag_retriever import KnowledgeBaseRAG, rag
 
 __all__ = [
     # Customer data
     'CUSTOMER_DB',
+    'CustomerStore',
+    'customer_store',
     'get_customer',
+    'find_by_mobile',
     'list_all_customers',
     # Transaction data
     'TRANSACTIONS_DB',
     'get_transactions',
     'get_transaction_by_id',
     'get_suspicious_transactions',
+    'get_unusual_transactions',
+    'find_transactions_by_amount',
+    'add_transaction',
+    'update_fraud_score',
+    'subscribe_suspicious',
+    'suspicious_view',
+    'SuspiciousView',
+    'create_transaction_store',
+    'get_transaction_store',
+    'set_transaction_store',
+    'TransactionStore',
+    'InMemoryTransactionStore',
+    'SQLiteTransactionStore',
+    'TransactionRecord',
+    # Risk rules
+    'RISK_FACTORS',
+    'risk_factors',
+    'is_suspicious',
+    'is_unusual',
+    'FLAG_SUSPICIOUS',
+    'FLAG_UNUSUAL',
+    'risk_flags',
     # Policies
     'TRANSACTION_LIFECYCLE',
     'FRAUD_POLICIES',
@@ -34,8 +111,64 @@ __all__ = [
     'SMS_FORMATS',
     'FRAUD_SLA',
     'ESCALATION_RULES',
+    'POLICY_SECTIONS',
+    'POLICY_TYPES',
     'get_policy',
+    'flatten_policies',
+    'PolicySnapshot',
+    'PolicyStore',
+    'policy_store',
+    'current_policies',
+    'reload_policies',
     # RAG
     'KnowledgeBaseRAG',
-    'rag'
+    'SECTION_TERMS',
+    'rag',
+    'TermIndex',
+    'BM25Index',
+    'VectorIndex',
+    'HashingEmbedding',
+    'MarkdownCorpus',
+    'chunk_markdown',
+    'ContextPacker',
+    'PackedContext',
+    'estimate_tokens',
+    'tokenize',
+    'analyze',
+    'query_terms',
+    # SMS rendering
+    'SMSTemplate',
+    'SMS_TEMPLATES',
+    'compile_sms_templates',
+    'get_sms_template',
+    'render_bulk',
+    # Caching
+    'TTLCache',
+    'customer_cache',
+    'transaction_cache',
+    'invalidate_customer',
+    'cache_stats',
+    # Session state
+    'SessionState',
+    'NEW_SESSION',
+    'SESSION_FIELDS',
+    'encode_session',
+    'decode_session',
+    'SessionStore',
+    'InMemorySessionStore',
+    'SQLiteSessionStore',
+    'create_session_store',
+    'get_session_store',
+    'set_session_store',
+    # Async data access
+    'ConnectionPool',
+    'PoolTimeout',
+    'AsyncDataAccess',
+    'async_data',
+    'run_sync',
+    'aget_customer',
+    'aget_transactions',
+    'aget_transaction_by_id',
+    'aget_suspicious_transactions',
+    'fetch_customer_context'
 ]
@@ -0,0 +1,132 @@
+"""Async data-access layer over the knowledge base stores"""
+
+import asyncio
+import threading
+import weakref
+
+from .customers import get_customer
+from .transactions import (
+    get_transaction_store,
+    get_transactions,
+    get_transaction_by_id,
+    get_suspicious_transactions
+)
+
+# Concurrency used when the active store has no connection pool
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class AsyncDataAccess:
+    """
+    Async counterparts of the knowledge-base accessors
+
+    Each call runs the synchronous accessor in a worker thread, bounded by a
+    semaphore sized to the active store's connection pool, so an event loop
+    never blocks on the data store and never queues more concurrent queries
+    than there are pooled connections. The sync accessors remain the single
+    implementation; this layer only schedules them.
+    """
+
+    def __init__(self, max_concurrency: int = None):
+        self.max_concurrency = max_concurrency
+        # One semaphore per event loop (asyncio primitives are loop-bound)
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _limit(self) -> int:
+        if self.max_concurrency:
+            return self.max_concurrency
+        pool = getattr(get_transaction_store(), "pool", None)
+        return pool.size if pool else DEFAULT_MAX_CONCURRENCY
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self._limit())
+        return semaphore
+
+    async def _run(self, fn, *args):
+        async with self._semaphore():
+            return await asyncio.to_thread(fn, *args)
+
+    async def get_customer(self, mobile_number: str, last_4_digits: str) -> dict:
+        """Async get_customer"""
+        return await self._run(get_customer, mobile_number, last_4_digits)
+
+    async def get_transactions(self, customer_id: str, limit: int = 5, after: str = None,
+                               since=None, until=None) -> list:
+        """Async get_transactions"""
+        return await self._run(get_transactions, customer_id, limit, after, since, until)
+
+    async def get_transaction_by_id(self, transaction_id: str) -> dict:
+        """Async get_transaction_by_id"""
+        return await self._run(get_transaction_by_id, transaction_id)
+
+    async def get_suspicious_transactions(self, customer_id: str) -> list:
+        """Async get_suspicious_transactions"""
+        return await self._run(get_suspicious_transactions, customer_id)
+
+    async def fetch_customer_context(self, mobile_number: str, last_4_digits: str,
+                                     limit: int = 5) -> dict:
+        """
+        Fetch a customer with their recent and suspicious transactions
+
+        The customer lookup runs first (it yields the customer_id); the two
+        transaction reads then run concurrently.
+
+        Args:
+            mobile_number: Registered mobile number
+            last_4_digits: Last 4 digits of the card
+            limit: Number of recent transactions
+
+        Returns:
+            {"customer", "transactions", "suspicious"} - customer is None
+            (and both lists empty) when verification fails
+        """
+        customer = await self.get_customer(mobile_number, last_4_digits)
+        if not customer:
+            return {"customer": None, "transactions": [], "suspicious": []}
+        transactions, suspicious = await asyncio.gather(
+            self.get_transactions(customer["customer_id"], limit),
+            self.get_suspicious_transactions(customer["customer_id"])
+        )
+        return {"customer": customer, "transactions": transactions, "suspicious": suspicious}
+
+
+# Default async accessor
+async_data = AsyncDataAccess()
+
+_thread_loops = threading.local()
+
+def run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code
+
+    Reuses one event loop per thread instead of creating a loop per call.
+    Must not be called from a thread that is already running an event loop.
+    """
+    loop = getattr(_thread_loops, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _thread_loops.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(coro)
+
+async def aget_customer(mobile_number: str, last_4_digits: str) -> dict:
+    """Async get_customer using the default accessor"""
+    return await async_data.get_customer(mobile_number, last_4_digits)
+
+async def aget_transactions(customer_id: str, limit: int = 5, after: str = None,
+                            since=None, until=None) -> list:
+    """Async get_transactions using the default accessor"""
+    return await async_data.get_transactions(customer_id, limit, after, since, until)
+
+async def aget_transaction_by_id(transaction_id: str) -> dict:
+    """Async get_transaction_by_id using the default accessor"""
+    return await async_data.get_transaction_by_id(transaction_id)
+
+async def aget_suspicious_transactions(customer_id: str) -> list:
+    """Async get_suspicious_transactions using the default accessor"""
+    return await async_data.get_suspicious_transactions(customer_id)
+
+async def fetch_customer_context(mobile_number: str, last_4_digits: str, limit: int = 5) -> dict:
+    """Fetch customer, recent and suspicious transactions using the default accessor"""
+    return await async_data.fetch_customer_context(mobile_number, last_4_digits, limit)
@@ -0,0 +1,162 @@
+"""Vectorized batch risk scoring over columnar transaction arrays"""
+
+import numpy as np
+
+from .records import transaction_hour
+from .risk import (
+    FRAUD_SCORE_THRESHOLD,
+    HIGH_VALUE_PENDING_AMOUNT,
+    LATE_NIGHT_END_HOUR,
+    LATE_NIGHT_START_HOUR,
+    RISK_FACTORS,
+    UNUSUAL_MIN_FACTORS
+)
+
+# Bit assigned to each risk factor in the returned bitmasks
+RISK_FACTOR_BITS = {name: 1 << i for i, name in enumerate(RISK_FACTORS)}
+
+
+class _Categories:
+    """Dictionary-encodes a string column while it is being loaded"""
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def mask(self, predicate) -> np.ndarray:
+        """Evaluate predicate once per distinct value"""
+        return np.fromiter((predicate(v) for v in self.values), dtype=bool, count=len(self.values))
+
+
+class TransactionColumns:
+    """
+    Struct-of-arrays view of a batch of transactions
+
+    Numeric fields become arrays (hour is -1 when only the date is known);
+    string fields are dictionary-encoded into integer code arrays, so string
+    predicates run once per distinct value and are broadcast to rows with a
+    single take().
+    """
+
+    STRING_FIELDS = ["location", "transaction_time", "merchant_status", "status", "merchant"]
+
+    def __init__(self, transaction_ids: list, fraud_score: np.ndarray, amount: np.ndarray,
+                 hour: np.ndarray, codes: dict, categories: dict):
+        self.transaction_ids = transaction_ids
+        self.fraud_score = fraud_score
+        self.amount = amount
+        self.hour = hour
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.transaction_ids)
+
+    @classmethod
+    def from_transactions(cls, transactions) -> "TransactionColumns":
+        """
+        Load an iterable of transaction dicts into columns
+
+        Args:
+            transactions: Iterable of transaction dictionaries
+
+        Returns:
+            TransactionColumns
+        """
+        categories = {field: _Categories() for field in cls.STRING_FIELDS}
+        encoders = [(field, categories[field].encode) for field in cls.STRING_FIELDS]
+        transaction_ids = []
+        fraud_score = []
+        amount = []
+        hour = []
+        codes = {field: [] for field in cls.STRING_FIELDS}
+        for txn in transactions:
+            transaction_ids.append(txn.get("transaction_id"))
+            fraud_score.append(txn.get("fraud_score", 0))
+            amount.append(txn.get("amount", 0))
+            txn_hour = transaction_hour(txn)
+            hour.append(-1 if txn_hour is None else txn_hour)
+            for field, encode in encoders:
+                codes[field].append(encode(txn.get(field) or ""))
+        return cls(
+            transaction_ids,
+            np.asarray(fraud_score, dtype=np.float64),
+            np.asarray(amount, dtype=np.float64),
+            np.asarray(hour, dtype=np.int8),
+            {field: np.asarray(values, dtype=np.int32) for field, values in codes.items()},
+            categories
+        )
+
+    def category_mask(self, field: str, predicate) -> np.ndarray:
+        """Row mask for a predicate over a dictionary-encoded string field"""
+        return self.categories[field].mask(predicate)[self.codes[field]]
+
+
+def score_columns(columns: TransactionColumns) -> np.ndarray:
+    """
+    Compute risk-factor bitmasks for every row
+
+    Args:
+        columns: TransactionColumns batch
+
+    Returns:
+        uint8 array; bit RISK_FACTOR_BITS[name] is set when the factor applies
+    """
+    masks = {
+        "high_fraud_score": columns.fraud_score > FRAUD_SCORE_THRESHOLD,
+        "international": columns.category_mask("location", lambda v: "international" in v.lower()),
+        "late_night": np.where(
+            columns.hour >= 0,
+            (columns.hour >= LATE_NIGHT_START_HOUR) | (columns.hour < LATE_NIGHT_END_HOUR),
+            columns.category_mask("transaction_time", lambda v: "late" in v.lower())
+        ),
+        "new_merchant": columns.category_mask("merchant_status", lambda v: v == "Newly added"),
+        "high_value_pending": (
+            columns.category_mask("status", lambda v: v == "pending")
+            & (columns.amount > HIGH_VALUE_PENDING_AMOUNT)
+        ),
+        "unknown_merchant": columns.category_mask("merchant", lambda v: "unknown" in v.lower())
+    }
+    bitmasks = np.zeros(len(columns), dtype=np.uint8)
+    for name, mask in masks.items():
+        bitmasks |= mask.astype(np.uint8) * np.uint8(RISK_FACTOR_BITS[name])
+    return bitmasks
+
+
+def score_transactions(transactions) -> tuple:
+    """
+    Score a batch of transaction dicts
+
+    Args:
+        transactions: Iterable of transaction dictionaries
+
+    Returns:
+        (transaction_ids, bitmasks) - list of IDs and uint8 bitmask array
+    """
+    columns = TransactionColumns.from_transactions(transactions)
+    return columns.transaction_ids, score_columns(columns)
+
+
+def factor_counts(bitmasks: np.ndarray) -> np.ndarray:
+    """Number of risk factors set in each bitmask"""
+    counts = np.zeros(bitmasks.shape, dtype=np.uint8)
+    for bit in RISK_FACTOR_BITS.values():
+        counts += (bitmasks & bit) != 0
+    return counts
+
+
+def unusual_mask(bitmasks: np.ndarray) -> np.ndarray:
+    """Rows with enough risk factors to alert on (matches risk.is_unusual)"""
+    return factor_counts(bitmasks) >= UNUSUAL_MIN_FACTORS
+
+
+def decode_factors(bitmask: int) -> list:
+    """Risk factor names set in one bitmask, in RISK_FACTORS order"""
+    return [name for name, bit in RISK_FACTOR_BITS.items() if bitmask & bit]
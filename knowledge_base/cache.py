@@ -0,0 +1,195 @@
+"""Bounded read-through cache with per-entry TTL, LRU eviction and tag invalidation"""
+
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after `ttl` seconds
+
+    Entries can carry tags (e.g. a customer_id or card_id) so every entry
+    derived from one customer can be dropped with a single
+    invalidate_tag() call when that customer's state changes.
+
+    get_or_load() does not store a value whose load started before an
+    invalidation of its key or one of its tags (or a clear()), so a slow
+    load cannot write stale data back over an invalidation.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 30.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (value, expires_at, tags)
+        self._entries = OrderedDict()
+        # tag -> set of keys
+        self._tags = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        # Bumped by every invalidation; loads remember the epoch they started in
+        self._epoch = 0
+        self._cleared_at = 0
+        # key / tag -> epoch of its last invalidation, kept while loads are in flight
+        self._invalidated_keys = {}
+        self._invalidated_tags = {}
+        self._loading = 0
+
+    def _remove(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key, default=None):
+        """Get a live entry (refreshing its LRU position) or default"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self._remove(key)
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def set(self, key, value, tags=()):
+        """Store an entry, evicting the least recently used one when full"""
+        with self._lock:
+            self._set(key, value, tuple(tags))
+
+    def _set(self, key, value, tags: tuple):
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, self._clock() + self.ttl, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _invalidated_since(self, epoch: int, key, tags: tuple) -> bool:
+        return (self._cleared_at > epoch
+                or self._invalidated_keys.get(key, 0) > epoch
+                or any(self._invalidated_tags.get(tag, 0) > epoch for tag in tags))
+
+    def get_or_load(self, key, loader, tags=()):
+        """
+        Read-through lookup
+
+        Args:
+            key: Cache key
+            loader: Zero-argument callable invoked on a miss
+            tags: Tags for a newly loaded entry, or a callable mapping the
+                loaded value to its tags
+
+        Returns:
+            Cached or freshly loaded value (None results are not cached, nor
+            values invalidated while they were loading)
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            self._loading += 1
+            started = self._epoch
+        try:
+            value = loader()
+            if value is not None:
+                entry_tags = tuple(tags(value) if callable(tags) else tags)
+                with self._lock:
+                    if not self._invalidated_since(started, key, entry_tags):
+                        self._set(key, value, entry_tags)
+            return value
+        finally:
+            with self._lock:
+                self._loading -= 1
+                if not self._loading:
+                    self._invalidated_keys.clear()
+                    self._invalidated_tags.clear()
+
+    def invalidate(self, key):
+        """Drop one entry"""
+        with self._lock:
+            self._epoch += 1
+            if self._loading:
+                self._invalidated_keys[key] = self._epoch
+            if key in self._entries:
+                self._remove(key)
+                self.invalidations += 1
+
+    def invalidate_tag(self, tag):
+        """Drop every entry carrying a tag"""
+        with self._lock:
+            self._epoch += 1
+            if self._loading:
+                self._invalidated_tags[tag] = self._epoch
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._epoch += 1
+            self._cleared_at = self._epoch
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        """Counters for monitoring and sizing"""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations
+        }
+
+
+# Caches in front of the customer and transaction stores
+customer_cache = TTLCache(maxsize=10000, ttl=60.0)
+transaction_cache = TTLCache(maxsize=10000, ttl=30.0)
+
+def invalidate_customer(customer_id: str = None, card_id: str = None):
+    """
+    Drop cached data for a customer whose state changed
+
+    Args:
+        customer_id: Customer identifier
+        card_id: Card identifier (customer entries are also tagged with it)
+    """
+    for tag in (customer_id, card_id):
+        if tag:
+            customer_cache.invalidate_tag(tag)
+            transaction_cache.invalidate_tag(tag)
+
+def cache_stats() -> dict:
+    """Hit/miss counters for both caches"""
+    return {
+        "customers": customer_cache.stats(),
+        "transactions": transaction_cache.stats()
+    }
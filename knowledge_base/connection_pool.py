@@ -0,0 +1,77 @@
+"""Bounded, thread-safe connection pool for the SQLite-backed stores"""
+
+import queue
+import threading
+from contextlib import contextmanager
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes free within the timeout"""
+
+
+class ConnectionPool:
+    """
+    Fixed-size pool of DB-API connections
+
+    Connections are created lazily by `factory` up to `size` and handed out
+    one caller at a time; callers beyond that block until one is returned.
+    This bounds open connections per worker regardless of how many threads
+    or async tasks are issuing queries.
+    """
+
+    def __init__(self, factory, size: int = 4, timeout: float = 30.0):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self._factory = factory
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _acquire(self, timeout: float):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = self._created < self.size
+            if create:
+                self._created += 1
+        if create:
+            try:
+                return self._factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise PoolTimeout(f"No connection free after {timeout}s (pool size {self.size})")
+
+    @contextmanager
+    def connection(self, timeout: float = None):
+        """
+        Borrow a connection for the duration of a with-block
+
+        Args:
+            timeout: Seconds to wait for a free connection (defaults to pool timeout)
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        conn = self._acquire(self.timeout if timeout is None else timeout)
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        """Close all idle connections and refuse new borrowers"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
@@ -0,0 +1,107 @@
+"""Budgeted packing of retrieved policy passages into prompt context"""
+
+import math
+import os
+import re
+
+# Default budget when none is configured (RAG_CONTEXT_TOKENS overrides)
+DEFAULT_MAX_TOKENS = 400
+
+# Markdown table rule rows ("|------|----|") carry no content
+TABLE_RULE = re.compile(r"^[\s|:-]+$")
+
+
+def compact(text: str) -> str:
+    """Serialize a passage onto one line ("; " between its non-empty lines)"""
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "; ".join(line for line in lines if line and not TABLE_RULE.match(line))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token for English text)"""
+    return math.ceil(len(text) / 4)
+
+
+class PackedContext:
+    """
+    Result of packing passages into a budget
+
+    Attributes:
+        text: Serialized context, one passage per line, best first
+        included: Paths of the passages in text
+        dropped: (path, tokens) for every passage that did not fit
+        tokens: Estimated tokens used
+        chars: Characters used
+    """
+
+    def __init__(self, text: str, included: list, dropped: list, tokens: int, chars: int):
+        self.text = text
+        self.included = included
+        self.dropped = dropped
+        self.tokens = tokens
+        self.chars = chars
+
+    @property
+    def dropped_tokens(self) -> int:
+        return sum(tokens for _, tokens in self.dropped)
+
+    def summary(self) -> str:
+        """One-line description for logs"""
+        return (f"{len(self.included)} passages, ~{self.tokens} tokens / {self.chars} chars; "
+                f"dropped {len(self.dropped)} (~{self.dropped_tokens} tokens)")
+
+    def __str__(self) -> str:
+        return self.text
+
+
+class ContextPacker:
+    """
+    Packs ranked passages into a token and/or character budget
+
+    Passages are taken best first; one that does not fit is skipped (and
+    reported) while smaller, lower-ranked ones may still fill the rest of
+    the budget. Each passage is serialized as one compact line (see compact()).
+    """
+
+    def __init__(self, max_tokens: int = None, max_chars: int = None, token_counter=estimate_tokens):
+        """
+        Args:
+            max_tokens: Token budget (defaults to RAG_CONTEXT_TOKENS env var, then 400,
+                unless only max_chars is given)
+            max_chars: Character budget (optional)
+            token_counter: Callable text -> token count (swap in a real tokenizer)
+        """
+        if max_tokens is None and max_chars is None:
+            max_tokens = int(os.getenv("RAG_CONTEXT_TOKENS", str(DEFAULT_MAX_TOKENS)))
+        self.max_tokens = max_tokens
+        self.max_chars = max_chars
+        self.token_counter = token_counter
+
+    def pack(self, passages) -> PackedContext:
+        """
+        Pack passages into the budget
+
+        Args:
+            passages: Iterable of (path, text, score), already ranked best first
+
+        Returns:
+            PackedContext
+        """
+        lines = []
+        included = []
+        dropped = []
+        tokens = 0
+        chars = 0
+        for path, text, _ in passages:
+            line = compact(text)
+            line_tokens = self.token_counter(line)
+            line_chars = len(line) + (1 if lines else 0)
+            if ((self.max_tokens is not None and tokens + line_tokens > self.max_tokens)
+                    or (self.max_chars is not None and chars + line_chars > self.max_chars)):
+                dropped.append((path, line_tokens))
+                continue
+            lines.append(line)
+            included.append(path)
+            tokens += line_tokens
+            chars += line_chars
+        return PackedContext("\n".join(lines), included, dropped, tokens, chars)
@@ -0,0 +1,128 @@
+"""Markdown policy corpus - heading-level chunks with incremental change tracking"""
+
+import os
+import re
+import threading
+
+from .vector_index import content_hash
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+SLUG_PATTERN = re.compile(r"[^a-z0-9]+")
+
+# Directory holding the policy documents (this package)
+KNOWLEDGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def slugify(text: str) -> str:
+    """Lowercase identifier for a heading ("Handling Policy" -> "handling_policy")"""
+    return SLUG_PATTERN.sub("_", text.lower()).strip("_")
+
+
+def chunk_markdown(text: str, doc_id: str) -> list:
+    """
+    Split a markdown document into one chunk per heading
+
+    Each chunk holds the heading's own body (up to the next heading) and is
+    prefixed with its heading chain, so "## Handling Policy" under
+    "# Fraud Detection" reads "Fraud Detection > Handling Policy".
+    Headings without body text produce no chunk.
+
+    Args:
+        text: Markdown source
+        doc_id: Path prefix for the chunks
+
+    Returns:
+        List of (path, text) tuples, e.g. ("<doc_id>.handling_policy", ...)
+    """
+    chunks = []
+    seen = {}
+    chain = []
+    body = []
+
+    def flush():
+        content = "\n".join(body).strip()
+        if not content:
+            return
+        slug = slugify(chain[-1][1]) if chain else "body"
+        seen[slug] = seen.get(slug, 0) + 1
+        if seen[slug] > 1:
+            slug = f"{slug}_{seen[slug]}"
+        title = " > ".join(heading for _, heading in chain)
+        chunks.append((f"{doc_id}.{slug}", f"{title}\n{content}" if title else content))
+
+    for line in text.splitlines():
+        match = HEADING_PATTERN.match(line)
+        if match:
+            flush()
+            body = []
+            level = len(match.group(1))
+            chain = [(l, h) for l, h in chain if l < level] + [(level, match.group(2))]
+        else:
+            body.append(line)
+    flush()
+    return chunks
+
+
+class MarkdownCorpus:
+    """
+    Tracks a directory of markdown policy files and reports chunk changes
+
+    refresh() stats every file and only reads those whose mtime or size
+    changed; a file is only re-chunked when its content hash changed too.
+    It returns just the chunks that were added, edited or removed, so
+    indexes downstream re-tokenize/re-embed only what changed.
+    """
+
+    def __init__(self, directory: str = KNOWLEDGE_DIR, prefix: str = "docs",
+                 exclude: tuple = ("README.md",)):
+        self.directory = directory
+        self.prefix = prefix
+        self.exclude = set(exclude)
+        self._lock = threading.Lock()
+        # file name -> (mtime_ns, size, content hash, {chunk path: text})
+        self._files = {}
+
+    def _scan(self) -> dict:
+        stats = {}
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".md") and entry.name not in self.exclude and entry.is_file():
+                stat = entry.stat()
+                stats[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return stats
+
+    def refresh(self) -> tuple:
+        """
+        Pick up added, edited and deleted markdown files
+
+        Returns:
+            (changed, removed) - {chunk path: text} for new or edited chunks,
+            and a list of chunk paths that no longer exist
+        """
+        with self._lock:
+            changed = {}
+            removed = []
+            stats = self._scan()
+            for name in [n for n in self._files if n not in stats]:
+                removed.extend(self._files.pop(name)[3])
+            for name, (mtime_ns, size) in sorted(stats.items()):
+                previous = self._files.get(name)
+                if previous and previous[:2] == (mtime_ns, size):
+                    continue
+                with open(os.path.join(self.directory, name), encoding="utf-8") as f:
+                    text = f.read()
+                text_hash = content_hash(text)
+                old_chunks = previous[3] if previous else {}
+                if previous and previous[2] == text_hash:
+                    self._files[name] = (mtime_ns, size, text_hash, old_chunks)
+                    continue
+                doc_id = f"{self.prefix}.{slugify(os.path.splitext(name)[0])}"
+                chunks = dict(chunk_markdown(text, doc_id))
+                changed.update({path: t for path, t in chunks.items() if old_chunks.get(path) != t})
+                removed.extend(path for path in old_chunks if path not in chunks)
+                self._files[name] = (mtime_ns, size, text_hash, chunks)
+            return changed, removed
+
+    def chunks(self) -> dict:
+        """All current chunks as {path: text}"""
+        with self._lock:
+            return {path: text for entry in self._files.values() for path, text in entry[3].items()}
@@ -1,5 +1,7 @@
 """Customer database - Mock data for identity verification"""
 
+from .cache import customer_cache
+
 # Mock customer database
 # In production, this would connect to a real customer database (PostgreSQL, DynamoDB, etc.)
 CUSTOMER_DB = {
@@ -56,10 +58,72 @@ CUSTOMER_DB = {
     }
 }
 
+class CustomerStore:
+    """
+    Customer store keyed by "{mobile}_{last4}" with a secondary mobile index
+
+    The primary dict is shared with the caller (CUSTOMER_DB) so existing code
+    that reads it directly keeps working. The mobile index maps a mobile number
+    to every customer registered on it, which keeps mobile-only lookups O(1)
+    instead of scanning all customers.
+    """
+
+    def __init__(self, customers: dict = None):
+        self._by_key = customers if customers is not None else {}
+        self._by_mobile = {}
+        for customer in self._by_key.values():
+            self._index(customer)
+
+    def _index(self, customer: dict):
+        self._by_mobile.setdefault(customer["mobile"], []).append(customer)
+
+    def _unindex(self, customer: dict):
+        matches = self._by_mobile.get(customer["mobile"], [])
+        matches[:] = [c for c in matches if c is not customer]
+        if not matches:
+            self._by_mobile.pop(customer["mobile"], None)
+
+    def add(self, customer: dict):
+        """
+        Add or replace a customer, keeping the mobile index in sync
+
+        Args:
+            customer: Customer dict with at least mobile and last_4
+        """
+        key = f"{customer['mobile']}_{customer['last_4']}"
+        existing = self._by_key.get(key)
+        if existing is not None:
+            self._unindex(existing)
+        self._by_key[key] = customer
+        self._index(customer)
+        customer_cache.invalidate(("customer", customer["mobile"], customer["last_4"]))
+
+    def get(self, mobile_number: str, last_4_digits: str) -> dict:
+        """Get a customer by mobile number and last 4 digits, or None"""
+        return self._by_key.get(f"{mobile_number}_{last_4_digits}")
+
+    def find_by_mobile(self, mobile_number: str) -> list:
+        """Get all customers registered on a mobile number"""
+        return list(self._by_mobile.get(mobile_number, ()))
+
+    def values(self) -> list:
+        """Get all customers"""
+        return list(self._by_key.values())
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+
+# Global customer store backed by CUSTOMER_DB
+customer_store = CustomerStore(CUSTOMER_DB)
+
 def get_customer(mobile_number: str, last_4_digits: str) -> dict:
     """
     Retrieve customer information by mobile number and last 4 digits
     
+    Read-through customer_cache; entries are tagged with customer_id and
+    card_id so invalidate_customer() drops them when the account changes.
+    
     Args:
         mobile_number: Customer's registered mobile number
         last_4_digits: Last 4 digits of credit card
@@ -67,8 +131,23 @@ def get_customer(mobile_number: str, last_4_digits: str) -> dict:
     Returns:
         Customer information dict or None if not found
     """
-    key = f"{mobile_number}_{last_4_digits}"
-    return CUSTOMER_DB.get(key)
+    return customer_cache.get_or_load(
+        ("customer", mobile_number, last_4_digits),
+        lambda: customer_store.get(mobile_number, last_4_digits),
+        tags=lambda customer: [tag for tag in (customer["customer_id"], customer.get("card_id")) if tag]
+    )
+
+def find_by_mobile(mobile_number: str) -> list:
+    """
+    Retrieve all customers registered on a mobile number
+    
+    Args:
+        mobile_number: Customer's registered mobile number
+        
+    Returns:
+        List of customer dicts (empty if the number is not registered)
+    """
+    return customer_store.find_by_mobile(mobile_number)
 
 def list_all_customers() -> list:
     """
@@ -77,4 +156,4 @@ def list_all_customers() -> list:
     Returns:
         List of customer dictionaries
     """
-    return list(CUSTOMER_DB.values())
+    return customer_store.values()
@@ -0,0 +1,277 @@
+"""Streaming bulk loader for customers and transactions from JSONL/CSV exports
+
+Usage:
+    python -m knowledge_base.ingest transactions settlement.jsonl --db ledger.db
+    python -m knowledge_base.ingest customers customers.csv --dry-run
+
+From the command line transactions are loaded into a SQLite ledger, which
+is never seeded with the demo data. Customers (and the in-memory
+transaction store) live in process memory, so the command line can only
+validate those files (--dry-run); load them with ingest_customers() /
+ingest_transactions() from the serving process.
+"""
+
+import argparse
+import csv
+import json
+import time
+from itertools import islice
+
+from .customers import customer_store
+from .records import normalize_transaction
+from .transactions import create_transaction_store, get_transaction_store
+
+DEFAULT_CHUNK_SIZE = 10000
+
+# Field -> type for records in the CUSTOMER_DB / TRANSACTIONS_DB schema
+CUSTOMER_FIELDS = {
+    "customer_id": str,
+    "name": str,
+    "card_id": str,
+    "mobile": str,
+    "last_4": str,
+    "email": str,
+    "account_status": str,
+    "member_since": str
+}
+CUSTOMER_OPTIONAL_FIELDS = {
+    "reward_points": dict
+}
+TRANSACTION_FIELDS = {
+    "transaction_id": str,
+    "date": str,
+    "amount": float,
+    "merchant": str,
+    "merchant_category": str,
+    "status": str,
+    "location": str,
+    "card_last_4": str
+}
+TRANSACTION_OPTIONAL_FIELDS = {
+    "fraud_score": float,
+    "transaction_time": str,
+    "merchant_status": str
+}
+
+
+class IngestReport:
+    """Counters for one ingest run"""
+
+    MAX_ERRORS = 20
+
+    def __init__(self):
+        self.rows_read = 0
+        self.rows_loaded = 0
+        self.rows_rejected = 0
+        self.errors = []
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def reject(self, line: int, reason: str):
+        self.rows_rejected += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append((line, reason))
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows_read / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        lines = [
+            f"Read {self.rows_read:,} rows in {self.elapsed:.2f}s ({self.rows_per_sec:,.0f} rows/sec)",
+            f"Loaded {self.rows_loaded:,}, rejected {self.rows_rejected:,}"
+        ]
+        lines += [f"  line {line}: {reason}" for line, reason in self.errors]
+        return "\n".join(lines)
+
+
+def read_records(path: str, file_format: str = None):
+    """
+    Stream records from a JSONL or CSV file one at a time
+
+    Args:
+        path: File path
+        file_format: "jsonl" or "csv" (defaults to the file extension)
+
+    Yields:
+        (line_number, record) - record is a dict, or None if the line is unparseable
+    """
+    file_format = file_format or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    with open(path, newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            for line, row in enumerate(csv.DictReader(f), start=2):
+                yield line, row
+        else:
+            for line, text in enumerate(f, start=1):
+                if not text.strip():
+                    continue
+                try:
+                    yield line, json.loads(text)
+                except json.JSONDecodeError:
+                    yield line, None
+
+
+def chunked(iterable, size: int):
+    """Yield lists of at most size items from an iterable"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _coerce(value, field_type):
+    if field_type is dict and isinstance(value, str):
+        return json.loads(value)
+    if field_type is float:
+        return float(value)
+    if field_type is str:
+        return str(value)
+    if not isinstance(value, field_type):
+        raise TypeError(f"expected {field_type.__name__}")
+    return value
+
+
+def validate_record(record: dict, required: dict, optional: dict) -> tuple:
+    """
+    Validate and coerce a record against a field schema
+
+    Empty strings (as produced by CSV for missing columns) count as absent.
+
+    Args:
+        record: Raw record
+        required: Field -> type for required fields
+        optional: Field -> type for optional fields
+
+    Returns:
+        (clean_record, None) on success or (None, reason) on rejection
+    """
+    if not isinstance(record, dict):
+        return None, "unparseable record"
+    clean = {}
+    for fields, is_required in ((required, True), (optional, False)):
+        for field, field_type in fields.items():
+            value = record.get(field)
+            if value is None or value == "":
+                if is_required:
+                    return None, f"missing {field}"
+                continue
+            try:
+                clean[field] = _coerce(value, field_type)
+            except (TypeError, ValueError) as e:
+                return None, f"invalid {field}: {e}"
+    return clean, None
+
+
+def ingest_customers(path: str, file_format: str = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     store=None, validate_only: bool = False) -> IngestReport:
+    """
+    Stream customers into the customer store (mobile index included)
+
+    Args:
+        path: JSONL or CSV export
+        file_format: "jsonl" or "csv" (defaults to the file extension)
+        chunk_size: Records validated and written per chunk
+        store: CustomerStore (defaults to the global customer_store)
+        validate_only: Validate and count rows without storing them (memory
+            does not grow with the file)
+
+    Returns:
+        IngestReport
+    """
+    store = None if validate_only else store or customer_store
+    report = IngestReport()
+    for chunk in chunked(read_records(path, file_format), chunk_size):
+        for line, record in chunk:
+            report.rows_read += 1
+            customer, error = validate_record(record, CUSTOMER_FIELDS, CUSTOMER_OPTIONAL_FIELDS)
+            if error:
+                report.reject(line, error)
+                continue
+            if store is not None:
+                store.add(customer)
+            report.rows_loaded += 1
+    report.elapsed = time.perf_counter() - report.started
+    return report
+
+
+def ingest_transactions(path: str, file_format: str = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        store=None, validate_only: bool = False) -> IngestReport:
+    """
+    Stream transactions into the transaction store
+
+    Each record must carry a customer_id alongside the TRANSACTIONS_DB fields.
+    Rows are written per chunk with add_batch(), so store indexes and the
+    suspicious view are maintained as the file is read. Only one chunk is
+    held in memory at a time.
+
+    Args:
+        path: JSONL or CSV export
+        file_format: "jsonl" or "csv" (defaults to the file extension)
+        chunk_size: Records validated and written per chunk
+        store: TransactionStore (defaults to the active store)
+        validate_only: Validate and count rows without storing them
+
+    Returns:
+        IngestReport
+    """
+    store = None if validate_only else store or get_transaction_store()
+    report = IngestReport()
+    for chunk in chunked(read_records(path, file_format), chunk_size):
+        rows = []
+        for line, record in chunk:
+            report.rows_read += 1
+            transaction, error = validate_record(record, TRANSACTION_FIELDS, TRANSACTION_OPTIONAL_FIELDS)
+            customer_id = record.get("customer_id") if transaction else None
+            if not error and customer_id in (None, ""):
+                error = "missing customer_id"
+            # Customer IDs are strings everywhere else (a JSON 42 must match "42")
+            customer_id = str(customer_id) if customer_id is not None else None
+            if not error:
+                try:
+                    transaction = normalize_transaction(transaction)
+                except ValueError:
+                    error = "invalid date"
+            if error:
+                report.reject(line, error)
+                continue
+            rows.append((customer_id, transaction))
+        if store is not None:
+            store.add_batch(rows)
+        report.rows_loaded += len(rows)
+    report.elapsed = time.perf_counter() - report.started
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk load customers or transactions")
+    parser.add_argument("kind", choices=["customers", "transactions"])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["jsonl", "csv"])
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--db", help="SQLite ledger to load transactions into")
+    parser.add_argument("--dry-run", action="store_true", help="Validate the file; keep nothing")
+    args = parser.parse_args()
+
+    if args.kind == "customers" and not args.dry_run:
+        parser.error("customers are held in process memory and would be discarded on exit; "
+                     "use --dry-run to validate the file")
+    if args.kind == "transactions" and not args.dry_run and not args.db:
+        parser.error("transactions need --db (the SQLite ledger to load into), or --dry-run")
+
+    if args.kind == "customers":
+        report = ingest_customers(args.path, args.format, args.chunk_size, validate_only=True)
+    elif args.dry_run:
+        report = ingest_transactions(args.path, args.format, args.chunk_size, validate_only=True)
+    else:
+        store = create_transaction_store("sqlite", args.db, seed=False)
+        report = ingest_transactions(args.path, args.format, args.chunk_size, store=store)
+        store.close()
+    print(report.summary())
+    if args.dry_run:
+        print("Dry run - nothing was kept")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 """Credit Card Policies and Rules - Knowledge Base for RAG"""
 
+from collections.abc import Mapping
+
 # Transaction Lifecycle
 TRANSACTION_LIFECYCLE = {
     "pending": {
@@ -178,29 +180,78 @@ ESCALATION_RULES = {
     }
 }
 
+# Policy sections by key (the knowledge sections retrieved by KnowledgeBaseRAG)
+POLICY_SECTIONS = {
+    "transaction_lifecycle": TRANSACTION_LIFECYCLE,
+    "fraud_policies": FRAUD_POLICIES,
+    "card_block_rules": CARD_BLOCK_RULES,
+    "dispute_process": DISPUTE_PROCESS,
+    "compliance_rules": COMPLIANCE_RULES,
+    "sms_formats": SMS_FORMATS,
+    "fraud_sla": FRAUD_SLA,
+    "escalation_rules": ESCALATION_RULES
+}
+
+# Short policy types accepted by get_policy -> section key
+POLICY_TYPES = {
+    "transaction_lifecycle": "transaction_lifecycle",
+    "fraud": "fraud_policies",
+    "block": "card_block_rules",
+    "dispute": "dispute_process",
+    "compliance": "compliance_rules",
+    "sms": "sms_formats",
+    "sla": "fraud_sla",
+    "escalation": "escalation_rules"
+}
+
 def get_policy(policy_type: str, key: str = None):
     """
     Retrieve policy information from knowledge base
     
+    Reads the current policy snapshot (see knowledge_base.policy_store),
+    so reloaded policies are visible without a restart.
+    
     Args:
-        policy_type: Type of policy (fraud, block, dispute, etc.)
+        policy_type: Type of policy (fraud, block, dispute, etc.) or a dotted
+            path such as "fraud.customer_liability.reported_within_24h"
         key: Specific key within policy (optional)
         
     Returns:
-        Policy information
+        Policy information (shared per snapshot - do not modify), or None if
+        the path does not exist
     """
-    policies = {
-        "transaction_lifecycle": TRANSACTION_LIFECYCLE,
-        "fraud": FRAUD_POLICIES,
-        "block": CARD_BLOCK_RULES,
-        "dispute": DISPUTE_PROCESS,
-        "compliance": COMPLIANCE_RULES,
-        "sms": SMS_FORMATS,
-        "sla": FRAUD_SLA,
-        "escalation": ESCALATION_RULES
-    }
+    from .policy_store import policy_store
+    return policy_store.current().plain(f"{policy_type}.{key}" if key else policy_type)
+
+def format_policy_value(value) -> str:
+    """Render a policy leaf (scalar or list of strings) as text"""
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if isinstance(value, (list, tuple)):
+        return "; ".join(format_policy_value(item) for item in value)
+    return str(value)
+
+def flatten_policies(sections: dict, prefix: str = "") -> list:
+    """
+    Flatten nested policy dicts into addressable passages
     
-    policy = policies.get(policy_type)
-    if key and isinstance(policy, dict):
-        return policy.get(key)
-    return policy
+    Every leaf (a scalar, or a list of strings such as a checklist) becomes
+    one passage whose path is the dotted chain of keys leading to it, e.g.
+    "fraud_policies.customer_liability.reported_within_24h".
+    
+    Args:
+        sections: Mapping of section key -> policy dict
+        prefix: Path prefix for the returned passages
+        
+    Returns:
+        List of (path, text) tuples; text reads "<key path>: <value>"
+    """
+    passages = []
+    for key, value in sections.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, Mapping):
+            passages.extend(flatten_policies(value, path))
+        else:
+            label = " > ".join(part.replace("_", " ") for part in path.split("."))
+            passages.append((path, f"{label}: {format_policy_value(value)}"))
+    return passages
@@ -0,0 +1,265 @@
+"""Immutable, versioned policy snapshots with dotted-path lookup and hot reload"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from .policies import POLICY_SECTIONS, POLICY_TYPES
+
+logger = logging.getLogger(__name__)
+
+
+def freeze(value):
+    """Deep read-only copy: dicts become mapping proxies, lists become tuples"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Plain copy of a frozen value: mapping proxies become dicts, tuples lists"""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+class PolicySnapshot:
+    """
+    One immutable version of every policy section
+
+    All content is frozen, and every dotted path - each section, nested
+    dict and leaf - is precomputed into one table, so
+    get("fraud.customer_liability.reported_within_24h") is a single dict
+    lookup. Paths may start with the section key ("fraud_policies") or the
+    short policy type used by get_policy ("fraud").
+
+    A session that keeps a reference to a snapshot keeps reading that
+    version after a reload.
+
+    get() returns the frozen values; plain() returns ordinary dicts and
+    lists for the public API (retrieve(), get_policy()), built once per
+    path and snapshot.
+    """
+
+    def __init__(self, sections: dict, version: int = 1, aliases: dict = POLICY_TYPES):
+        self.version = version
+        self.sections = freeze(sections)
+        self._paths = {}
+        self._plain = {}
+        for key, value in self.sections.items():
+            self._index(key, value)
+        for alias, key in aliases.items():
+            if key in self.sections and alias not in self.sections:
+                self._index(alias, self.sections[key])
+
+    def _index(self, path: str, value):
+        self._paths[path] = value
+        if isinstance(value, Mapping):
+            for key, item in value.items():
+                self._index(f"{path}.{key}", item)
+
+    def get(self, path: str, default=None):
+        """Value at a dotted path, or default"""
+        return self._paths.get(path, default)
+
+    def plain(self, path: str, default=None):
+        """Value at a dotted path as plain dicts and lists, or default"""
+        try:
+            return self._plain[path]
+        except KeyError:
+            pass
+        if path not in self._paths:
+            return default
+        return self._plain.setdefault(path, thaw(self._paths[path]))
+
+    def __getitem__(self, path: str):
+        return self._paths[path]
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._paths
+
+    def paths(self) -> list:
+        """Every addressable dotted path"""
+        return list(self._paths)
+
+
+def load_policy_file(path: str) -> dict:
+    """
+    Read policy sections from a JSON file
+
+    Top-level keys are section keys ("fraud_sla") or policy types ("sla");
+    each value replaces that whole section.
+
+    Args:
+        path: JSON file path
+
+    Returns:
+        Mapping of section key -> section content
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {POLICY_TYPES.get(key, key): value for key, value in data.items()}
+
+
+class PolicyStore:
+    """
+    Holds the current PolicySnapshot and swaps it atomically on reload
+
+    Readers call current() and get a complete snapshot - never a mix of
+    old and new sections. Subscribers (the RAG indexes, the SMS template
+    cache) are called with each new snapshot after it is published.
+
+    With a source_path, current() and get() check the file's mtime at most
+    every refresh_interval seconds, so every read path picks up edits.
+    """
+
+    def __init__(self, sections: dict, source_path: str = None, refresh_interval: float = None):
+        """
+        Args:
+            sections: Built-in policy sections
+            source_path: JSON file overriding them (see load_policy_file)
+            refresh_interval: Seconds between mtime checks of source_path
+                (POLICY_REFRESH_SECONDS env var, then 2)
+        """
+        self._defaults = dict(sections)
+        self.source_path = source_path
+        self._source_mtime = None
+        if refresh_interval is None:
+            refresh_interval = float(os.getenv("POLICY_REFRESH_SECONDS", "2"))
+        self.refresh_interval = refresh_interval
+        self._next_check = time.monotonic() + refresh_interval
+        self._refresh_lock = threading.Lock()
+        # Error of the last failed refresh(), None once a reload succeeds
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._subscribers = []
+        if source_path:
+            self._source_mtime = os.stat(source_path).st_mtime_ns
+            sections = dict(sections, **load_policy_file(source_path))
+        self._snapshot = PolicySnapshot(sections)
+
+    def current(self) -> PolicySnapshot:
+        """The snapshot new work should read"""
+        self.refresh_if_due()
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def get(self, path: str, default=None):
+        """Value at a dotted path in the current snapshot"""
+        return self.current().get(path, default)
+
+    def subscribe(self, callback):
+        """Register callback(snapshot), called after every reload"""
+        self._subscribers.append(callback)
+
+    def reload(self, sections: dict = None, path: str = None) -> PolicySnapshot:
+        """
+        Publish a new snapshot
+
+        Args:
+            sections: Sections to replace (keys are section keys or policy types)
+            path: JSON file to read the sections from (see load_policy_file)
+
+        With neither, the built-in defaults are re-read together with
+        source_path, if set. Sections not given keep their current content.
+
+        Returns:
+            The new snapshot
+        """
+        if path is not None:
+            updates = load_policy_file(path)
+        elif sections is not None:
+            updates = {POLICY_TYPES.get(key, key): value for key, value in sections.items()}
+        else:
+            updates = self._read_source()
+        return self._publish(updates)
+
+    def _read_source(self) -> dict:
+        updates = dict(self._defaults)
+        if self.source_path:
+            updates.update(load_policy_file(self.source_path))
+        return updates
+
+    def _publish(self, updates: dict) -> PolicySnapshot:
+        with self._lock:
+            merged = dict(self._snapshot.sections)
+            merged.update(updates)
+            snapshot = PolicySnapshot(merged, self._snapshot.version + 1)
+            self._snapshot = snapshot
+        for callback in self._subscribers:
+            callback(snapshot)
+        return snapshot
+
+    def refresh_if_due(self) -> bool:
+        """
+        refresh(), at most once per refresh_interval
+
+        Concurrent callers do not wait: the one that takes the check
+        reloads, the others keep reading the current snapshot.
+
+        Returns:
+            True when a new snapshot was published
+        """
+        if not self.source_path:
+            return False
+        now = time.monotonic()
+        if now < self._next_check or not self._refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            self._next_check = now + self.refresh_interval
+            return self.refresh()
+        finally:
+            self._refresh_lock.release()
+
+    def refresh(self) -> bool:
+        """
+        Reload if source_path changed on disk
+
+        A missing, half-written or malformed file is logged and kept in
+        last_error; the current snapshot stays in service and the file is
+        tried again on the next call.
+
+        Returns:
+            True when a new snapshot was published
+        """
+        if not self.source_path:
+            return False
+        try:
+            mtime = os.stat(self.source_path).st_mtime_ns
+            if mtime == self._source_mtime:
+                return False
+            updates = self._read_source()
+        except (OSError, ValueError, AttributeError) as exc:
+            # Logged once per distinct error, not on every refresh interval
+            if repr(exc) != repr(self.last_error):
+                logger.error("Policy reload from %s failed, keeping version %d: %s",
+                             self.source_path, self.version, exc)
+            self.last_error = exc
+            return False
+        self._publish(updates)
+        self._source_mtime = mtime
+        self.last_error = None
+        return True
+
+
+# Global policy store; POLICY_FILE (JSON) overrides the built-in sections
+policy_store = PolicyStore(POLICY_SECTIONS, os.getenv("POLICY_FILE") or None)
+
+def current_policies() -> PolicySnapshot:
+    """Snapshot to pin for the lifetime of a session"""
+    return policy_store.current()
+
+def reload_policies(sections: dict = None, path: str = None) -> PolicySnapshot:
+    """Publish a new policy snapshot (see PolicyStore.reload)"""
+    return policy_store.reload(sections, path)
@@ -1,116 +1,339 @@
 """RAG (Retrieval-Augmented Generation) for Knowledge Base"""
 
-from .policies import (
-    TRANSACTION_LIFECYCLE,
-    FRAUD_POLICIES,
-    CARD_BLOCK_RULES,
-    DISPUTE_PROCESS,
-    COMPLIANCE_RULES,
-    SMS_FORMATS,
-    FRAUD_SLA,
-    ESCALATION_RULES,
-    get_policy
-)
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .policies import flatten_policies
+from .policy_store import PolicySnapshot, policy_store
+from .retrieval import TermIndex, BM25Index, query_terms
+from .cache import TTLCache
+from .sms import SMS_TEMPLATES
+from .corpus import KNOWLEDGE_DIR, MarkdownCorpus
+from .context_packer import ContextPacker, PackedContext
+
+# Query terms (and synonyms) that select each knowledge section.
+# Terms are stemmed, so inflections ("blocked", "disputes") match too.
+FRAUD_TERMS = ["fraud", "fraudulent", "unauthorized", "suspicious", "scam"]
+SECTION_TERMS = {
+    "transaction_lifecycle": ["transaction", "pending", "completed", "status", "charge"],
+    "fraud_policies": FRAUD_TERMS,
+    "card_block_rules": ["block", "unblock", "card", "stop", "freeze", "lost", "stolen"],
+    "dispute_process": ["dispute", "ticket", "complaint", "chargeback"],
+    "compliance_rules": ["compliance", "rbi", "pci", "regulation", "regulatory"],
+    "fraud_sla": FRAUD_TERMS + ["sla", "timeline", "how long", "when", "deadline", "turnaround"],
+    "escalation_rules": ["escalate", "human", "manager", "senior", "supervisor"]
+}
+
+# Term index used by retrieve_many() worker processes
+_worker_index = None
+
+def _init_worker(index):
+    global _worker_index
+    _worker_index = index
+
+def _lookup_batch(batch: list) -> list:
+    return [_worker_index.lookup(query) for query in batch]
 
 class KnowledgeBaseRAG:
     """RAG system for retrieving policy and compliance information"""
     
-    def __init__(self):
-        self.knowledge = {
-            "transaction_lifecycle": TRANSACTION_LIFECYCLE,
-            "fraud_policies": FRAUD_POLICIES,
-            "card_block_rules": CARD_BLOCK_RULES,
-            "dispute_process": DISPUTE_PROCESS,
-            "compliance_rules": COMPLIANCE_RULES,
-            "sms_formats": SMS_FORMATS,
-            "fraud_sla": FRAUD_SLA,
-            "escalation_rules": ESCALATION_RULES
-        }
+    def __init__(self, retriever: str = None, vector_index_path: str = None,
+                 markdown_dir: str = KNOWLEDGE_DIR):
+        """
+        Args:
+            retriever: Passage ranking for retrieve_top_k - "bm25" or "vector"
+                (defaults to RAG_RETRIEVER env var, then "bm25")
+            vector_index_path: chromadb directory for the vector index
+                (defaults to POLICY_INDEX_PATH env var, then in-memory)
+            markdown_dir: Directory of markdown policy documents indexed next
+                to the policy dicts (None to index the dicts only); edits are
+                picked up every POLICY_REFRESH_SECONDS (default 2)
+        
+        Results are cached per normalized query (see retrieval.query_terms)
+        and corpus version; RAG_CACHE_SIZE bounds the cache (default 1024).
+        """
+        self.retriever = retriever or os.getenv("RAG_RETRIEVER", "bm25")
+        self.vector_index_path = vector_index_path or os.getenv("POLICY_INDEX_PATH")
+        self._vector_index = None
+        self._lock = threading.RLock()
+        self.corpus = MarkdownCorpus(markdown_dir) if markdown_dir else None
+        self.refresh_interval = float(os.getenv("POLICY_REFRESH_SECONDS", "2"))
+        self._last_refresh = 0.0
+        # Bumped whenever indexed content changes; part of every cache key
+        self.version = 0
+        self.cache = TTLCache(maxsize=int(os.getenv("RAG_CACHE_SIZE", "1024")), ttl=3600.0)
+        # Policy snapshot the sections and helper methods below read from
+        self.policies = policy_store.current()
+        # Plain dicts/lists, returned as-is by retrieve()
+        self.knowledge = {key: self.policies.plain(key) for key in self.policies.sections}
+        self.index = TermIndex()
+        for key, terms in SECTION_TERMS.items():
+            self.index.add(key, terms)
+        # Leaf-level passages ("fraud_policies.customer_liability.reported_within_24h")
+        self.passages = {}
+        self.passage_index = BM25Index()
+        self._index_passages(self.knowledge)
+        self.refresh_corpus()
+    
+    def _index_passages(self, sections: dict):
+        for path, text in flatten_policies(sections):
+            self.passages[path] = text
+            self.passage_index.add(path, text)
+    
+    def refresh_corpus(self) -> int:
+        """
+        Re-index markdown chunks that were added, edited or deleted
+        
+        Returns:
+            Number of chunks re-indexed or removed
+        """
+        self._last_refresh = time.monotonic()
+        if self.corpus is None:
+            return 0
+        changed, removed = self.corpus.refresh()
+        if not changed and not removed:
+            return 0
+        with self._lock:
+            for path in removed:
+                self.passages.pop(path, None)
+                self.passage_index.remove(path)
+            for path, text in changed.items():
+                self.passages[path] = text
+                self.passage_index.add(path, text)
+            if self._vector_index is not None:
+                self._vector_index.sync(self.passages)
+            self._content_changed()
+        return len(changed) + len(removed)
+    
+    def _content_changed(self):
+        self.version += 1
+        self.cache.clear()
+    
+    def _refresh_if_due(self):
+        # The store throttles its own checks; a reload reaches load_policies
+        policy_store.refresh_if_due()
+        if time.monotonic() - self._last_refresh >= self.refresh_interval:
+            self.refresh_corpus()
+    
+    def _current_policies(self) -> PolicySnapshot:
+        policy_store.refresh_if_due()
+        return self.policies
+    
+    def _replace_section(self, key: str, content):
+        self.knowledge[key] = content
+        for path in [p for p in self.passages if p == key or p.startswith(key + ".")]:
+            del self.passages[path]
+            self.passage_index.remove(path)
+        self._index_passages({key: content})
+    
+    def load_policies(self, snapshot: PolicySnapshot):
+        """
+        Switch to a new policy snapshot (policy_store reload subscriber)
+        
+        Only sections whose content changed are re-indexed; the retrieval
+        cache is invalidated through the version bump.
+        
+        Args:
+            snapshot: Newly published PolicySnapshot
+        """
+        with self._lock:
+            for key in snapshot.sections:
+                content = snapshot.plain(key)
+                if self.knowledge.get(key) != content:
+                    self._replace_section(key, content)
+            self.policies = snapshot
+            if self._vector_index is not None:
+                self._vector_index.sync(self.passages)
+            self._content_changed()
+    
+    def add_section(self, key: str, content: dict, terms: list):
+        """
+        Add (or extend) a knowledge section and index its query terms
+        
+        Args:
+            key: Section key returned by retrieve()
+            content: Section content
+            terms: Query words/phrases that should retrieve the section
+        """
+        with self._lock:
+            self.index.add(key, terms)
+            self._replace_section(key, content)
+            if self._vector_index is not None:
+                self._vector_index.sync(self.passages)
+            self._content_changed()
+    
+    @property
+    def vector_index(self):
+        """Vector index over the passages, opened (and synced) on first use"""
+        with self._lock:
+            if self._vector_index is None:
+                from .vector_index import VectorIndex
+                index = VectorIndex(self.vector_index_path)
+                index.sync(self.passages)
+                self._vector_index = index
+            return self._vector_index
     
     def retrieve(self, query: str) -> dict:
         """
         Retrieve relevant information based on query
         
+        Looks each query word (and short phrase) up in the section term index
+        instead of scanning every section's keywords.
+        
         Args:
             query: Natural language query
             
         Returns:
             Relevant knowledge base information
         """
-        query_lower = query.lower()
-        results = {}
-        
-        # Transaction lifecycle queries
-        if any(word in query_lower for word in ["transaction", "pending", "completed", "status"]):
-            results["transaction_lifecycle"] = TRANSACTION_LIFECYCLE
-        
-        # Fraud policy queries
-        if any(word in query_lower for word in ["fraud", "unauthorized", "suspicious"]):
-            results["fraud_policies"] = FRAUD_POLICIES
-            results["fraud_sla"] = FRAUD_SLA
+        self._refresh_if_due()
+        terms = query_terms(query)
+        keys = self.cache.get_or_load(
+            ("sections", self.version, terms),
+            lambda: self.index.lookup_terms(terms)
+        )
+        return {key: self.knowledge[key] for key in keys}
+    
+    def retrieve_many(self, queries: list, processes: int = None, chunk_size: int = 5000) -> list:
+        """
+        Retrieve for a batch of queries (same results as retrieve() per query)
         
-        # Card block queries
-        if any(word in query_lower for word in ["block", "unblock", "card", "stop"]):
-            results["card_block_rules"] = CARD_BLOCK_RULES
+        Each distinct query is normalized and looked up once, however often
+        it repeats in the batch, and word stems are memoized across it. With
+        processes > 1 the distinct queries are split into chunks and fanned
+        out to a process pool; this only pays off for very large batches.
+        The retrieval cache is bypassed so offline batches don't evict live
+        entries.
         
-        # Dispute queries
-        if any(word in query_lower for word in ["dispute", "ticket", "complaint"]):
-            results["dispute_process"] = DISPUTE_PROCESS
+        Args:
+            queries: List of natural language queries
+            processes: Worker processes (None or 1 runs in this process)
+            chunk_size: Distinct queries per worker task
+            
+        Returns:
+            List of result dicts, in query order
+        """
+        self._refresh_if_due()
+        distinct = list(dict.fromkeys(queries))
+        if processes and processes > 1 and len(distinct) > chunk_size:
+            batches = [distinct[i:i + chunk_size] for i in range(0, len(distinct), chunk_size)]
+            with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(self.index,)) as pool:
+                keys = [result for batch in pool.map(_lookup_batch, batches) for result in batch]
+        else:
+            keys = [self.index.lookup(query) for query in distinct]
+        results = {
+            query: {key: self.knowledge[key] for key in matched}
+            for query, matched in zip(distinct, keys)
+        }
+        return [dict(results[query]) for query in queries]
+    
+    def retrieve_top_k(self, query: str, k: int = 3) -> list:
+        """
+        Retrieve the k policy passages that best match a query
         
-        # SLA queries
-        if any(word in query_lower for word in ["sla", "timeline", "how long", "when"]):
-            results["fraud_sla"] = FRAUD_SLA
+        Unlike retrieve(), which returns whole policy sections, this returns
+        individual leaves (and markdown document sections), keeping the
+        context passed to the LLM small. Passages are ranked with BM25, or
+        by embedding similarity when the retriever is "vector".
         
-        # Compliance queries
-        if any(word in query_lower for word in ["compliance", "rbi", "pci", "regulation"]):
-            results["compliance_rules"] = COMPLIANCE_RULES
+        Args:
+            query: Natural language query
+            k: Number of passages
+            
+        Returns:
+            List of (path, text, score) tuples, best first
+        """
+        self._refresh_if_due()
+        if self.retriever not in ("bm25", "vector"):
+            raise ValueError(f"Unknown retriever: {self.retriever}")
+        terms = query_terms(query)
+        return list(self.cache.get_or_load(
+            ("passages", self.version, self.retriever, k, terms),
+            lambda: self._rank_passages(query, terms, k)
+        ))
+    
+    def _rank_passages(self, query: str, terms: tuple, k: int) -> list:
+        if self.retriever == "vector":
+            return self.vector_index.search(query, k)
+        with self._lock:
+            return [(path, self.passages[path], score) for path, score in self.passage_index.search_terms(terms, k)]
+    
+    def build_context(self, query: str, max_tokens: int = None, max_chars: int = None) -> PackedContext:
+        """
+        Build budgeted prompt context for a query
         
-        # Escalation queries
-        if any(word in query_lower for word in ["escalate", "human", "manager", "senior"]):
-            results["escalation_rules"] = ESCALATION_RULES
+        Candidates are the leaf passages of the sections retrieve() selects
+        plus any other passage (including markdown sections) sharing a term
+        with the query. They are ranked by BM25 score - unscored leaves of
+        the selected sections follow in document order - and packed with
+        ContextPacker, which reports what did not fit.
         
-        return results
+        Args:
+            query: Natural language query
+            max_tokens: Token budget (see ContextPacker for the default)
+            max_chars: Character budget (optional)
+            
+        Returns:
+            PackedContext (str() gives the context text)
+        """
+        self._refresh_if_due()
+        terms = query_terms(query)
+        with self._lock:
+            sections = set(self.index.lookup_terms(terms))
+            scores = dict(self.passage_index.search_terms(terms, len(self.passage_index)))
+            candidates = [
+                (path, text, scores.get(path, 0.0))
+                for path, text in self.passages.items()
+                if path in scores or path.split(".", 1)[0] in sections
+            ]
+        candidates.sort(key=lambda passage: passage[2], reverse=True)
+        return ContextPacker(max_tokens, max_chars).pack(candidates)
+    
+    def cache_stats(self) -> dict:
+        """Retrieval cache counters (hit rate, size, evictions)"""
+        return dict(self.cache.stats(), version=self.version)
     
     def get_card_block_policy(self) -> dict:
         """Get card blocking policy"""
-        return CARD_BLOCK_RULES
+        return self._current_policies().plain("card_block_rules")
     
     def get_fraud_sla(self) -> dict:
         """Get fraud handling SLA timelines"""
-        return FRAUD_SLA
+        return self._current_policies().plain("fraud_sla")
     
     def get_dispute_process(self) -> dict:
         """Get dispute and ticket process"""
-        return DISPUTE_PROCESS
+        return self._current_policies().plain("dispute_process")
     
     def get_compliance_rules(self) -> dict:
         """Get regulatory compliance rules"""
-        return COMPLIANCE_RULES
+        return self._current_policies().plain("compliance_rules")
     
     def can_block_card(self, transaction_status: str) -> bool:
         """Check if card can be blocked for given transaction status"""
-        lifecycle = TRANSACTION_LIFECYCLE.get(transaction_status, {})
-        return lifecycle.get("can_block", False)
+        return self._current_policies().get(f"transaction_lifecycle.{transaction_status}.can_block", False)
     
     def requires_customer_consent(self, action: str) -> bool:
         """Check if action requires customer consent"""
         if action in ["block_card", "raise_dispute", "stop_transaction"]:
-            return COMPLIANCE_RULES["rbi_guidelines"]["customer_consent"] == "Mandatory for all actions"
+            return self._current_policies()["compliance_rules.rbi_guidelines.customer_consent"] == "Mandatory for all actions"
         return False
     
     def get_sla_for_action(self, action: str) -> str:
         """Get SLA timeline for specific action"""
-        return FRAUD_SLA.get(action, "Not specified")
+        return self._current_policies().get(f"fraud_sla.{action}", "Not specified")
     
     def should_escalate(self, scenario: str) -> bool:
         """Check if scenario requires escalation"""
-        return scenario in ESCALATION_RULES["auto_escalate"]
+        return scenario in self._current_policies()["escalation_rules.auto_escalate"]
     
     def format_sms(self, sms_type: str, **kwargs) -> str:
-        """Format SMS message based on template"""
-        template_info = SMS_FORMATS.get(sms_type, {})
-        template = template_info.get("template", "")
-        return template.format(**kwargs)
+        """Format SMS message based on template (precompiled, see knowledge_base.sms)"""
+        template = SMS_TEMPLATES.get(sms_type)
+        return template.render(kwargs) if template else ""
 
-# Global RAG instance
+# Global RAG instance, kept on the latest policy snapshot
 rag = KnowledgeBaseRAG()
+policy_store.subscribe(rag.load_policies)
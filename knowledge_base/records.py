@@ -0,0 +1,196 @@
+"""Compact transaction record - __slots__ storage with dict-style read access"""
+
+import calendar
+import sys
+from collections.abc import Mapping
+from datetime import date, datetime
+
+# Marks an optional field that is absent from the record
+_MISSING = object()
+
+# Accepted `date` formats; the first one is date-only (no hour)
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %I:%M %p",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S"
+)
+
+
+def parse_timestamp(value: str) -> tuple:
+    """
+    Parse a transaction `date` string
+
+    Naive times are treated as UTC wall-clock time.
+
+    Args:
+        value: e.g. "2026-01-23" or "2026-02-05 02:30 AM"
+
+    Returns:
+        (epoch_seconds, hour) - hour is None for date-only values
+
+    Raises:
+        ValueError: If the value matches none of DATE_FORMATS
+    """
+    value = value.strip()
+    for i, fmt in enumerate(DATE_FORMATS):
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        return calendar.timegm(parsed.timetuple()), (None if i == 0 else parsed.hour)
+    raise ValueError(f"Unrecognised transaction date: {value!r}")
+
+
+def to_epoch(value) -> int:
+    """
+    Convert epoch seconds (int or float), a datetime, a date or a date string
+    to epoch seconds
+
+    Aware datetimes are converted using their tzinfo; naive datetimes, dates
+    and strings are UTC wall-clock time, like parse_timestamp.
+    """
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return int(value.timestamp())
+    if isinstance(value, date):
+        return calendar.timegm(value.timetuple())
+    return parse_timestamp(value)[0]
+
+
+def normalize_transaction(transaction):
+    """
+    Add the parsed `timestamp` (epoch seconds) and `hour` fields once
+
+    Transactions that already carry a timestamp are returned unchanged.
+
+    Args:
+        transaction: Transaction dict or TransactionRecord
+
+    Returns:
+        Transaction with `timestamp` (and `hour` when the date has a time)
+
+    Raises:
+        ValueError: If the `date` field cannot be parsed
+    """
+    if "timestamp" in transaction:
+        return transaction
+    timestamp, hour = parse_timestamp(transaction.get("date", ""))
+    normalized = dict(transaction)
+    normalized["timestamp"] = timestamp
+    if hour is not None:
+        normalized["hour"] = hour
+    return normalized
+
+
+def transaction_hour(transaction):
+    """Hour of day for a transaction, or None if only the date is known"""
+    if "timestamp" in transaction:
+        return transaction.get("hour")
+    try:
+        return parse_timestamp(transaction.get("date", ""))[1]
+    except ValueError:
+        return None
+
+
+class TransactionRecord(Mapping):
+    """
+    Read-only, dict-compatible transaction
+
+    Fields live in __slots__ instead of a per-record hash table, and
+    low-cardinality strings (merchant, category, location, ...) are interned
+    so repeated values share one object. Existing callers keep working:
+    txn['amount'], txn.get('fraud_score', 0), 'fraud_score' in txn, dict(txn)
+    and iteration all behave like the original dict. Optional fields that
+    were not present in the source dict stay absent.
+    """
+
+    FIELDS = (
+        "transaction_id",
+        "date",
+        "timestamp",
+        "hour",
+        "amount",
+        "merchant",
+        "merchant_category",
+        "status",
+        "location",
+        "card_last_4",
+        "fraud_score",
+        "transaction_time",
+        "merchant_status"
+    )
+    INTERNED = frozenset((
+        "date",
+        "merchant",
+        "merchant_category",
+        "status",
+        "location",
+        "card_last_4",
+        "transaction_time",
+        "merchant_status"
+    ))
+
+    __slots__ = FIELDS + ("_extra",)
+
+    def __init__(self, values: dict):
+        for field in self.FIELDS:
+            value = values.get(field, _MISSING)
+            if field in self.INTERNED and type(value) is str:
+                value = sys.intern(value)
+            object.__setattr__(self, field, value)
+        extra = {k: v for k, v in values.items() if k not in _FIELD_SET}
+        object.__setattr__(self, "_extra", extra or None)
+
+    @classmethod
+    def from_dict(cls, values) -> "TransactionRecord":
+        """Convert a transaction dict (records are returned unchanged)"""
+        if isinstance(values, cls):
+            return values
+        return cls(values)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TransactionRecord is read-only; store a new record instead")
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return value
+        elif self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            return default if value is _MISSING else value
+        if self._extra:
+            return self._extra.get(key, default)
+        return default
+
+    def __contains__(self, key) -> bool:
+        if key in _FIELD_SET:
+            return getattr(self, key) is not _MISSING
+        return bool(self._extra) and key in self._extra
+
+    def __iter__(self):
+        for field in self.FIELDS:
+            if getattr(self, field) is not _MISSING:
+                yield field
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"TransactionRecord({dict(self)!r})"
+
+    def __reduce__(self):
+        return (TransactionRecord, (dict(self),))
+
+
+_FIELD_SET = frozenset(TransactionRecord.FIELDS)
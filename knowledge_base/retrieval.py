@@ -0,0 +1,211 @@
+"""Tokenization and inverted-index lookup for knowledge base retrieval"""
+
+import heapq
+import math
+import re
+from functools import lru_cache
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Suffixes stripped by stem(), longest first
+SUFFIXES = ("ions", "ion", "ing", "ed", "es", "s", "e")
+MIN_STEM_LENGTH = 3
+
+# Function words ignored in queries (question words such as "how"/"when"
+# are kept - they select SLA content)
+STOP_WORDS = frozenset([
+    "a", "an", "and", "are", "as", "at", "be", "been", "but", "by", "can", "could",
+    "do", "does", "did", "for", "from", "had", "has", "have", "i", "if", "in", "into",
+    "is", "it", "its", "me", "my", "of", "on", "or", "our", "please", "so", "that",
+    "the", "their", "them", "there", "these", "they", "this", "to", "us", "was",
+    "we", "were", "will", "with", "would", "you", "your"
+])
+
+
+def tokenize(text: str) -> list:
+    """Lowercase word tokens of a text"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+@lru_cache(maxsize=65536)
+def stem(token: str) -> str:
+    """
+    Light suffix stemmer so inflections share one index term
+
+    ("blocked", "blocking", "blocks" -> "block"; "escalate", "escalation" -> "escalat")
+    """
+    if token.endswith("ss"):
+        return token
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+            token = token[:-len(suffix)]
+            # "stopped" -> "stopp" -> "stop" (but keep "pass", "call", "add")
+            if (suffix in ("ed", "ing") and len(token) > MIN_STEM_LENGTH
+                    and token[-1] == token[-2] and token[-1] not in "aeioudls"):
+                token = token[:-1]
+            break
+    return token
+
+
+# STOP_WORDS as they appear after stemming
+STOP_STEMS = frozenset(stem(word) for word in STOP_WORDS)
+
+
+def analyze(text: str) -> list:
+    """Tokenize and stem a text"""
+    return [stem(token) for token in tokenize(text)]
+
+
+def query_terms(query: str) -> tuple:
+    """
+    Normalized form of a query: sorted, de-duplicated stems without stop words
+
+    Both indexes rank on exactly this form, so queries that normalize alike
+    ("how long for new card", "new card - how long?") retrieve the same
+    results and can share a cache entry.
+    """
+    return tuple(sorted({term for term in analyze(query) if term not in STOP_STEMS}))
+
+
+class TermIndex:
+    """
+    Inverted index from terms (single words or short phrases) to keys
+
+    Terms are analyzed with the same tokenizer/stemmer as queries. A phrase
+    such as "how long" matches when all of its words occur in the query, and
+    is filed under its first word, so a lookup probes the index once per
+    query term and its cost grows with query length, not with the number of
+    indexed keys. Matching keys are returned in the order they were first added.
+    """
+
+    def __init__(self):
+        self._postings = {}
+        # first stem -> [(phrase stems, key)]
+        self._phrases = {}
+        self._order = {}
+
+    def add(self, key: str, terms):
+        """
+        Index a key under terms
+
+        Args:
+            key: Key returned by lookup()
+            terms: Words or phrases (e.g. "how long") that should match the key
+        """
+        self._order.setdefault(key, len(self._order))
+        for term in terms:
+            stems = [stem for stem in analyze(term) if stem not in STOP_STEMS]
+            if len(stems) == 1:
+                self._postings.setdefault(stems[0], set()).add(key)
+            elif stems:
+                self._phrases.setdefault(stems[0], []).append((frozenset(stems), key))
+
+    def lookup(self, query: str) -> list:
+        """
+        Keys matched by any term in a query
+
+        Args:
+            query: Natural language query
+
+        Returns:
+            List of keys in insertion order
+        """
+        return self.lookup_terms(query_terms(query))
+
+    def lookup_terms(self, terms) -> list:
+        """lookup() for a query already reduced by query_terms()"""
+        terms = set(terms)
+        matched = set()
+        for term in terms:
+            keys = self._postings.get(term)
+            if keys:
+                matched |= keys
+            for stems, key in self._phrases.get(term, ()):
+                if stems <= terms:
+                    matched.add(key)
+        return sorted(matched, key=self._order.__getitem__)
+
+    def __len__(self) -> int:
+        return len(self._postings) + sum(len(p) for p in self._phrases.values())
+
+
+class BM25Index:
+    """
+    Okapi BM25 ranking over short text passages
+
+    Postings map each stemmed term to {doc_id: term frequency}, so a search
+    touches only the documents that share a term with the query. Adding a
+    doc_id that is already indexed replaces it.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = {}
+        # doc_id -> (stemmed terms, insertion order)
+        self._docs = {}
+        self._total_length = 0
+        self._next_order = 0
+
+    def add(self, doc_id, text: str):
+        """Index (or re-index) a document"""
+        if doc_id in self._docs:
+            self.remove(doc_id)
+        terms = analyze(text)
+        self._docs[doc_id] = (terms, self._next_order)
+        self._next_order += 1
+        self._total_length += len(terms)
+        for term in terms:
+            postings = self._postings.setdefault(term, {})
+            postings[doc_id] = postings.get(doc_id, 0) + 1
+
+    def remove(self, doc_id):
+        """Drop a document from the index (no-op if absent)"""
+        entry = self._docs.pop(doc_id, None)
+        if entry is None:
+            return
+        terms = entry[0]
+        self._total_length -= len(terms)
+        for term in set(terms):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+    def idf(self, term: str) -> float:
+        """Inverse document frequency of a stemmed term"""
+        df = len(self._postings.get(term, ()))
+        return math.log(1 + (len(self._docs) - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, k: int = 5) -> list:
+        """
+        Rank documents against a query
+
+        Args:
+            query: Natural language query
+            k: Number of results
+
+        Returns:
+            Up to k (doc_id, score) tuples, best first (ties keep insertion order)
+        """
+        return self.search_terms(query_terms(query), k)
+
+    def search_terms(self, terms, k: int = 5) -> list:
+        """search() for a query already reduced by query_terms()"""
+        if not self._docs:
+            return []
+        average_length = self._total_length / len(self._docs)
+        scores = {}
+        for term in set(terms):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for doc_id, tf in postings.items():
+                length = len(self._docs[doc_id][0])
+                norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -self._docs[item[0]][1]))
+
+    def __len__(self) -> int:
+        return len(self._docs)
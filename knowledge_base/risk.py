@@ -0,0 +1,103 @@
+"""Transaction risk rules shared by the agent, the stores and batch scoring"""
+
+from .records import transaction_hour
+
+# Fraud score above which a transaction is treated as suspicious
+FRAUD_SCORE_THRESHOLD = 0.7
+
+# Pending transactions above this amount are a risk factor
+HIGH_VALUE_PENDING_AMOUNT = 5000
+
+# Late-night window: hour >= start or hour < end
+LATE_NIGHT_START_HOUR = 23
+LATE_NIGHT_END_HOUR = 5
+
+# Number of risk factors that makes a transaction unusual
+UNUSUAL_MIN_FACTORS = 2
+
+# Risk factor names, in evaluation order
+RISK_FACTORS = [
+    "high_fraud_score",
+    "international",
+    "late_night",
+    "new_merchant",
+    "high_value_pending",
+    "unknown_merchant"
+]
+
+def risk_factors(txn: dict) -> list:
+    """
+    Evaluate the risk factors present on a transaction
+
+    Args:
+        txn: Transaction dictionary
+
+    Returns:
+        List of risk factor names (subset of RISK_FACTORS, in order)
+    """
+    factors = []
+
+    if txn.get('fraud_score', 0) > FRAUD_SCORE_THRESHOLD:
+        factors.append("high_fraud_score")
+
+    if 'international' in txn.get('location', '').lower():
+        factors.append("international")
+
+    if is_late_night(txn):
+        factors.append("late_night")
+
+    if txn.get('merchant_status') == 'Newly added':
+        factors.append("new_merchant")
+
+    if txn.get('status') == 'pending' and txn.get('amount', 0) > HIGH_VALUE_PENDING_AMOUNT:
+        factors.append("high_value_pending")
+
+    if 'unknown' in txn.get('merchant', '').lower():
+        factors.append("unknown_merchant")
+
+    return factors
+
+def is_late_hour(hour: int) -> bool:
+    """Check whether an hour of day falls in the late-night window"""
+    return hour >= LATE_NIGHT_START_HOUR or hour < LATE_NIGHT_END_HOUR
+
+def is_late_night(txn: dict) -> bool:
+    """
+    Check whether a transaction happened late at night
+
+    Uses the parsed hour when the date carries a time; date-only
+    transactions fall back to the free-text transaction_time field.
+    """
+    hour = transaction_hour(txn)
+    if hour is not None:
+        return is_late_hour(hour)
+    return bool(txn.get('transaction_time')) and 'late' in txn.get('transaction_time', '').lower()
+
+def is_suspicious(txn: dict) -> bool:
+    """Check whether a transaction has a high fraud score"""
+    return txn.get("fraud_score", 0) > FRAUD_SCORE_THRESHOLD
+
+def is_unusual(txn: dict) -> bool:
+    """Check whether a transaction has enough risk factors to alert on"""
+    return len(risk_factors(txn)) >= UNUSUAL_MIN_FACTORS
+
+# Flag bits for the materialized views (stored per row by the SQLite store)
+FLAG_SUSPICIOUS = 1
+FLAG_UNUSUAL = 2
+
+def risk_flags(txn: dict) -> int:
+    """
+    Bitmask of the views a transaction belongs to
+
+    Args:
+        txn: Transaction dictionary
+
+    Returns:
+        FLAG_SUSPICIOUS | FLAG_UNUSUAL bits (0 when neither applies)
+    """
+    flags = 0
+    if is_suspicious(txn):
+        flags |= FLAG_SUSPICIOUS
+    if is_unusual(txn):
+        flags |= FLAG_UNUSUAL
+    return flags
@@ -0,0 +1,264 @@
+"""Conversation session state - explicit schema, msgpack encoding and storage backends"""
+
+import os
+import sqlite3
+import time
+from operator import itemgetter
+from typing import TypedDict
+
+import msgpack
+
+from .cache import TTLCache
+from .connection_pool import ConnectionPool
+
+
+class SessionState(TypedDict, total=False):
+    """Conversation state of one session (the graph runner's state schema)"""
+    stage: str
+    user_input: str
+    response: str
+    trace: dict
+    selected_option: str
+    verification_attempts: int
+    mobile_number: str
+    customer_id: str
+    customer_name: str
+    last_4: str
+    pending_transaction: dict
+    general_query: str
+    fraud_check_done: bool
+
+
+# State of a session that has not had a turn yet
+NEW_SESSION = {
+    "stage": "initial",
+    "user_input": "",
+    "response": None,
+    "trace": None,
+    "selected_option": None,
+    "verification_attempts": 0,
+    "mobile_number": None,
+    "customer_id": None,
+    "customer_name": None,
+    "last_4": None,
+    "pending_transaction": None,
+    "general_query": None,
+    "fraud_check_done": False
+}
+
+# Fields that outlive a turn, in encoded order. user_input, response and
+# trace belong to a single turn and are not stored. Append new fields at
+# the end (older records decode with the NEW_SESSION default); reordering
+# or removing one needs a new SESSION_FORMAT.
+SESSION_FIELDS = (
+    "stage",
+    "selected_option",
+    "verification_attempts",
+    "mobile_number",
+    "customer_id",
+    "customer_name",
+    "last_4",
+    "pending_transaction",
+    "general_query",
+    "fraud_check_done"
+)
+
+SESSION_FORMAT = 1
+
+_session_values = itemgetter(*SESSION_FIELDS)
+
+
+def encode_session(state: dict) -> bytes:
+    """
+    Serialize the persistent fields of a session
+
+    The record is a msgpack array [SESSION_FORMAT, *values in SESSION_FIELDS
+    order] - no field names are stored.
+
+    Args:
+        state: Session state (missing fields take their NEW_SESSION default)
+
+    Returns:
+        Encoded bytes
+    """
+    try:
+        values = _session_values(state)
+    except KeyError:
+        values = tuple(state.get(field, NEW_SESSION[field]) for field in SESSION_FIELDS)
+    return msgpack.packb((SESSION_FORMAT, *values))
+
+
+def decode_session(data: bytes) -> dict:
+    """
+    Rebuild a full session state from encode_session output
+
+    Raises:
+        ValueError: If the record was written in another format
+    """
+    values = msgpack.unpackb(data)
+    if values[0] != SESSION_FORMAT:
+        raise ValueError(f"Unsupported session format: {values[0]}")
+    state = dict(NEW_SESSION)
+    state.update(zip(SESSION_FIELDS, values[1:]))
+    return state
+
+
+class SessionStore:
+    """
+    Storage interface for session state
+
+    Sessions are stored encoded (see encode_session), so every get returns
+    an independent copy and any worker sharing the backend can continue any
+    session. Sessions not written for `ttl` seconds expire.
+    """
+
+    def get(self, session_id: str) -> dict:
+        """Get a session's state, or None if unknown or expired"""
+        data = self.get_encoded(session_id)
+        return decode_session(data) if data is not None else None
+
+    def put(self, session_id: str, state: dict):
+        """Store a session's state"""
+        self.put_encoded(session_id, encode_session(state))
+
+    def get_encoded(self, session_id: str) -> bytes:
+        """Get a session's encoded state, or None"""
+        raise NotImplementedError
+
+    def put_encoded(self, session_id: str, data: bytes):
+        """Store a session's encoded state, resetting its expiry"""
+        raise NotImplementedError
+
+    def delete(self, session_id: str):
+        """Remove a session"""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local store - encoded sessions in a TTLCache (LRU beyond maxsize)"""
+
+    def __init__(self, ttl: float = 1800.0, maxsize: int = 100000):
+        self._sessions = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get_encoded(self, session_id: str) -> bytes:
+        return self._sessions.get(session_id)
+
+    def put_encoded(self, session_id: str, data: bytes):
+        self._sessions.set(session_id, data)
+
+    def delete(self, session_id: str):
+        self._sessions.invalidate(session_id)
+
+    def __len__(self) -> int:
+        return self._sessions.stats()["size"]
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite-backed store shared by every worker on the host
+
+    Stands in for a networked key-value store such as Redis: one row per
+    session, keyed by session_id, with an expiry time. Expired rows are
+    ignored on read and removed by purge_expired().
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id TEXT PRIMARY KEY,
+            state BLOB NOT NULL,
+            expires_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at);
+    """
+
+    def __init__(self, path: str = ":memory:", ttl: float = 1800.0, pool_size: int = 4):
+        self.path = path
+        self.ttl = ttl
+        if path == ":memory:":
+            pool_size = 1
+        self.pool = ConnectionPool(self._connect, pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        if self.path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def get_encoded(self, session_id: str) -> bytes:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT state FROM sessions WHERE session_id = ? AND expires_at > ?",
+                (session_id, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_encoded(self, session_id: str, data: bytes):
+        with self.pool.connection() as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)",
+                (session_id, data, time.time() + self.ttl),
+            )
+
+    def delete(self, session_id: str):
+        with self.pool.connection() as conn, conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def purge_expired(self) -> int:
+        """
+        Delete expired sessions
+
+        Returns:
+            Number of sessions deleted
+        """
+        with self.pool.connection() as conn, conn:
+            return conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def __len__(self) -> int:
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM sessions WHERE expires_at > ?", (time.time(),)).fetchone()[0]
+
+    def close(self):
+        """Close the pooled connections"""
+        self.pool.close()
+
+
+# Active session store; created on first use (see get_session_store)
+_store = None
+
+def create_session_store(backend: str = None, path: str = None, ttl: float = None) -> SessionStore:
+    """
+    Create a session store
+
+    Args:
+        backend: "memory" or "sqlite" (defaults to SESSION_STORE env var, then "memory")
+        path: SQLite database path (defaults to SESSION_DB_PATH env var, then "sessions.db")
+        ttl: Idle seconds before a session expires (defaults to SESSION_TTL_SECONDS env var, then 1800)
+
+    Returns:
+        SessionStore instance
+    """
+    backend = backend or os.getenv("SESSION_STORE", "memory")
+    ttl = ttl if ttl is not None else float(os.getenv("SESSION_TTL_SECONDS", "1800"))
+    if backend == "memory":
+        return InMemorySessionStore(ttl)
+    if backend == "sqlite":
+        return SQLiteSessionStore(path or os.getenv("SESSION_DB_PATH", "sessions.db"), ttl)
+    raise ValueError(f"Unknown session store backend: {backend}")
+
+def get_session_store() -> SessionStore:
+    """Get the active session store, creating the default one if needed"""
+    global _store
+    if _store is None:
+        _store = create_session_store()
+    return _store
+
+def set_session_store(store: SessionStore):
+    """Replace the active session store (e.g. with a SQLite one shared by several workers)"""
+    global _store
+    _store = store
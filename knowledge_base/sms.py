@@ -0,0 +1,140 @@
+"""Precompiled SMS templates and bulk message rendering"""
+
+from string import Formatter
+
+from .policy_store import policy_store
+
+
+class SMSTemplate:
+    """
+    An SMS template parsed once into a %-style mapping format
+
+    "Card ending {last4} ..." compiles to "Card ending %(last4)s ...", so
+    rendering is a single C-level string operation per message instead of
+    re-parsing the template in str.format. Output is identical to
+    template.format(**fields) for plain {name} fields; templates using
+    format specs or conversions keep using str.format.
+    """
+
+    def __init__(self, template: str, name: str = ""):
+        self.template = template
+        self.name = name
+        parts = []
+        fields = []
+        plain = True
+        for literal, field, spec, conversion in Formatter().parse(template):
+            parts.append(literal.replace("%", "%%"))
+            if field is None:
+                continue
+            if not field.isidentifier() or spec or conversion:
+                plain = False
+            fields.append(field)
+            parts.append(f"%({field})s")
+        # Required fields in template order
+        self.fields = tuple(dict.fromkeys(fields))
+        self._format = "".join(parts) if plain else None
+
+    def missing(self, fields) -> list:
+        """Required fields absent from a mapping"""
+        return [name for name in self.fields if name not in fields]
+
+    def validate(self, fields):
+        """Raise KeyError naming every required field absent from a mapping"""
+        missing = self.missing(fields)
+        if missing:
+            raise KeyError(f"SMS template '{self.name}' missing fields: {', '.join(missing)}")
+
+    def render(self, fields) -> str:
+        """
+        Render one message
+
+        Args:
+            fields: Mapping of template field -> value (extra keys are ignored)
+
+        Returns:
+            Message text
+        """
+        try:
+            if self._format is None:
+                return self.template.format_map(fields)
+            return self._format % fields
+        except KeyError:
+            self.validate(fields)
+            raise
+
+    def render_bulk(self, rows):
+        """
+        Lazily render one message per row
+
+        Args:
+            rows: Iterable of field mappings
+
+        Yields:
+            Message text, in row order
+        """
+        if self._format is None:
+            for row in rows:
+                yield self.render(row)
+            return
+        template = self._format
+        for row in rows:
+            try:
+                yield template % row
+            except KeyError:
+                self.validate(row)
+                raise
+
+
+def compile_sms_templates(formats: dict = None) -> dict:
+    """
+    Compile every SMS template
+
+    Args:
+        formats: Mapping of sms_type -> {"template": ...} (defaults to the
+            current policy snapshot's sms_formats)
+
+    Returns:
+        Mapping of sms_type -> SMSTemplate
+    """
+    formats = policy_store.get("sms_formats", {}) if formats is None else formats
+    return {
+        sms_type: SMSTemplate(info.get("template", ""), sms_type)
+        for sms_type, info in formats.items()
+    }
+
+
+# Templates compiled from the current policy snapshot
+SMS_TEMPLATES = compile_sms_templates()
+
+def _recompile(snapshot):
+    """policy_store reload subscriber - swap templates in place, key by key"""
+    compiled = compile_sms_templates(snapshot.get("sms_formats", {}))
+    SMS_TEMPLATES.update(compiled)
+    for sms_type in [t for t in SMS_TEMPLATES if t not in compiled]:
+        SMS_TEMPLATES.pop(sms_type, None)
+
+policy_store.subscribe(_recompile)
+
+def get_sms_template(sms_type: str) -> SMSTemplate:
+    """Compiled template for an SMS type (KeyError if unknown)"""
+    try:
+        return SMS_TEMPLATES[sms_type]
+    except KeyError:
+        raise KeyError(f"Unknown SMS type: {sms_type}") from None
+
+def render_bulk(sms_type: str, rows):
+    """
+    Stream rendered SMS messages for a batch of recipients
+
+    The template was parsed once at import; each row costs one string
+    operation. A row missing a required field raises KeyError naming the
+    missing fields.
+
+    Args:
+        sms_type: Key in SMS_FORMATS (e.g. "card_blocked", "transaction_alert")
+        rows: Iterable of field dicts (e.g. a generator over a recipient file)
+
+    Yields:
+        Message text, in row order
+    """
+    return get_sms_template(sms_type).render_bulk(rows)
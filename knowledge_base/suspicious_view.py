@@ -0,0 +1,198 @@
+"""Materialized per-customer view of suspicious and unusual transactions"""
+
+import os
+import threading
+
+from .risk import FLAG_SUSPICIOUS, FLAG_UNUSUAL, risk_flags
+
+
+def _newest_first(transaction: dict) -> tuple:
+    return (transaction["timestamp"], transaction["transaction_id"])
+
+
+class SuspiciousView:
+    """
+    Per-customer sets of flagged transactions, maintained on ingest
+
+    The view listens to a TransactionStore and re-evaluates only the
+    transaction that was written, so reads never filter a customer's
+    history. Two sets are kept:
+      - suspicious: fraud_score above the threshold (graph runner alert)
+      - unusual: two or more risk factors (CLI agent alert)
+
+    Each set holds at most max_per_customer transactions per customer (the
+    newest). The view is seeded from store.iter_flagged(), an index lookup
+    on the SQLite store, and a capped customer whose set loses a member is
+    re-read from it, so memory does not grow with the ledger.
+
+    Subscribers registered with subscribe() are called as
+    callback(customer_id, transaction, view_name, flagged) whenever a
+    transaction enters (flagged=True) or leaves (flagged=False) a set.
+    """
+
+    VIEWS = {
+        "suspicious": FLAG_SUSPICIOUS,
+        "unusual": FLAG_UNUSUAL
+    }
+
+    def __init__(self, max_per_customer: int = None):
+        """
+        Args:
+            max_per_customer: Transactions kept per customer and view
+                (SUSPICIOUS_VIEW_MAX_PER_CUSTOMER env var, then 100)
+        """
+        self.max_per_customer = max_per_customer or int(os.getenv("SUSPICIOUS_VIEW_MAX_PER_CUSTOMER", "100"))
+        self._lock = threading.Lock()
+        self._store = None
+        # view name -> customer_id -> {transaction_id: transaction}
+        self._members = {name: {} for name in self.VIEWS}
+        # transaction_id -> customer_id for every member of either set
+        self._owners = {}
+        # (view name, customer_id) whose set was cut at max_per_customer
+        self._capped = set()
+        # (view name, customer_id) -> cached newest-first list
+        self._cache = {}
+        self._subscribers = []
+
+    def attach(self, store):
+        """
+        Build the view from a store and keep it updated on writes
+
+        Args:
+            store: TransactionStore to follow (replaces any previous one)
+        """
+        if self._store is not None:
+            self._store.unsubscribe(self.on_transaction)
+        with self._lock:
+            self._members = {name: {} for name in self.VIEWS}
+            self._owners = {}
+            self._capped = set()
+            self._cache = {}
+            self._store = store
+            for name, flag in self.VIEWS.items():
+                rows = store.iter_flagged(flag, per_customer=self.max_per_customer + 1)
+                self._fill(name, rows)
+        store.subscribe(self.on_transaction)
+
+    def _fill(self, name: str, rows):
+        # rows: (customer_id, transaction), newest first per customer
+        members = self._members[name]
+        for customer_id, transaction in rows:
+            customer_members = members.setdefault(customer_id, {})
+            if len(customer_members) >= self.max_per_customer:
+                self._capped.add((name, customer_id))
+                continue
+            customer_members[transaction["transaction_id"]] = transaction
+            self._owners[transaction["transaction_id"]] = customer_id
+
+    def _reload_customer(self, name: str, customer_id: str) -> list:
+        # Refill a capped set from the store after it lost a member;
+        # returns the transactions that came back into the set
+        self._capped.discard((name, customer_id))
+        old = self._members[name].pop(customer_id, {})
+        rows = self._store.iter_flagged(self.VIEWS[name], customer_id, self.max_per_customer + 1)
+        self._fill(name, rows)
+        for transaction_id in old:
+            self._release_owner(transaction_id, customer_id)
+        members = self._members[name].get(customer_id, {})
+        return [transaction for transaction_id, transaction in members.items() if transaction_id not in old]
+
+    def _release_owner(self, transaction_id: str, customer_id: str):
+        if not any(transaction_id in self._members[name].get(customer_id, ()) for name in self.VIEWS):
+            if self._owners.get(transaction_id) == customer_id:
+                del self._owners[transaction_id]
+
+    def _remove(self, name: str, customer_id: str, transaction_id: str) -> list:
+        # Returns the transactions refilled into a capped set (see _reload_customer)
+        members = self._members[name][customer_id]
+        del members[transaction_id]
+        if not members:
+            del self._members[name][customer_id]
+        self._cache.pop((name, customer_id), None)
+        refilled = []
+        if (name, customer_id) in self._capped:
+            refilled = self._reload_customer(name, customer_id)
+        self._release_owner(transaction_id, customer_id)
+        return refilled
+
+    def _trim(self, name: str, customer_id: str) -> dict:
+        # Evict the oldest member of an over-full set; returns it, or None
+        members = self._members[name][customer_id]
+        if len(members) <= self.max_per_customer:
+            return None
+        oldest = min(members.values(), key=_newest_first)
+        del members[oldest["transaction_id"]]
+        self._capped.add((name, customer_id))
+        self._release_owner(oldest["transaction_id"], customer_id)
+        return oldest
+
+    def subscribe(self, callback):
+        """Register callback(customer_id, transaction, view_name, flagged)"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """Remove a previously registered callback"""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def on_transaction(self, customer_id: str, transaction: dict):
+        """Store listener - re-evaluate one written transaction"""
+        transaction_id = transaction["transaction_id"]
+        flags = risk_flags(transaction)
+        changes = []
+        with self._lock:
+            owner = self._owners.get(transaction_id)
+            if owner is not None and owner != customer_id:
+                # Re-added under another customer: it leaves the old one's sets
+                for name in self.VIEWS:
+                    old = self._members[name].get(owner, {}).get(transaction_id)
+                    if old is not None:
+                        refilled = self._remove(name, owner, transaction_id)
+                        changes.append((owner, old, name, False))
+                        changes.extend((owner, added, name, True) for added in refilled)
+            for name, flag in self.VIEWS.items():
+                was_flagged = transaction_id in self._members[name].get(customer_id, ())
+                flagged = bool(flags & flag)
+                evicted = None
+                refilled = []
+                if flagged:
+                    self._members[name].setdefault(customer_id, {})[transaction_id] = transaction
+                    self._owners[transaction_id] = customer_id
+                    evicted = self._trim(name, customer_id)
+                    self._cache.pop((name, customer_id), None)
+                elif was_flagged:
+                    refilled = self._remove(name, customer_id, transaction_id)
+                if evicted is not None and evicted["transaction_id"] == transaction_id:
+                    # Older than a full capped set: it never enters (or it leaves)
+                    if was_flagged:
+                        changes.append((customer_id, evicted, name, False))
+                    continue
+                if flagged != was_flagged:
+                    changes.append((customer_id, transaction, name, flagged))
+                if evicted is not None:
+                    changes.append((customer_id, evicted, name, False))
+                changes.extend((customer_id, added, name, True) for added in refilled)
+        for owner, changed, name, flagged in changes:
+            for callback in self._subscribers:
+                callback(owner, changed, name, flagged)
+
+    def get(self, customer_id: str, view_name: str = "suspicious") -> list:
+        """
+        Get a customer's flagged transactions, newest first
+
+        Args:
+            customer_id: Customer identifier
+            view_name: "suspicious" or "unusual"
+
+        Returns:
+            List of transaction dictionaries (at most max_per_customer)
+        """
+        key = (view_name, customer_id)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return list(cached)
+        with self._lock:
+            members = self._members[view_name].get(customer_id, {})
+            ordered = sorted(members.values(), key=_newest_first, reverse=True)
+            self._cache[key] = ordered
+        return list(ordered)
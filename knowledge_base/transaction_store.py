@@ -0,0 +1,443 @@
+"""Transaction storage backends - in-memory and SQLite, behind one interface"""
+
+import bisect
+import json
+import sqlite3
+
+from .connection_pool import ConnectionPool
+from .records import TransactionRecord, normalize_transaction, to_epoch
+from .risk import risk_flags
+
+class TransactionStore:
+    """
+    Storage interface for transactions
+
+    Transactions are normalized on write (see records.normalize_transaction)
+    and ordered per customer by (timestamp, transaction_id), newest first.
+    Pagination is keyset based: pass the transaction_id of the last row you
+    received as `after` to get the next page. `since`/`until` bound the
+    epoch timestamp (since inclusive, until exclusive) and also accept
+    datetimes or date strings.
+
+    Listeners registered with subscribe() are called as
+    listener(customer_id, transaction) after every write, so derived views
+    can be maintained on ingest instead of recomputed on read.
+    """
+
+    def __init__(self):
+        self._listeners = []
+
+    def subscribe(self, listener):
+        """Register a listener(customer_id, transaction) called after writes"""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """Remove a previously registered listener"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, rows: list):
+        for listener in self._listeners:
+            for customer_id, transaction in rows:
+                listener(customer_id, transaction)
+
+    def add(self, customer_id: str, transaction: dict):
+        """Insert or replace a transaction for a customer"""
+        raise NotImplementedError
+
+    def update_fraud_score(self, transaction_id: str, fraud_score: float) -> dict:
+        """
+        Set a transaction's fraud_score
+
+        Args:
+            transaction_id: Transaction identifier
+            fraud_score: New fraud score
+
+        Returns:
+            Updated transaction, or None if not found
+        """
+        customer_id = self.customer_of(transaction_id)
+        if customer_id is None:
+            return None
+        transaction = dict(self.get(transaction_id))
+        transaction["fraud_score"] = fraud_score
+        self.add(customer_id, transaction)
+        return transaction
+
+    def iter_all(self):
+        """Yield (customer_id, transaction) for every stored transaction"""
+        raise NotImplementedError
+
+    def iter_flagged(self, flag: int, customer_id: str = None, per_customer: int = None):
+        """
+        Yield (customer_id, transaction) for transactions carrying a risk flag
+
+        This default scans iter_all() (or one customer's history); stores
+        that keep the flags indexed override it.
+
+        Args:
+            flag: risk.FLAG_* bit
+            customer_id: Only this customer's transactions (None for all)
+            per_customer: At most this many per customer, newest first
+
+        Yields:
+            (customer_id, transaction), newest first within each customer
+        """
+        if customer_id is not None:
+            rows = ((customer_id, t) for t in self.list_for_customer(customer_id))
+        else:
+            rows = self.iter_all()
+        flagged = {}
+        for owner, transaction in rows:
+            if risk_flags(transaction) & flag:
+                flagged.setdefault(owner, []).append(transaction)
+        for owner, transactions in flagged.items():
+            transactions.sort(key=_sort_key, reverse=True)
+            for transaction in transactions[:per_customer]:
+                yield owner, transaction
+
+    def get(self, transaction_id: str) -> dict:
+        """Get a transaction by ID, or None if not found"""
+        raise NotImplementedError
+
+    def customer_of(self, transaction_id: str) -> str:
+        """Get the customer_id that owns a transaction, or None"""
+        raise NotImplementedError
+
+    def list_for_customer(self, customer_id: str, limit: int = None, after: str = None,
+                          since=None, until=None) -> list:
+        """
+        List a customer's transactions, newest first
+
+        Args:
+            customer_id: Customer identifier
+            limit: Maximum number of transactions (None for all)
+            after: transaction_id cursor; only rows after it are returned
+            since: Only rows with timestamp >= since
+            until: Only rows with timestamp < until
+
+        Returns:
+            List of transaction dictionaries
+        """
+        raise NotImplementedError
+
+    def find_by_amount(self, customer_id: str, amount: float, tolerance: float, since=None) -> list:
+        """
+        Find a customer's transactions with amount within ±tolerance
+
+        Args:
+            customer_id: Customer identifier
+            amount: Amount to match
+            tolerance: Maximum absolute difference from amount
+            since: Only include transactions with timestamp >= since
+
+        Returns:
+            List of transactions, closest amount first (ties: newest first)
+        """
+        raise NotImplementedError
+
+    def add_many(self, customer_id: str, transactions: list):
+        """Insert or replace several transactions for a customer"""
+        self.add_batch([(customer_id, transaction) for transaction in transactions])
+
+    def add_batch(self, rows: list):
+        """Insert or replace a batch of (customer_id, transaction) rows"""
+        for customer_id, transaction in rows:
+            self.add(customer_id, transaction)
+
+    def load(self, transactions_by_customer: dict):
+        """Load a {customer_id: [transaction, ...]} mapping"""
+        for customer_id, transactions in transactions_by_customer.items():
+            self.add_many(customer_id, transactions)
+
+
+def _sort_key(transaction: dict) -> tuple:
+    return (transaction["timestamp"], transaction["transaction_id"])
+
+
+def _amount_key(transaction: dict) -> tuple:
+    return (float(transaction.get("amount", 0)), transaction["transaction_id"])
+
+
+def _rank_by_closeness(transactions: list, amount: float) -> list:
+    """Order matches by |amount difference|, newest first on ties"""
+    transactions = sorted(transactions, key=_sort_key, reverse=True)
+    return sorted(transactions, key=lambda t: abs(float(t.get("amount", 0)) - amount))
+
+
+class InMemoryTransactionStore(TransactionStore):
+    """
+    Dict-backed store with a primary ID index and per-customer orderings
+
+    Transactions are kept as compact TransactionRecord objects, which read
+    like the original dicts but take a fraction of the memory.
+    """
+
+    def __init__(self, transactions_by_customer: dict = None):
+        super().__init__()
+        self._by_id = {}
+        # customer_id -> ascending list of sort keys; iterated in reverse
+        self._order = {}
+        # customer_id -> ascending list of (amount, transaction_id)
+        self._amounts = {}
+        if transactions_by_customer:
+            self.load(transactions_by_customer)
+
+    def add(self, customer_id: str, transaction: dict):
+        transaction = TransactionRecord.from_dict(normalize_transaction(transaction))
+        transaction_id = transaction["transaction_id"]
+        existing = self._by_id.get(transaction_id)
+        if existing is not None:
+            old_customer, old_transaction = existing
+            keys = self._order[old_customer]
+            del keys[bisect.bisect_left(keys, _sort_key(old_transaction))]
+            amounts = self._amounts[old_customer]
+            del amounts[bisect.bisect_left(amounts, _amount_key(old_transaction))]
+        self._by_id[transaction_id] = (customer_id, transaction)
+        bisect.insort(self._order.setdefault(customer_id, []), _sort_key(transaction))
+        bisect.insort(self._amounts.setdefault(customer_id, []), _amount_key(transaction))
+        self._notify([(customer_id, transaction)])
+
+    def get(self, transaction_id: str) -> dict:
+        entry = self._by_id.get(transaction_id)
+        return entry[1] if entry else None
+
+    def iter_all(self):
+        for customer_id, transaction in list(self._by_id.values()):
+            yield customer_id, transaction
+
+    def customer_of(self, transaction_id: str) -> str:
+        entry = self._by_id.get(transaction_id)
+        return entry[0] if entry else None
+
+    def list_for_customer(self, customer_id: str, limit: int = None, after: str = None,
+                          since=None, until=None) -> list:
+        keys = self._order.get(customer_id, [])
+        end = len(keys)
+        if after is not None:
+            cursor = self._by_id.get(after)
+            if cursor is None or cursor[0] != customer_id:
+                return []
+            end = bisect.bisect_left(keys, _sort_key(cursor[1]))
+        if until is not None:
+            end = min(end, bisect.bisect_left(keys, (to_epoch(until), "")))
+        floor = 0 if since is None else bisect.bisect_left(keys, (to_epoch(since), ""))
+        start = floor if limit is None else max(floor, end - limit)
+        return [self._by_id[key[1]][1] for key in reversed(keys[start:end])]
+
+    def find_by_amount(self, customer_id: str, amount: float, tolerance: float, since=None) -> list:
+        amounts = self._amounts.get(customer_id, [])
+        lo = bisect.bisect_left(amounts, (amount - tolerance, ""))
+        hi = bisect.bisect_right(amounts, (amount + tolerance, "\uffff"))
+        matches = [self._by_id[key[1]][1] for key in amounts[lo:hi]]
+        if since is not None:
+            since = to_epoch(since)
+            matches = [t for t in matches if t["timestamp"] >= since]
+        return _rank_by_closeness(matches, amount)
+
+
+class SQLiteTransactionStore(TransactionStore):
+    """
+    SQLite-backed store
+
+    Rows are indexed by transaction_id (primary key), by
+    (customer_id, timestamp DESC, transaction_id DESC) and by
+    (customer_id, amount), so by-ID lookups, newest-first pages, time windows
+    and amount ranges are B-tree seeks. Each row also stores its risk flags
+    (risk.risk_flags at write time) under a partial index, so the suspicious
+    view is seeded without reading the rest of the ledger.
+    Only the requested rows are decoded, so worker memory does not grow with
+    the size of the ledger.
+
+    Queries borrow connections from a bounded ConnectionPool, so concurrent
+    readers (threads or the async layer) run in parallel up to pool_size.
+    A ":memory:" database cannot be shared across connections and always
+    uses a single connection.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS transactions (
+            transaction_id TEXT PRIMARY KEY,
+            customer_id TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            amount REAL NOT NULL,
+            data TEXT NOT NULL,
+            flags INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_transactions_customer_timestamp
+            ON transactions (customer_id, timestamp DESC, transaction_id DESC);
+        CREATE INDEX IF NOT EXISTS idx_transactions_customer_amount
+            ON transactions (customer_id, amount);
+    """
+
+    FLAGGED_INDEX = """
+        CREATE INDEX IF NOT EXISTS idx_transactions_flagged
+            ON transactions (customer_id, timestamp DESC, transaction_id DESC) WHERE flags != 0
+    """
+
+    def __init__(self, path: str = ":memory:", pool_size: int = 4):
+        super().__init__()
+        self.path = path
+        if path == ":memory:":
+            pool_size = 1
+        self.pool = ConnectionPool(self._connect, pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(self.SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(transactions)")}
+            if "flags" not in columns:
+                self._add_flags_column(conn)
+            conn.execute(self.FLAGGED_INDEX)
+
+    def _add_flags_column(self, conn: sqlite3.Connection, batch_size: int = 1000):
+        # One-off migration of a ledger written before rows carried flags
+        with conn:
+            conn.execute("ALTER TABLE transactions ADD COLUMN flags INTEGER NOT NULL DEFAULT 0")
+        last_id = ""
+        while True:
+            batch = conn.execute(
+                "SELECT transaction_id, data FROM transactions"
+                " WHERE transaction_id > ? ORDER BY transaction_id LIMIT ?",
+                (last_id, batch_size),
+            ).fetchall()
+            if not batch:
+                return
+            updates = [(risk_flags(json.loads(data)), transaction_id) for transaction_id, data in batch]
+            with conn:
+                conn.executemany(
+                    "UPDATE transactions SET flags = ? WHERE transaction_id = ?",
+                    [update for update in updates if update[0]],
+                )
+            last_id = batch[-1][0]
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        if self.path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _row(self, customer_id: str, transaction: dict) -> tuple:
+        return (
+            transaction["transaction_id"],
+            customer_id,
+            transaction["timestamp"],
+            float(transaction.get("amount", 0)),
+            json.dumps(dict(transaction)),
+            risk_flags(transaction),
+        )
+
+    def add(self, customer_id: str, transaction: dict):
+        self.add_batch([(customer_id, transaction)])
+
+    def add_batch(self, rows: list):
+        # One SQLite transaction per batch
+        rows = [(customer_id, normalize_transaction(t)) for customer_id, t in rows]
+        values = [self._row(customer_id, t) for customer_id, t in rows]
+        with self.pool.connection() as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO transactions"
+                " (transaction_id, customer_id, timestamp, amount, data, flags)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                values
+            )
+        self._notify(rows)
+
+    def get(self, transaction_id: str) -> dict:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT data FROM transactions WHERE transaction_id = ?",
+                (transaction_id,),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def customer_of(self, transaction_id: str) -> str:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT customer_id FROM transactions WHERE transaction_id = ?",
+                (transaction_id,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def list_for_customer(self, customer_id: str, limit: int = None, after: str = None,
+                          since=None, until=None) -> list:
+        sql = "SELECT data FROM transactions WHERE customer_id = ?"
+        params = [customer_id]
+        if after is not None:
+            sql += (
+                " AND (timestamp, transaction_id) < "
+                "(SELECT timestamp, transaction_id FROM transactions"
+                " WHERE transaction_id = ? AND customer_id = ?)"
+            )
+            params += [after, customer_id]
+        if since is not None:
+            sql += " AND timestamp >= ?"
+            params.append(to_epoch(since))
+        if until is not None:
+            sql += " AND timestamp < ?"
+            params.append(to_epoch(until))
+        sql += " ORDER BY timestamp DESC, transaction_id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self.pool.connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def find_by_amount(self, customer_id: str, amount: float, tolerance: float, since=None) -> list:
+        sql = "SELECT data FROM transactions WHERE customer_id = ? AND amount BETWEEN ? AND ?"
+        params = [customer_id, amount - tolerance, amount + tolerance]
+        if since is not None:
+            sql += " AND timestamp >= ?"
+            params.append(to_epoch(since))
+        with self.pool.connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return _rank_by_closeness([json.loads(row[0]) for row in rows], amount)
+
+    def iter_all(self, batch_size: int = 1000):
+        # Keyset batches so no connection is held while the caller consumes rows
+        last_id = ""
+        while True:
+            with self.pool.connection() as conn:
+                batch = conn.execute(
+                    "SELECT transaction_id, customer_id, data FROM transactions"
+                    " WHERE transaction_id > ? ORDER BY transaction_id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not batch:
+                return
+            for _, customer_id, data in batch:
+                yield customer_id, json.loads(data)
+            last_id = batch[-1][0]
+
+    def iter_flagged(self, flag: int, customer_id: str = None, per_customer: int = None):
+        # `flags != 0` lets SQLite use the partial index
+        where = "flags != 0 AND flags & ? != 0"
+        order = "ORDER BY timestamp DESC, transaction_id DESC"
+        if customer_id is not None:
+            sql = f"SELECT customer_id, data FROM transactions WHERE customer_id = ? AND {where} {order} LIMIT ?"
+            params = (customer_id, flag, -1 if per_customer is None else per_customer)
+        elif per_customer is None:
+            sql = f"SELECT customer_id, data FROM transactions WHERE {where} ORDER BY customer_id, timestamp DESC, transaction_id DESC"
+            params = (flag,)
+        else:
+            sql = (
+                "SELECT customer_id, data FROM ("
+                " SELECT customer_id, data,"
+                f" ROW_NUMBER() OVER (PARTITION BY customer_id {order}) AS n"
+                f" FROM transactions WHERE {where})"
+                " WHERE n <= ?"
+            )
+            params = (flag, per_customer)
+        with self.pool.connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        for owner, data in rows:
+            yield owner, json.loads(data)
+
+    def is_empty(self) -> bool:
+        """Check whether the store holds no transactions yet"""
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT 1 FROM transactions LIMIT 1").fetchone() is None
+
+    def close(self):
+        """Close the pooled connections"""
+        self.pool.close()
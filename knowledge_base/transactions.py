@@ -1,7 +1,15 @@
 """Transaction database - Mock data for transaction history"""
 
+import os
+from datetime import datetime, timedelta, timezone
+
+from .transaction_store import TransactionStore, InMemoryTransactionStore, SQLiteTransactionStore
+from .suspicious_view import SuspiciousView
+from .cache import transaction_cache
+
 # Mock transaction database
-# In production, this would query a real transaction database with proper indexing
+# In production, this would query a real transaction database with proper indexing.
+# Reads go through the active TransactionStore, which is seeded from this dict.
 TRANSACTIONS_DB = {
     "CUST001": [
         {
@@ -85,19 +93,112 @@ TRANSACTIONS_DB = {
     ]
 }
 
-def get_transactions(customer_id: str, limit: int = 5) -> list:
+# Active transaction store; created on first use (see get_transaction_store)
+_store = None
+
+# Suspicious/unusual transactions, maintained as the active store is written
+suspicious_view = SuspiciousView()
+
+def create_transaction_store(backend: str = None, path: str = None, seed: bool = True) -> TransactionStore:
+    """
+    Create a transaction store seeded with TRANSACTIONS_DB
+    
+    Args:
+        backend: "memory" or "sqlite" (defaults to TRANSACTION_STORE env var, then "memory")
+        path: SQLite database path (defaults to TRANSACTION_DB_PATH env var, then in-memory)
+        seed: Load the demo TRANSACTIONS_DB into a new (empty) store; pass
+            False for a real ledger
+        
+    The SQLite connection pool size comes from TRANSACTION_DB_POOL_SIZE (default 4).
+    
+    Returns:
+        TransactionStore instance
+    """
+    backend = backend or os.getenv("TRANSACTION_STORE", "memory")
+    if backend == "memory":
+        return InMemoryTransactionStore(TRANSACTIONS_DB if seed else None)
+    if backend == "sqlite":
+        store = SQLiteTransactionStore(
+            path or os.getenv("TRANSACTION_DB_PATH", ":memory:"),
+            pool_size=int(os.getenv("TRANSACTION_DB_POOL_SIZE", "4"))
+        )
+        if seed and store.is_empty():
+            store.load(TRANSACTIONS_DB)
+        return store
+    raise ValueError(f"Unknown transaction store backend: {backend}")
+
+def _invalidate_cached(customer_id: str, transaction: dict):
+    """Store listener - drop cached listings for the customer written to"""
+    transaction_cache.invalidate_tag(customer_id)
+
+def _attach(store: TransactionStore):
+    transaction_cache.clear()
+    suspicious_view.attach(store)
+    store.subscribe(_invalidate_cached)
+
+def get_transaction_store() -> TransactionStore:
+    """Get the active transaction store, creating the default one if needed"""
+    global _store
+    if _store is None:
+        _store = create_transaction_store()
+        _attach(_store)
+    return _store
+
+def set_transaction_store(store: TransactionStore):
+    """Replace the active transaction store (e.g. with a SQLite-backed one)"""
+    global _store
+    if _store is not None:
+        _store.unsubscribe(_invalidate_cached)
+    _store = store
+    _attach(store)
+
+def add_transaction(customer_id: str, transaction: dict):
+    """
+    Add or replace a transaction for a customer
+    
+    Args:
+        customer_id: Customer identifier
+        transaction: Transaction dictionary (must include transaction_id)
+    """
+    get_transaction_store().add(customer_id, transaction)
+
+def update_fraud_score(transaction_id: str, fraud_score: float) -> dict:
+    """
+    Update a transaction's fraud score (re-evaluates the suspicious view)
+    
+    Args:
+        transaction_id: Transaction identifier
+        fraud_score: New fraud score
+        
+    Returns:
+        Updated transaction dictionary or None if not found
+    """
+    return get_transaction_store().update_fraud_score(transaction_id, fraud_score)
+
+def get_transactions(customer_id: str, limit: int = 5, after: str = None,
+                     since=None, until=None) -> list:
     """
-    Retrieve recent transactions for a customer
+    Retrieve recent transactions for a customer, newest first
     
     Args:
         customer_id: Customer identifier
-        limit: Maximum number of transactions to return
+        limit: Maximum number of transactions to return (None for all)
+        after: Pagination cursor - transaction_id of the last row already seen
+        since: Only transactions at/after this time (epoch seconds, datetime or date string)
+        until: Only transactions before this time (epoch seconds, datetime or date string)
+        
+    Results are read through transaction_cache and dropped whenever the
+    store writes to the customer or invalidate_customer() is called.
         
     Returns:
         List of transaction dictionaries
     """
-    transactions = TRANSACTIONS_DB.get(customer_id, [])
-    return transactions[:limit]
+    store = get_transaction_store()
+    return list(transaction_cache.get_or_load(
+        ("transactions", customer_id, limit, after, since, until),
+        lambda: store.list_for_customer(customer_id, limit, after, since, until),
+        tags=(customer_id,)
+    ))
 
 def get_transaction_by_id(transaction_id: str) -> dict:
     """
@@ -109,21 +210,64 @@ def get_transaction_by_id(transaction_id: str) -> dict:
     Returns:
         Transaction dictionary or None if not found
     """
-    for customer_transactions in TRANSACTIONS_DB.values():
-        for transaction in customer_transactions:
-            if transaction["transaction_id"] == transaction_id:
-                return transaction
-    return None
+    return get_transaction_store().get(transaction_id)
+
+def find_transactions_by_amount(customer_id: str, amount: float, tolerance: float = 1.0,
+                                days: int = None, now: datetime = None) -> list:
+    """
+    Find a customer's transactions close to a reported amount
+    
+    Searches the customer's full history through the store's amount index.
+    
+    Args:
+        customer_id: Customer identifier
+        amount: Amount reported by the customer
+        tolerance: Maximum absolute difference from amount
+        days: Only search the last N days (None searches all history)
+        now: Reference time for the days window (defaults to now, UTC; a naive
+            datetime is read as UTC)
+        
+    Returns:
+        List of matching transactions, closest amount first
+    """
+    since = None
+    if days is not None:
+        since = (now or datetime.now(timezone.utc)) - timedelta(days=days)
+    return get_transaction_store().find_by_amount(customer_id, amount, tolerance, since)
 
 def get_suspicious_transactions(customer_id: str) -> list:
     """
     Get transactions with high fraud scores
     
+    Reads the materialized suspicious view; nothing is filtered per call.
+    
     Args:
         customer_id: Customer identifier
         
     Returns:
-        List of suspicious transactions
+        List of suspicious transactions, newest first
+    """
+    get_transaction_store()
+    return suspicious_view.get(customer_id, "suspicious")
+
+def get_unusual_transactions(customer_id: str) -> list:
+    """
+    Get transactions with two or more risk factors (see knowledge_base.risk)
+    
+    Args:
+        customer_id: Customer identifier
+        
+    Returns:
+        List of unusual transactions, newest first
+    """
+    get_transaction_store()
+    return suspicious_view.get(customer_id, "unusual")
+
+def subscribe_suspicious(callback):
+    """
+    Subscribe to changes in the suspicious/unusual views
+    
+    Args:
+        callback: Called as callback(customer_id, transaction, view_name, flagged)
     """
-    transactions = TRANSACTIONS_DB.get(customer_id, [])
-    return [t for t in transactions if t.get("fraud_score", 0) > 0.7]
+    suspicious_view.subscribe(callback)
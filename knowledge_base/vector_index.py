@@ -0,0 +1,151 @@
+"""Persistent chromadb vector index over policy passages"""
+
+import hashlib
+import math
+
+from .retrieval import analyze
+
+# Passages embedded per chromadb upsert call
+UPSERT_BATCH_SIZE = 256
+
+
+def content_hash(*parts) -> str:
+    """Stable hex digest of text parts"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class HashingEmbedding:
+    """
+    Deterministic local embedding (feature hashing, no model download)
+
+    Stemmed words and adjacent word pairs are hashed into a fixed number of
+    signed buckets and the vector is L2-normalized, so cosine similarity
+    approximates weighted term overlap. Identical text always produces the
+    same vector on every machine, which lets a persisted index be reused.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.name = f"hashing-v1-{dim}"
+
+    def _bucket(self, feature: str) -> tuple:
+        value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        return value % self.dim, 1.0 if value >> 63 else -1.0
+
+    def embed(self, text: str) -> list:
+        """Embed one text"""
+        vector = [0.0] * self.dim
+        terms = analyze(text)
+        features = [(term, 1.0) for term in terms]
+        features += [(f"{a} {b}", 0.5) for a, b in zip(terms, terms[1:])]
+        for feature, weight in features:
+            index, sign = self._bucket(feature)
+            vector[index] += sign * weight
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+    def __call__(self, input) -> list:
+        """Embed a batch of texts (chromadb embedding-function signature)"""
+        return [self.embed(text) for text in input]
+
+
+class VectorIndex:
+    """
+    Policy passages in a chromadb collection, embedded with HashingEmbedding
+
+    With a path the collection persists on disk, so a new worker opens the
+    existing index instead of re-embedding. sync() compares a hash of the
+    whole corpus (stored in the collection metadata) before doing anything,
+    and when it differs re-embeds only passages whose own hash changed.
+    """
+
+    def __init__(self, path: str = None, collection_name: str = "policy_passages",
+                 embedding: HashingEmbedding = None):
+        import chromadb
+
+        self.path = path
+        self.embedding = embedding or HashingEmbedding()
+        self.client = chromadb.PersistentClient(path=path) if path else chromadb.EphemeralClient()
+        try:
+            self.collection = self.client.get_collection(collection_name, embedding_function=None)
+        except Exception:
+            self.collection = self.client.create_collection(
+                collection_name,
+                metadata={"hnsw:space": "cosine"},
+                embedding_function=None
+            )
+
+    def corpus_hash(self, passages: dict) -> str:
+        """Hash of every (path, text) pair plus the embedding version"""
+        parts = [self.embedding.name]
+        for path in sorted(passages):
+            parts += [path, passages[path]]
+        return content_hash(*parts)
+
+    def sync(self, passages: dict) -> int:
+        """
+        Bring the collection in line with a passage mapping
+
+        Args:
+            passages: Mapping of passage path -> text
+
+        Returns:
+            Number of passages (re-)embedded (0 when the index was current)
+        """
+        corpus_hash = self.corpus_hash(passages)
+        if (self.collection.metadata or {}).get("corpus_hash") == corpus_hash:
+            return 0
+        stored = self.collection.get(include=["metadatas"])
+        stored_hashes = {
+            path: (metadata or {}).get("content_hash")
+            for path, metadata in zip(stored["ids"], stored["metadatas"])
+        }
+        removed = [path for path in stored_hashes if path not in passages]
+        if removed:
+            self.collection.delete(ids=removed)
+        changed = []
+        for path, text in passages.items():
+            text_hash = content_hash(self.embedding.name, text)
+            if stored_hashes.get(path) != text_hash:
+                changed.append((path, text, text_hash))
+        for start in range(0, len(changed), UPSERT_BATCH_SIZE):
+            batch = changed[start:start + UPSERT_BATCH_SIZE]
+            self.collection.upsert(
+                ids=[path for path, _, _ in batch],
+                documents=[text for _, text, _ in batch],
+                embeddings=self.embedding([text for _, text, _ in batch]),
+                metadatas=[{"content_hash": text_hash} for _, _, text_hash in batch]
+            )
+        self.collection.modify(metadata={"corpus_hash": corpus_hash})
+        return len(changed)
+
+    def search(self, query: str, k: int = 3) -> list:
+        """
+        Nearest passages to a query
+
+        Args:
+            query: Natural language query
+            k: Number of passages
+
+        Returns:
+            List of (path, text, score) tuples, best first; score is cosine similarity
+        """
+        count = self.collection.count()
+        if not count:
+            return []
+        result = self.collection.query(
+            query_embeddings=self.embedding([query]),
+            n_results=min(k, count),
+            include=["documents", "distances"]
+        )
+        return [
+            (path, text, 1.0 - distance)
+            for path, text, distance in zip(result["ids"][0], result["documents"][0], result["distances"][0])
+        ]
+
+    def __len__(self) -> int:
+        return self.collection.count()
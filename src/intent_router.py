@@ -0,0 +1,67 @@
+"""Intent router - keyword intents compiled into one regex, shared by the CLI agent and the graph runner"""
+
+import re
+
+# General-enquiry intents in priority order (highest first) with their
+# keywords. Keywords match whole words, optionally plural: "point" matches
+# "points", while "limit" does not match "unlimited" and "apr" not "April".
+INTENTS = (
+    ("reward_points", ("reward", "point", "cashback")),
+    ("credit_limit", ("credit limit", "available credit", "limit")),
+    ("statement", ("statement", "bill", "billing")),
+    ("payment_due", ("due", "payment")),
+    ("card_details", ("card details", "card type", "expiry", "validity")),
+    ("transaction_history", ("transaction", "history", "recent")),
+    ("interest_rates", ("interest", "rate", "apr", "charge"))
+)
+
+class IntentRouter:
+    """
+    Matches every intent's keywords in one scan of the input
+
+    All keywords are compiled into a single alternation (longest first) and
+    each match is mapped back to its intent's priority, so findall walks the
+    text once whatever the number of intents and keywords.
+    """
+
+    def __init__(self, intents=INTENTS):
+        """
+        Args:
+            intents: (intent, keywords) pairs, highest priority first
+        """
+        self.intents = tuple(name for name, _ in intents)
+        self._rank = {keyword: rank for rank, (_, keywords) in enumerate(intents) for keyword in keywords}
+        keywords = sorted(self._rank, key=len, reverse=True)
+        self.pattern = re.compile(rf"\b({'|'.join(re.escape(keyword) for keyword in keywords)})s?\b")
+
+    def route(self, text: str) -> list:
+        """
+        Find the intents mentioned in a query
+
+        Args:
+            text: Customer query
+
+        Returns:
+            Matched intent names, highest priority first (empty if none)
+        """
+        ranks = {self._rank[keyword] for keyword in self.pattern.findall(text.lower())}
+        return [self.intents[rank] for rank in sorted(ranks)]
+
+    def top(self, text: str) -> str:
+        """
+        Highest-priority intent of a query
+
+        Args:
+            text: Customer query
+
+        Returns:
+            Intent name, or None if no keyword matches
+        """
+        ranks = [self._rank[keyword] for keyword in self.pattern.findall(text.lower())]
+        return self.intents[min(ranks)] if ranks else None
+
+# Global router instance
+intent_router = IntentRouter()
+
+# Highest-priority intent of a query, or None (see IntentRouter.top)
+route_intent = intent_router.top
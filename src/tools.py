@@ -1,7 +1,10 @@
 """Customer support tools for identity verification, transaction retrieval, and actions"""
 import random
+import re
 from datetime import datetime, timedelta
-from knowledge_base import get_customer, get_transactions
+from knowledge_base import get_customer, get_transactions, invalidate_customer
+
+AMOUNT_PATTERN = re.compile(r"\d[\d,]*(?:\.\d+)?")
 
 def verify_customer(mobile_number: str, last_4_digits: str) -> dict:
     """
@@ -40,6 +43,21 @@ def fetch_recent_transactions(customer_id: str, limit: int = 5) -> list:
     return transactions
     return transactions[:limit]
 
+def parse_amount(text: str) -> float:
+    """
+    Extract the first amount from free text (e.g. "Rs. 8,900.00", "18900")
+    
+    Args:
+        text: Customer input
+        
+    Returns:
+        Amount as float, or None if the text contains no number
+    """
+    match = AMOUNT_PATTERN.search(text)
+    if not match:
+        return None
+    return float(match.group().replace(",", ""))
+
 def block_card(card_id: str) -> dict:
     """
     Block a credit card immediately
@@ -51,6 +69,8 @@ def block_card(card_id: str) -> dict:
         dict with success status and ticket number
     """
     ticket_number = f"BLK{random.randint(100000, 999999)}"
+    # The card's status changes, so cached reads for it are stale
+    invalidate_customer(card_id=card_id)
     return {
         "success": True,
         "ticket_number": ticket_number,
@@ -70,6 +90,8 @@ def raise_dispute_ticket(customer_id: str, transaction_details: dict) -> dict:
         dict with ticket information
     """
     ticket_number = f"CCB{random.randint(100000, 999999)}"
+    # Disputed transactions change status, so cached reads are stale
+    invalidate_customer(customer_id=customer_id)
     return {
         "success": True,
         "ticket_number": ticket_number,
@@ -8,8 +8,10 @@ from dotenv import load_dotenv
 # Add parent directory to path to import knowledge_base
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from knowledge_base import rag, get_customer, get_transactions
-from src.tools import block_card, raise_dispute_ticket
+from knowledge_base import rag, current_policies, get_customer, get_transactions, get_unusual_transactions, find_transactions_by_amount
+from knowledge_base.risk import is_unusual
+from src.tools import block_card, raise_dispute_ticket, parse_amount
+from src.intent_router import route_intent
 
 # Load environment variables
 load_dotenv()
@@ -23,9 +25,12 @@ class UnifiedCustomerSupportAgent:
     
     def __init__(self):
         self.rag = rag
+        # Policy version this session reads, even if policies reload mid-call
+        self.policies = current_policies()
         self.customer_id = None
         self.customer_name = None
         self.last_4 = None
+        self.card_id = None
         self.suspicious_transactions = []
     
     def run(self):
@@ -69,8 +74,8 @@ class UnifiedCustomerSupportAgent:
         # Silent background risk check
         print("Agent: One moment please... (Accessing your account)\n")
         
-        transactions = get_transactions(self.customer_id)
-        self.suspicious_transactions = self.detect_unusual_activity(transactions)
+        # Unusual transactions are flagged on ingest, so this is a lookup
+        self.suspicious_transactions = get_unusual_transactions(self.customer_id)
         
         # Proactive alert if suspicious activity found
         if self.suspicious_transactions:
@@ -140,12 +145,8 @@ class UnifiedCustomerSupportAgent:
             print("Agent: No recent transactions found.")
             return
         
-        # Find matching transaction
-        matched_txn = None
-        for txn in transactions:
-            if str(txn['amount']) == transaction_amount or str(int(float(transaction_amount))) == str(int(txn['amount'])):
-                matched_txn = txn
-                break
+        # Find matching transaction across the full history (amount index)
+        matched_txn = self.match_transaction_by_amount(transaction_amount)
         
         if not matched_txn:
             print(f"Agent: I couldn't find a transaction for ₹{transaction_amount}.")
@@ -159,10 +160,7 @@ class UnifiedCustomerSupportAgent:
                 transaction_amount = input("You (Amount in ₹): ").strip()
                 print()
                 
-                for txn in transactions:
-                    if str(txn['amount']) == transaction_amount or str(int(float(transaction_amount))) == str(int(txn['amount'])):
-                        matched_txn = txn
-                        break
+                matched_txn = self.match_transaction_by_amount(transaction_amount)
                 
                 if not matched_txn:
                     print(f"Agent: I still couldn't find a transaction for ₹{transaction_amount}.")
@@ -205,6 +203,14 @@ class UnifiedCustomerSupportAgent:
             # Customer denies - fraud case
             self.process_fraud_with_consent(matched_txn)
     
+    def match_transaction_by_amount(self, transaction_amount: str) -> dict:
+        """Find the customer's transaction closest to the reported amount (±₹1)"""
+        amount = parse_amount(transaction_amount)
+        if amount is None:
+            return None
+        matches = find_transactions_by_amount(self.customer_id, amount)
+        return matches[0] if matches else None
+    
     def verify_identity_with_retry(self) -> bool:
         """Verify identity with 3 retry attempts"""
         print("Agent: For security purposes, I need to verify your identity.")
@@ -228,6 +234,7 @@ class UnifiedCustomerSupportAgent:
             if customer:
                 self.customer_id = customer["customer_id"]
                 self.customer_name = customer["name"]
+                self.card_id = customer["card_id"]
                 self.last_4 = last4
                 self.state = {
                     "mobile": mobile,
@@ -251,34 +258,8 @@ class UnifiedCustomerSupportAgent:
         return False
     
     def detect_unusual_activity(self, transactions: list) -> list:
-        """Silent risk check - detect unusual transactions"""
-        suspicious = []
-        
-        for txn in transactions:
-            risk_factors = []
-            
-            if txn.get('fraud_score', 0) > 0.7:
-                risk_factors.append("high_fraud_score")
-            
-            if 'international' in txn.get('location', '').lower():
-                risk_factors.append("international")
-            
-            if txn.get('transaction_time') and 'late' in txn.get('transaction_time', '').lower():
-                risk_factors.append("late_night")
-            
-            if txn.get('merchant_status') == 'Newly added':
-                risk_factors.append("new_merchant")
-            
-            if txn.get('status') == 'pending' and txn.get('amount', 0) > 5000:
-                risk_factors.append("high_value_pending")
-            
-            if 'unknown' in txn.get('merchant', '').lower():
-                risk_factors.append("unknown_merchant")
-            
-            if len(risk_factors) >= 2:
-                suspicious.append(txn)
-        
-        return suspicious
+        """Silent risk check - detect unusual transactions (see knowledge_base.risk)"""
+        return [txn for txn in transactions if is_unusual(txn)]
     
     def process_fraud_with_consent(self, transaction: dict):
         """Process fraud case with customer consent"""
@@ -293,8 +274,8 @@ class UnifiedCustomerSupportAgent:
         print("       • You'll have zero liability as per RBI guidelines\n")
         
         # Get consent
-        compliance = self.rag.get_compliance_rules()
-        print(f"Agent: As per RBI guidelines: {compliance['rbi_guidelines']['customer_consent']}\n")
+        consent_rule = self.policies["compliance.rbi_guidelines.customer_consent"]
+        print(f"Agent: As per RBI guidelines: {consent_rule}\n")
         print("Agent: Shall I immediately block the card and raise a fraud verification request?")
         
         consent = input("You (Yes/No): ").strip().lower()
@@ -309,13 +290,13 @@ class UnifiedCustomerSupportAgent:
         # Block card and raise ticket
         print("Agent: Thank you for your consent. Processing immediately...\n")
         
-        block_result = block_card(f"CARD_{self.customer_id}")
+        block_result = block_card(self.card_id)
         dispute_result = raise_dispute_ticket(
             self.customer_id,
             {"amount": transaction['amount'], "transaction_id": transaction.get('transaction_id', 'N/A')}
         )
         
-        sla = self.rag.get_fraud_sla()
+        sla = self.policies["sla"]
         
         # Share results
         print("✅ Actions Completed Successfully!\n")
@@ -332,9 +313,7 @@ class UnifiedCustomerSupportAgent:
         print(f"   • New card delivery: {sla['new_card_delivery']}\n")
         
         print("🛡️  Customer Liability Protection:")
-        from knowledge_base.policies import FRAUD_POLICIES
-        liability = FRAUD_POLICIES['customer_liability']
-        print(f"   • Reported within 24h: {liability['reported_within_24h']}")
+        print(f"   • Reported within 24h: {self.policies['fraud.customer_liability.reported_within_24h']}")
         print(f"   • Your case: Zero liability (reported immediately)\n")
         
         print(f"Agent: Your fraud ticket reference is {dispute_result['ticket_number']}.")
@@ -373,10 +352,10 @@ class UnifiedCustomerSupportAgent:
     
     def process_general_query(self, query: str):
         """Process general customer queries with mock responses"""
-        query_lower = query.lower()
+        intent = route_intent(query)
         
         # Reward points query
-        if any(word in query_lower for word in ['reward', 'points', 'cashback']):
+        if intent == "reward_points":
             # Get actual reward points from customer data
             customer = get_customer(self.state.get("mobile"), self.state.get("last_4"))
             if customer and "reward_points" in customer:
@@ -396,8 +375,8 @@ class UnifiedCustomerSupportAgent:
                 print(f"       • Points Expiring Soon: {random.randint(100, 500)} (by March 31, 2026)")
                 print(f"       • Redemption Options: Shopping vouchers, Travel bookings, Bill payments\n")
         
-        # Statement query
-        elif any(word in query_lower for word in ['statement', 'bill', 'due date', 'payment']):
+        # Statement / payment due query
+        elif intent in ("statement", "payment_due"):
             due_date = "March 15, 2026"
             amount_due = random.randint(5000, 25000)
             min_due = amount_due * 0.05
@@ -409,7 +388,7 @@ class UnifiedCustomerSupportAgent:
             print(f"       • Last Payment: ₹{random.randint(3000, 8000):,.2f} on January 10, 2026\n")
         
         # Credit limit query
-        elif any(word in query_lower for word in ['credit limit', 'limit', 'available credit']):
+        elif intent == "credit_limit":
             total_limit = random.randint(100000, 500000)
             used = random.randint(20000, 80000)
             available = total_limit - used
@@ -422,7 +401,7 @@ class UnifiedCustomerSupportAgent:
             print(f"       • Recommendation: {'Good! Keep utilization below 30%' if utilization < 30 else 'Consider paying down balance'}\n")
         
         # Card details query
-        elif any(word in query_lower for word in ['card details', 'card type', 'expiry', 'validity']):
+        elif intent == "card_details":
             print(f"Agent: Here are your card details:\n")
             print(f"       • Card Type: Platinum Credit Card")
             print(f"       • Card Number: XXXX XXXX XXXX {self.last_4}")
@@ -431,7 +410,7 @@ class UnifiedCustomerSupportAgent:
             print(f"       • Annual Fee: ₹2,500 (Waived for this year)\n")
         
         # Transaction history query
-        elif any(word in query_lower for word in ['transaction', 'history', 'recent']):
+        elif intent == "transaction_history":
             transactions = get_transactions(self.customer_id)
             print(f"Agent: Here are your recent transactions:\n")
             for idx, txn in enumerate(transactions[:5], 1):
@@ -439,7 +418,7 @@ class UnifiedCustomerSupportAgent:
             print()
         
         # Interest rate query
-        elif any(word in query_lower for word in ['interest', 'rate', 'apr', 'charges']):
+        elif intent == "interest_rates":
             print(f"Agent: Here are your interest rate details:\n")
             print(f"       • Purchase APR: 3.5% per month (42% annually)")
             print(f"       • Cash Advance APR: 3.75% per month")